@@ -0,0 +1,260 @@
+import os
+import math
+import heapq
+import threading
+import zlib
+from collections import Counter, defaultdict
+from operator import itemgetter
+
+from corpus_feed import CorpusFeed
+from keyword_idf import bio_terms, tweet_terms
+
+# Number of hash buckets terms are folded into (rounded up to a power of two)
+DEFAULT_DIMENSIONS = int(os.getenv('ACCOUNT_INDEX_DIMENSIONS', str(2 ** 20)))
+# Non-zero weights kept per account vector (highest TF-IDF first)
+DEFAULT_MAX_TERMS = int(os.getenv('ACCOUNT_INDEX_MAX_TERMS', '256'))
+# Strongest query weights scored against the postings; the weak tail barely moves the ranking
+DEFAULT_QUERY_TERMS = int(os.getenv('ACCOUNT_INDEX_QUERY_TERMS', '32'))
+# Re-weigh every vector once the account count has grown by this factor since the last full pass
+# (in between, only changed accounts are re-weighed, with the IDF of the moment)
+DEFAULT_REWEIGH_GROWTH = float(os.getenv('ACCOUNT_INDEX_REWEIGH_GROWTH', '1.25'))
+# A bio is a deliberate self-description, so each bio word counts as this many tweet words
+BIO_WEIGHT = 3
+
+
+class AccountVectorIndex:
+    """
+    Cosine similarity search over the accounts we have stored
+
+    Every account is one document: its latest bio (from
+    deep_history.account_snapshot) plus all of its stored tweets
+    (historical_tweets and the tweets inside deep_history records), tokenized
+    with keyword_idf's bio_terms/tweet_terms. Terms are hashed into a fixed
+    number of buckets, weighted (1 + log tf) * idf over accounts, trimmed to
+    the strongest `max_terms` and L2-normalised. An inverted index from bucket
+    to (account, weight) postings answers top-k queries by only touching
+    accounts that share a term with the query.
+
+    Raw term counts are kept per account. Tweets and profiles arrive through
+    a CorpusFeed (shared with CorpusIDF in the app), which reads the database
+    incrementally and skips repeated tweets, so refreshes only fold in new
+    scrapes. Document frequencies are kept up to date as counts change, and
+    the next query re-weighs only the accounts that changed, replacing their
+    postings in place. Other vectors keep the IDF they were weighed with
+    until the account count grows by `reweigh_growth`, when every vector is
+    re-weighed once.
+    """
+
+    def __init__(self, feed=None, persist=True, dimensions=DEFAULT_DIMENSIONS, max_terms=DEFAULT_MAX_TERMS,
+                 reweigh_growth=DEFAULT_REWEIGH_GROWTH):
+        """
+        Args:
+            feed: Shared CorpusFeed (a private one is created if omitted)
+            persist: Whether a private feed reads the database
+            dimensions: Hash buckets terms are folded into
+            max_terms: Non-zero weights kept per account vector
+            reweigh_growth: Account count growth that triggers a full re-weigh
+        """
+        self.feed = feed or CorpusFeed(persist=persist)
+        self.persist = self.feed.persist
+        self.mask = (1 << max(1, dimensions - 1).bit_length()) - 1
+        self.max_terms = max_terms
+        self.reweigh_growth = reweigh_growth
+        self._tweet_counts = defaultdict(Counter)
+        self._bio_counts = {}
+        self._profiles = {}
+        self._tweet_totals = Counter()
+        self._vectors = {}
+        self._postings = {}
+        self._doc_freq = Counter()
+        self._doc_count = 0
+        self._weighed_doc_count = 0
+        # Accounts changed since the last query -> their buckets before the change
+        self._dirty = {}
+        self._lock = threading.Lock()
+        self.feed.subscribe(self._add_batch)
+
+    def _hash_terms(self, terms):
+        mask = self.mask
+        return Counter(zlib.crc32(term.encode('utf-8')) & mask for term in terms)
+
+    def add_account(self, profile):
+        """Store (or replace) an account's profile and bio"""
+        username = (profile or {}).get('username')
+        if username:
+            self.feed.add(accounts={username: profile})
+
+    def add_tweets(self, tweets, username=None):
+        """
+        Add tweets to their authors' documents (through the feed, which skips repeats)
+
+        Args:
+            tweets: Tweet dicts with id/text/entities
+            username: Author of every tweet; otherwise each tweet's 'username' key
+        """
+        self.feed.add(tweets, username=username)
+
+    def _add_batch(self, tweets, accounts):
+        """Feed subscriber: fold new profiles and tweets into the raw counts"""
+        bios = {
+            profile['username'].lower(): (profile, self._hash_terms(bio_terms(profile.get('description', ''))))
+            for profile in accounts.values() if (profile or {}).get('username')
+        }
+        tweet_counts = [(tweet['username'].lower(), self._hash_terms(tweet_terms(tweet))) for tweet in tweets]
+        with self._lock:
+            for key in set(bios) | {key for key, _ in tweet_counts}:
+                self._mark_dirty(key)
+            for key, (profile, bio_counts) in bios.items():
+                self._profiles[key] = profile
+                self._bio_counts[key] = bio_counts
+            for key, hashed in tweet_counts:
+                self._tweet_totals[key] += 1
+                counts = self._tweet_counts[key]
+                counts.update(hashed)
+                # Bound memory for prolific accounts; the tail never makes the vector anyway
+                if len(counts) > 4 * self.max_terms:
+                    self._tweet_counts[key] = Counter(dict(counts.most_common(2 * self.max_terms)))
+
+    def _mark_dirty(self, key):
+        """Remember an account's buckets before its first change since the last query (caller holds the lock)"""
+        if key in self._dirty:
+            return
+        if key not in self._tweet_counts and key not in self._bio_counts:
+            self._doc_count += 1
+        self._dirty[key] = set(self._tweet_counts.get(key, ())) | set(self._bio_counts.get(key, ()))
+
+    def refresh(self, force=False):
+        """Fold in accounts stored since the last refresh (at most once per the feed's refresh_interval)"""
+        self.feed.refresh(force)
+
+    def _account_counts(self, key):
+        counts = Counter(self._tweet_counts.get(key, ()))
+        for bucket, count in self._bio_counts.get(key, {}).items():
+            counts[bucket] += BIO_WEIGHT * count
+        return counts
+
+    def _weigh(self, counts):
+        """(1 + log tf) * idf, trimmed to max_terms and L2-normalised (caller holds the lock)"""
+        doc_freq = self._doc_freq
+        numerator = 1 + self._doc_count
+        weights = [(bucket, (1 + math.log(count)) * (math.log(numerator / (1 + doc_freq.get(bucket, 0))) + 1))
+                   for bucket, count in counts.items() if count > 0]
+        if len(weights) > self.max_terms:
+            weights = heapq.nlargest(self.max_terms, weights, key=itemgetter(1))
+        norm = math.sqrt(sum(weight * weight for _, weight in weights))
+        if not norm:
+            return {}
+        return {bucket: weight / norm for bucket, weight in weights}
+
+    def _set_vector(self, key, vector):
+        """Replace an account's vector and its postings (caller holds the lock)"""
+        postings = self._postings
+        for bucket in self._vectors.pop(key, ()):
+            bucket_postings = postings[bucket]
+            del bucket_postings[key]
+            if not bucket_postings:
+                del postings[bucket]
+        if vector:
+            self._vectors[key] = vector
+            for bucket, weight in vector.items():
+                postings.setdefault(bucket, {})[key] = weight
+
+    def _update(self):
+        """Fold changed accounts into the document frequencies, vectors and postings (caller holds the lock)"""
+        if not self._dirty:
+            return
+        changed = {}
+        doc_freq = self._doc_freq
+        for key, before in self._dirty.items():
+            counts = self._account_counts(key)
+            after = counts.keys()
+            for bucket in before - after:
+                doc_freq[bucket] -= 1
+                if doc_freq[bucket] <= 0:
+                    del doc_freq[bucket]
+            for bucket in after - before:
+                doc_freq[bucket] += 1
+            changed[key] = counts
+        self._dirty = {}
+
+        if self._doc_count > self._weighed_doc_count * self.reweigh_growth:
+            # Enough new accounts to move the IDF noticeably: re-weigh everything once
+            self._weighed_doc_count = self._doc_count
+            for key in set(self._tweet_counts) | set(self._bio_counts):
+                counts = changed.get(key)
+                self._set_vector(key, self._weigh(counts if counts is not None else self._account_counts(key)))
+        else:
+            for key, counts in changed.items():
+                self._set_vector(key, self._weigh(counts))
+
+    def similar(self, username=None, profile=None, tweets=None, limit=20, min_score=0.05, accept=None):
+        """
+        Top-k stored accounts by cosine similarity
+
+        The query is the indexed account `username` when present; otherwise a
+        vector is built from `profile` and `tweets` with the current IDF. Only
+        the query's strongest ACCOUNT_INDEX_QUERY_TERMS weights are scored.
+
+        Args:
+            username: Reference account (excluded from the results)
+            profile: Reference profile, used when the account isn't indexed
+            tweets: Reference tweets, used when the account isn't indexed
+            limit: Number of accounts to return
+            min_score: Drop matches scoring below this cosine similarity
+            accept: Optional predicate on a stored profile (e.g. follower filters)
+
+        Returns:
+            List of (profile, score, stored_tweets), best first; only accounts
+            with a stored profile are returned
+        """
+        key = username.lower() if username else None
+        counts = None
+        if key not in self._vectors:
+            counts = Counter()
+            for tweet in tweets or ():
+                counts.update(self._hash_terms(tweet_terms(tweet)))
+            if profile:
+                for bucket, count in self._hash_terms(bio_terms(profile.get('description', ''))).items():
+                    counts[bucket] += BIO_WEIGHT * count
+
+        # Postings are updated in place, so scoring holds the lock
+        with self._lock:
+            self._update()
+            query = self._vectors.get(key)
+            if query is None:
+                query = self._weigh(counts or Counter())
+            if not query:
+                return []
+
+            if len(query) > DEFAULT_QUERY_TERMS:
+                query = dict(heapq.nlargest(DEFAULT_QUERY_TERMS, query.items(), key=itemgetter(1)))
+
+            scores = defaultdict(float)
+            postings = self._postings
+            for bucket, query_weight in query.items():
+                for account, weight in postings.get(bucket, {}).items():
+                    scores[account] += query_weight * weight
+        scores.pop(key, None)
+
+        profiles = self._profiles
+        candidates = (
+            (account, score) for account, score in scores.items()
+            if score >= min_score and account in profiles and (accept is None or accept(profiles[account]))
+        )
+        ranked = heapq.nlargest(limit, candidates, key=itemgetter(1))
+        return [(profiles[account], score, self._tweet_totals[account]) for account, score in ranked]
+
+    def get_profile(self, username):
+        """Stored profile for an account, or None"""
+        return self._profiles.get(username.lower()) if username else None
+
+    def stats(self):
+        with self._lock:
+            return {
+                'accounts': len(set(self._tweet_counts) | set(self._bio_counts)),
+                'profiled_accounts': len(self._profiles),
+                'tweets': sum(self._tweet_totals.values()),
+                'vectors': len(self._vectors),
+                'stale': bool(self._dirty),
+                'persistent': self.persist
+            }
@@ -1,22 +1,64 @@
-from flask import Flask, render_template, request, send_file, jsonify
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context
 import os
 import json
 from datetime import datetime
-from twitter_scraper import TwitterScraper
+from twitter_scraper import TwitterScraper, DEFAULT_DISCOVERY_MAX_REQUESTS
+from async_scraper import AsyncTwitterScraper
+from profile_cache import ProfileCache
+from corpus_feed import CorpusFeed
+from keyword_idf import CorpusIDF
+from account_index import AccountVectorIndex
 from reddit_scraper import RedditScraper
 from scheduler import ScheduledScraper
-from database import init_db, get_db_session, Report, Schedule as DBSchedule, HistoricalTweet, DeepHistory, engine, save_to_deep_history, search_deep_history
+from tweet_record import COMPACT_TWEETS, expand_tweets_data
+from report_pool import ReportPool
+from jobs import JobFailed, JobQueue, LeaseLost
+import multiprocessing
+import fast_json
+from fast_json import FastJSONProvider
+from database import init_db, get_db_session, Report, Schedule as DBSchedule, HistoricalTweet, DeepHistory, engine, save_to_deep_history, search_deep_history, get_since_id, update_watermark, watermark_query_key, saved_job_reports
 
 # Social Listening Platform - v2.6 (Report History Pagination + Scheduler Fix)
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 
 # Initialize database
 init_db()
 
-scheduler = ScheduledScraper()
+# Shared Twitter client: every route, cron run and the scheduler reuse one
+# pooled keep-alive HTTP session instead of reconnecting per scrape.
+# The keyword IDF table and the account index share one corpus reader.
+corpus_feed = CorpusFeed()
+twitter_scraper = TwitterScraper(profile_cache=ProfileCache(), keyword_idf=CorpusIDF(corpus_feed),
+                                 account_index=AccountVectorIndex(corpus_feed))
+async_twitter_scraper = AsyncTwitterScraper(twitter_scraper)
+# Worker processes that build bulk and cron reports (started on first use, reused after)
+report_pool = ReportPool()
+# Durable queue for /scrape and /bulk-scrape jobs, shared by every app process
+job_queue = JobQueue()
 
-# Start scheduler on app startup
-scheduler.start()
+scheduler = ScheduledScraper(scraper=twitter_scraper)
+
+# Start scheduler and job workers on app startup (not in report worker processes,
+# which re-import this module when the app is run directly with python app.py)
+if multiprocessing.parent_process() is None:
+    scheduler.start()
+    job_queue.start()
+
+def job_accepted(job):
+    """Response body for a queued job"""
+    return {
+        'success': True,
+        'job_id': job['id'],
+        'status': job['status'],
+        'status_url': f"/jobs/{job['id']}"
+    }
+
+def stored_report_text(report):
+    """Report text: stored for Reddit and older reports, otherwise rendered from the analytics"""
+    if report.report_content is None and report.analytics:
+        return twitter_scraper.render_report(report.analytics, report.tweets_data)
+    return report.report_content
 
 @app.route('/')
 def index():
@@ -64,6 +106,15 @@ def health():
                 'reports': reports_count,
                 'historical_tweets': tweets_count,
                 'total_records': schedules_count + reports_count + tweets_count
+            },
+            'scraper': {
+                'rate_limits': twitter_scraper.rate_limiter.stats(),
+                'profile_cache': twitter_scraper.profile_cache.stats(),
+                'circuit_breaker': twitter_scraper.circuit_breaker.stats(),
+                'single_flight': twitter_scraper.single_flight.stats(),
+                'corpus': corpus_feed.stats(),
+                'keyword_idf': twitter_scraper.keyword_idf.stats(),
+                'account_index': twitter_scraper.account_index.stats()
             }
         })
     except Exception as e:
@@ -134,31 +185,78 @@ def cron_run_schedules():
             
             print(f"[CRON] Found {len(schedules_to_run)} schedules to check")
             
+            # One shared scraper (and connection pool) for the whole batch
+            scraper = twitter_scraper
+            
+            # Fetch due schedules that share keywords together, packing their
+            # accounts into combined searches (profiles resolved in batches)
+            due_by_query = {}
+            for s in schedules_to_run:
+                if s.next_run and s.next_run <= now + timedelta(minutes=5):
+                    due_by_query.setdefault(watermark_query_key(s.keywords), []).append(s)
+            
+            # Each schedule keeps its own watermark. An account is prefetched
+            # for the first of its schedules on a query; any other schedule on
+            # the same (account, query) fetches from its own watermark below.
+            prefetched = {}  # schedule id -> (since_id, tweets_data)
+            # Reports for prefetched results are built on the report pool while the rest is fetched
+            prefetched_reports = {}  # schedule id -> report future
+            for group in due_by_query.values():
+                owners = {}  # username -> schedule the prefetched result is for
+                for s in group:
+                    owners.setdefault(s.username, s)
+                since_ids = {username: get_since_id(username, s.keywords, schedule_id=s.id)
+                             for username, s in owners.items()}
+                
+                def queue_report(username, tweets_data, owners=owners):
+                    if tweets_data and tweets_data.get('data'):
+                        owner = owners[username]
+                        prefetched_reports[owner.id] = report_pool.submit(tweets_data, username, owner.keywords)
+                
+                try:
+                    fetched = async_twitter_scraper.run_search_many(
+                        list(since_ids),
+                        keywords=group[0].keywords,
+                        max_results=100,
+                        since_ids=since_ids,
+                        coalesce=True,
+                        on_result=queue_report
+                    )
+                except Exception as e:
+                    print(f"[CRON] Warning: Batched fetch failed, falling back to per-schedule fetches: {e}")
+                    continue
+                for username, tweets_data in fetched.items():
+                    prefetched[owners[username].id] = (since_ids[username], tweets_data)
+            
             for schedule in schedules_to_run:
                 try:
                     # Check if it's actually time to run (within 5 minutes of scheduled time)
                     if schedule.next_run and schedule.next_run <= now + timedelta(minutes=5):
                         print(f"[CRON] Running schedule {schedule.id} for @{schedule.username}")
                         
-                        # Run the scrape
-                        scraper = TwitterScraper()
-                        tweets_data = scraper.search_user_tweets(
-                            schedule.username, 
-                            keywords=schedule.keywords, 
-                            max_results=100
-                        )
-                        
-                        if tweets_data and 'data' in tweets_data and len(tweets_data.get('data', [])) > 0:
-                            # Generate report
-                            report_file = scraper.generate_report(
-                                tweets_data, 
+                        # Run the scrape, only fetching tweets newer than this schedule's last run
+                        newest_tweet_id = None
+                        report_future = None
+                        if schedule.id in prefetched:
+                            since_id, tweets_data = prefetched.pop(schedule.id)
+                            report_future = prefetched_reports.pop(schedule.id, None)
+                            if isinstance(tweets_data, Exception):
+                                raise tweets_data
+                        else:
+                            since_id = get_since_id(schedule.username, schedule.keywords, schedule_id=schedule.id)
+                            tweets_data = scraper.search_user_tweets(
                                 schedule.username, 
-                                schedule.keywords
+                                keywords=schedule.keywords, 
+                                max_results=100,
+                                since_id=since_id
                             )
-                            
-                            # Read report content
-                            with open(report_file, 'r', encoding='utf-8') as f:
-                                report_content = f.read()
+                        
+                        if tweets_data and 'data' in tweets_data and len(tweets_data.get('data', [])) > 0:
+                            # Generate report (already queued on the report pool if prefetched)
+                            if report_future is None:
+                                report_future = report_pool.submit(tweets_data, schedule.username, schedule.keywords)
+                            # Text for deep_history; the report row stores only the analytics
+                            report_analytics, report_content = report_future.result()
                             
                             # Get account analysis
                             user_profile = tweets_data.get('user_profile', {})
@@ -172,8 +270,9 @@ def cron_run_schedules():
                                 tweet_count=len(tweets_data['data']),
                                 account_type=account_analysis.get('type'),
                                 lead_score=account_analysis.get('score'),
-                                report_content=report_content,
                                 tweets_data=tweets_data,
+                                analytics=report_analytics.to_dict(),
+                                summary=report_analytics.summary,
                                 filters={}
                             )
                             db.add(db_report)
@@ -199,6 +298,8 @@ def cron_run_schedules():
                             except Exception as dh_error:
                                 print(f"[CRON] Warning: Failed to save to deep_history: {dh_error}")
                             
+                            newest_tweet_id = scraper.newest_tweet_id(tweets_data)
+                            
                             results['executed'].append({
                                 'schedule_id': schedule.id,
                                 'username': schedule.username,
@@ -208,13 +309,21 @@ def cron_run_schedules():
                             
                             print(f"[CRON] ✓ Completed schedule {schedule.id} for @{schedule.username}")
                         else:
-                            # No tweets found or API error - still update schedule to prevent getting stuck
+                            # No tweets or a failed fetch - still update schedule to prevent getting stuck
+                            if tweets_data is None:
+                                # search_user_tweets answers None only when it could not fetch
+                                reason = ('User not found' if scraper.profile_cache.is_missing(schedule.username)
+                                          else 'X API request failed')
+                            elif since_id:
+                                reason = 'No new tweets since last run'
+                            else:
+                                reason = 'No tweets found'
                             results['skipped'].append({
                                 'schedule_id': schedule.id,
                                 'username': schedule.username,
-                                'reason': 'No tweets found or API error'
+                                'reason': reason
                             })
-                            print(f"[CRON] ✗ No tweets found for @{schedule.username}")
+                            print(f"[CRON] ✗ {reason} for @{schedule.username}")
                         
                         # ALWAYS update schedule timing, even on failure
                         # This prevents schedules from getting stuck
@@ -232,6 +341,9 @@ def cron_run_schedules():
                             schedule.next_run = now + timedelta(weeks=1)
                         
                         db.commit()
+                        
+                        # Advance the watermark only once the report is committed
+                        update_watermark(schedule.username, newest_tweet_id, schedule.keywords, schedule_id=schedule.id)
                     else:
                         results['skipped'].append({
                             'schedule_id': schedule.id,
@@ -483,7 +595,7 @@ def test_schedules():
         
         try:
             schedules = db.query(DBSchedule).filter(DBSchedule.enabled == True).all()
-            scraper = TwitterScraper()
+            scraper = twitter_scraper
             
             for schedule in schedules:
                 print(f"[TEST] Testing schedule {schedule.id}: @{schedule.username}")
@@ -658,7 +770,7 @@ def debug_reports():
                     'account_type': r.account_type,
                     'lead_score': r.lead_score,
                     'created_at': r.created_at.isoformat() if r.created_at else None,
-                    'has_report_content': bool(r.report_content),
+                    'has_report_content': bool(r.summary) or bool(r.report_content),
                     'has_tweets_data': bool(r.tweets_data)
                 })
             
@@ -771,8 +883,133 @@ def raw_reports():
             'connection_string': str(engine.url)
         }), 500
 
+def saved_scrape_response(report_id):
+    """The /scrape job result rebuilt from a report an earlier attempt already saved"""
+    db = get_db_session()
+    try:
+        report = db.query(Report).filter(Report.id == report_id).first()
+        if report is None:
+            raise JobFailed(f"Report {report_id} saved by an earlier attempt no longer exists")
+        return {
+            'success': True,
+            'report_id': report.id,
+            'tweet_count': report.tweet_count,
+            'report_content': stored_report_text(report),
+            'tweets_data': (report.tweets_data or {}).get('data', []),
+            'account_type': report.account_type,
+            'lead_score': report.lead_score
+        }
+    finally:
+        db.close()
+
+def run_scrape_job(job, username, keywords=None, filters=None, min_keyword_mentions=1):
+    """
+    Job handler for /scrape: fetch one account, build and save its report
+    
+    Returns:
+        The report summary, text and tweets (the old /scrape response)
+    """
+    if job.results:
+        # A retry after the report was saved: answer from it instead of saving it again
+        return saved_scrape_response(job.results[0]['report_id'])
+    saved = saved_job_reports(job.id).get(username)
+    if saved:
+        # Saved by an attempt that died before recording it
+        job.add_result({'username': username, 'success': True, **saved})
+        return saved_scrape_response(saved['report_id'])
+    
+    filters = filters or {}
+    scraper = twitter_scraper
+    tweets_data = scraper.search_user_tweets(username, keywords=keywords, max_results=100, filters=filters)
+    
+    if tweets_data is None:
+        if scraper.profile_cache.is_missing(username):
+            raise JobFailed(f"Could not find user @{username}")
+        # The profile or search request failed (5xx or 429 after retries): retry the job
+        raise RuntimeError(f"X API request failed for @{username}")
+    if 'data' not in tweets_data:
+        raise JobFailed('No tweets found')
+    
+    report_analytics = scraper.generate_report_analytics(tweets_data, username, keywords, min_keyword_mentions)
+    # Text for the response and deep_history; the report row stores only the analytics
+    report_content = scraper.render_report(report_analytics, tweets_data)
+    
+    # Get account analysis
+    user_profile = tweets_data.get('user_profile', {})
+    account_analysis = scraper.analyze_account_type(user_profile) if user_profile else {}
+    
+    # Don't write once another worker may be running the job
+    job.check_lease()
+    
+    # Save to database
+    db = get_db_session()
+    try:
+        db_report = Report(
+            platform='twitter',
+            username=username,
+            keywords=keywords,
+            tweet_count=len(tweets_data['data']),
+            account_type=account_analysis.get('type'),
+            lead_score=account_analysis.get('score'),
+            tweets_data=tweets_data,
+            analytics=report_analytics.to_dict(),
+            summary=report_analytics.summary,
+            filters=filters,
+            job_id=job.id
+        )
+        db.add(db_report)
+        db.commit()
+        report_id = db_report.id
+        
+        # Save to deep_history for AI/ML features
+        try:
+            save_to_deep_history(
+                username=username,
+                platform='twitter',
+                raw_json={
+                    'tweets': tweets_data['data'],
+                    'account_info': user_profile,
+                    'keywords': keywords,
+                    'lead_score': account_analysis.get('score'),
+                    'account_type': account_analysis.get('type'),
+                    'avg_sentiment': account_analysis.get('avg_sentiment')
+                },
+                raw_text=report_content,
+                report_id=report_id,
+                scrape_type='quick',
+                filters_used=filters
+            )
+        except Exception as dh_error:
+            print(f"[WARNING] Failed to save to deep_history: {dh_error}")
+            # Don't fail the request if deep_history fails
+            
+    finally:
+        db.close()
+    
+    job.add_result({
+        'username': username,
+        'success': True,
+        'report_id': report_id,
+        'tweet_count': len(tweets_data['data']),
+        'account_type': account_analysis.get('type'),
+        'lead_score': account_analysis.get('score')
+    })
+    
+    return {
+        'success': True,
+        'report_id': report_id,
+        'tweet_count': len(tweets_data['data']),
+        'report_content': report_content,
+        'tweets_data': tweets_data['data'],
+        'account_type': account_analysis.get('type'),
+        'lead_score': account_analysis.get('score')
+    }
+
+job_queue.register('scrape', run_scrape_job)
+
 @app.route('/scrape', methods=['POST'])
 def scrape():
+    """Queue a single-account scrape; poll GET /jobs/<job_id> for the report"""
     try:
         data = request.json
         username = data.get('username', '').strip()
@@ -785,80 +1022,13 @@ def scrape():
         
         keywords = [k.strip() for k in keywords_input.split(',')] if keywords_input else None
         
-        scraper = TwitterScraper()
-        tweets_data = scraper.search_user_tweets(username, keywords=keywords, max_results=100, filters=filters)
-        
-        if not tweets_data or 'data' not in tweets_data:
-            return jsonify({'error': 'No tweets found or API error occurred'}), 404
-        
-        report_file = scraper.generate_report(tweets_data, username, keywords, min_keyword_mentions)
-        
-        json_file = report_file.replace('.txt', '.json')
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(tweets_data, f, indent=2)
-        
-        # Read report content for display
-        with open(report_file, 'r', encoding='utf-8') as f:
-            report_content = f.read()
-        
-        # Get account analysis
-        user_profile = tweets_data.get('user_profile', {})
-        account_analysis = scraper.analyze_account_type(user_profile) if user_profile else {}
-        
-        # Save to database
-        db = get_db_session()
-        try:
-            db_report = Report(
-                platform='twitter',
-                username=username,
-                keywords=keywords,
-                tweet_count=len(tweets_data['data']),
-                account_type=account_analysis.get('type'),
-                lead_score=account_analysis.get('score'),
-                report_content=report_content,
-                tweets_data=tweets_data,
-                filters=filters
-            )
-            db.add(db_report)
-            db.commit()
-            report_id = db_report.id
-            
-            # Save to deep_history for AI/ML features
-            try:
-                save_to_deep_history(
-                    username=username,
-                    platform='twitter',
-                    raw_json={
-                        'tweets': tweets_data['data'],
-                        'account_info': user_profile,
-                        'keywords': keywords,
-                        'lead_score': account_analysis.get('score'),
-                        'account_type': account_analysis.get('type'),
-                        'avg_sentiment': account_analysis.get('avg_sentiment')
-                    },
-                    raw_text=report_content,
-                    report_id=report_id,
-                    scrape_type='quick',
-                    filters_used=filters
-                )
-            except Exception as dh_error:
-                print(f"[WARNING] Failed to save to deep_history: {dh_error}")
-                # Don't fail the request if deep_history fails
-                
-        finally:
-            db.close()
-        
-        return jsonify({
-            'success': True,
-            'report_id': report_id,
-            'report_file': report_file,
-            'json_file': json_file,
-            'tweet_count': len(tweets_data['data']),
-            'report_content': report_content,
-            'tweets_data': tweets_data['data'],
-            'account_type': account_analysis.get('type'),
-            'lead_score': account_analysis.get('score')
+        job = job_queue.submit('scrape', {
+            'username': username,
+            'keywords': keywords,
+            'filters': filters,
+            'min_keyword_mentions': min_keyword_mentions
         })
+        return jsonify(job_accepted(job)), 202
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -883,15 +1053,8 @@ def scrape_reddit():
         if not posts_data or 'data' not in posts_data:
             return jsonify({'error': 'No posts found or API error occurred'}), 404
         
-        report_file = scraper.generate_report(posts_data, subreddit, keywords, min_keyword_mentions)
-        
-        json_file = report_file.replace('.txt', '.json')
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(posts_data, f, indent=2)
-        
-        # Read report content for display
-        with open(report_file, 'r', encoding='utf-8') as f:
-            report_content = f.read()
+        # Rendered in memory; the text and raw JSON are stored in the report row
+        report_content = scraper.generate_report(posts_data, subreddit, keywords, min_keyword_mentions)
         
         # Save to database
         db = get_db_session()
@@ -933,8 +1096,6 @@ def scrape_reddit():
         return jsonify({
             'success': True,
             'report_id': report_id,
-            'report_file': report_file,
-            'json_file': json_file,
             'post_count': len(posts_data['data']),
             'report_content': report_content,
             'posts_data': posts_data['data']
@@ -945,20 +1106,44 @@ def scrape_reddit():
 
 @app.route('/discover-accounts', methods=['POST'])
 def discover_accounts():
-    """Discover Twitter accounts based on keywords"""
+    """
+    Discover Twitter accounts based on keywords
+    
+    Searches one page by default. With target_accounts (and optionally
+    max_requests / time_budget) it keeps paging until that many accounts
+    qualify. With stream=true the response is NDJSON: one line per page with
+    the newly found accounts, then a final 'done' line with the full result.
+    """
     try:
         data = request.json
         keywords_input = data.get('keywords', '').strip()
         max_results = data.get('max_results', 100)
         filters = data.get('filters', {})
+        target_accounts = data.get('target_accounts')
+        max_requests = int(data.get('max_requests') or (DEFAULT_DISCOVERY_MAX_REQUESTS if target_accounts else 1))
+        time_budget = data.get('time_budget')
         
         if not keywords_input:
             return jsonify({'error': 'Keywords are required'}), 400
         
         keywords = [k.strip() for k in keywords_input.split(',')]
         
-        scraper = TwitterScraper()
-        accounts_data = scraper.discover_accounts(keywords, max_results=max_results, filters=filters)
+        scraper = twitter_scraper
+        
+        if data.get('stream'):
+            def generate():
+                try:
+                    for event in scraper.iter_discover_accounts(keywords, max_results, filters, target_accounts,
+                                                                max_requests, time_budget):
+                        yield fast_json.dumps(event) + "\n"
+                except Exception as e:
+                    yield fast_json.dumps({'type': 'error', 'error': str(e)}) + "\n"
+            
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+        accounts_data = scraper.discover_accounts(keywords, max_results=max_results, filters=filters,
+                                                  target_accounts=target_accounts, max_requests=max_requests,
+                                                  time_budget=time_budget)
         
         if not accounts_data:
             return jsonify({'error': 'No accounts found'}), 404
@@ -968,7 +1153,9 @@ def discover_accounts():
             'accounts': accounts_data['accounts'],
             'total_accounts': accounts_data['total_accounts'],
             'search_keywords': accounts_data['search_keywords'],
-            'tweets_searched': accounts_data['tweets_searched']
+            'tweets_searched': accounts_data['tweets_searched'],
+            'requests_made': accounts_data['requests_made'],
+            'stop_reason': accounts_data['stop_reason']
         })
     
     except Exception as e:
@@ -986,7 +1173,7 @@ def find_similar_accounts():
         if not reference_username:
             return jsonify({'error': 'Reference username is required'}), 400
         
-        scraper = TwitterScraper()
+        scraper = twitter_scraper
         similar_data = scraper.find_similar_accounts(reference_username, max_results=max_results, filters=filters)
         
         if not similar_data:
@@ -999,7 +1186,8 @@ def find_similar_accounts():
             'reference_account': similar_data['reference_account'],
             'extracted_keywords': similar_data['extracted_keywords'],
             'tweets_searched': similar_data.get('tweets_searched', 0),
-            'message': similar_data.get('message', '')
+            'message': similar_data.get('message', ''),
+            'source': similar_data.get('source', 'live')
         })
     
     except ValueError as e:
@@ -1007,9 +1195,133 @@ def find_similar_accounts():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def run_bulk_scrape_job(job, usernames, keywords=None, filters=None, min_keyword_mentions=1):
+    """
+    Job handler for /bulk-scrape: fetch every account, build and save their reports
+    
+    Each account's outcome is recorded on the job as it is saved, so pollers
+    see progress account by account, and a retried job only fetches the
+    accounts earlier attempts didn't finish.
+    
+    Returns:
+        Counts of processed, successful and failed accounts
+    """
+    filters = filters or {}
+    scraper = twitter_scraper
+    
+    # Fetch all accounts concurrently. Each account's report is queued on the report
+    # pool as soon as its tweets arrive, so reports are built while fetching continues.
+    # Results are held as compact TweetRecords; each account is expanded only while it is saved.
+    report_futures = {}
+    
+    def queue_report(username, tweets_data):
+        if tweets_data and 'data' in tweets_data and username not in report_futures:
+            report_futures[username] = report_pool.submit(tweets_data, username, keywords, min_keyword_mentions)
+    
+    # Accounts an earlier attempt saved but died before recording
+    done = job.done
+    for username, saved in saved_job_reports(job.id).items():
+        if username in usernames and username not in done:
+            job.add_result({'username': username, 'success': True, **saved})
+    
+    done = job.done
+    pending = [username for username in usernames if username not in done]
+    fetched = async_twitter_scraper.run_search_many(pending, keywords=keywords, max_results=100, filters=filters,
+                                                    coalesce=True, compact=COMPACT_TWEETS, on_result=queue_report)
+    
+    for username in pending:
+        # Stop before saving anything once another worker may be running the job
+        job.check_lease()
+        try:
+            tweets_data = fetched.get(username)
+            if isinstance(tweets_data, Exception):
+                raise tweets_data
+            
+            if tweets_data and 'data' in tweets_data:
+                # Text for the response and deep_history; the report row stores only the analytics
+                report_analytics, report_content = report_futures[username].result()
+                
+                # Get account analysis
+                user_profile = tweets_data.get('user_profile', {})
+                account_analysis = scraper.analyze_account_type(user_profile) if user_profile else {}
+                
+                # Save to database (JSON columns need the full API form)
+                stored_data = expand_tweets_data(tweets_data)
+                db = get_db_session()
+                try:
+                    db_report = Report(
+                        platform='twitter',
+                        username=username,
+                        keywords=keywords,
+                        tweet_count=len(tweets_data['data']),
+                        account_type=account_analysis.get('type'),
+                        lead_score=account_analysis.get('score'),
+                        tweets_data=stored_data,
+                        analytics=report_analytics.to_dict(),
+                        summary=report_analytics.summary,
+                        filters=filters,
+                        job_id=job.id
+                    )
+                    db.add(db_report)
+                    db.commit()
+                    report_id = db_report.id
+                    
+                    # Save to deep_history for AI/ML features
+                    try:
+                        save_to_deep_history(
+                            username=username,
+                            platform='twitter',
+                            raw_json={
+                                'tweets': stored_data['data'],
+                                'account_info': user_profile,
+                                'keywords': keywords,
+                                'lead_score': account_analysis.get('score'),
+                                'account_type': account_analysis.get('type')
+                            },
+                            raw_text=report_content,
+                            report_id=report_id,
+                            scrape_type='bulk',
+                            filters_used=filters
+                        )
+                    except Exception as dh_error:
+                        print(f"[WARNING] Failed to save to deep_history: {dh_error}")
+                        
+                finally:
+                    db.close()
+                
+                job.add_result({
+                    'username': username,
+                    'success': True,
+                    'report_id': report_id,
+                    'tweet_count': len(tweets_data['data']),
+                    'account_type': account_analysis.get('type'),
+                    'lead_score': account_analysis.get('score')
+                })
+            else:
+                job.add_error({
+                    'username': username,
+                    'error': 'No tweets found'
+                })
+        except LeaseLost:
+            raise
+        except Exception as e:
+            job.add_error({
+                'username': username,
+                'error': str(e)
+            })
+    
+    return {
+        'success': True,
+        'total_processed': len(usernames),
+        'successful': len(job.results),
+        'failed': len(job.errors)
+    }
+
+job_queue.register('bulk_scrape', run_bulk_scrape_job)
+
 @app.route('/bulk-scrape', methods=['POST'])
 def bulk_scrape():
-    """Scrape multiple Twitter accounts at once"""
+    """Queue a scrape of multiple Twitter accounts; poll GET /jobs/<job_id> for progress"""
     try:
         data = request.json
         usernames = data.get('usernames', [])
@@ -1022,105 +1334,47 @@ def bulk_scrape():
         
         keywords = [k.strip() for k in keywords_input.split(',')] if keywords_input else None
         
-        scraper = TwitterScraper()
-        results = []
-        errors = []
-        
-        for username in usernames:
-            try:
-                tweets_data = scraper.search_user_tweets(username, keywords=keywords, max_results=100, filters=filters)
-                
-                if tweets_data and 'data' in tweets_data:
-                    report_file = scraper.generate_report(tweets_data, username, keywords, min_keyword_mentions)
-                    
-                    # Read report content
-                    with open(report_file, 'r', encoding='utf-8') as f:
-                        report_content = f.read()
-                    
-                    # Get account analysis
-                    user_profile = tweets_data.get('user_profile', {})
-                    account_analysis = scraper.analyze_account_type(user_profile) if user_profile else {}
-                    
-                    # Save to database
-                    db = get_db_session()
-                    try:
-                        db_report = Report(
-                            platform='twitter',
-                            username=username,
-                            keywords=keywords,
-                            tweet_count=len(tweets_data['data']),
-                            account_type=account_analysis.get('type'),
-                            lead_score=account_analysis.get('score'),
-                            report_content=report_content,
-                            tweets_data=tweets_data,
-                            filters=filters
-                        )
-                        db.add(db_report)
-                        db.commit()
-                        report_id = db_report.id
-                        
-                        # Save to deep_history for AI/ML features
-                        try:
-                            save_to_deep_history(
-                                username=username,
-                                platform='twitter',
-                                raw_json={
-                                    'tweets': tweets_data['data'],
-                                    'account_info': user_profile,
-                                    'keywords': keywords,
-                                    'lead_score': account_analysis.get('score'),
-                                    'account_type': account_analysis.get('type')
-                                },
-                                raw_text=report_content,
-                                report_id=report_id,
-                                scrape_type='bulk',
-                                filters_used=filters
-                            )
-                        except Exception as dh_error:
-                            print(f"[WARNING] Failed to save to deep_history: {dh_error}")
-                            
-                    finally:
-                        db.close()
-                    
-                    results.append({
-                        'username': username,
-                        'success': True,
-                        'report_id': report_id,
-                        'tweet_count': len(tweets_data['data']),
-                        'account_type': account_analysis.get('type'),
-                        'lead_score': account_analysis.get('score')
-                    })
-                else:
-                    errors.append({
-                        'username': username,
-                        'error': 'No tweets found'
-                    })
-            except Exception as e:
-                errors.append({
-                    'username': username,
-                    'error': str(e)
-                })
-        
-        return jsonify({
-            'success': True,
-            'results': results,
-            'errors': errors,
-            'total_processed': len(usernames),
-            'successful': len(results),
-            'failed': len(errors)
-        })
+        job = job_queue.submit('bulk_scrape', {
+            'usernames': usernames,
+            'keywords': keywords,
+            'filters': filters,
+            'min_keyword_mentions': min_keyword_mentions
+        }, total=len(usernames))
+        return jsonify(job_accepted(job)), 202
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status, per-account progress and (once finished) the result of a scrape job"""
+    try:
+        job = job_queue.get(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        return jsonify({'success': True, 'job': job})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/jobs', methods=['GET'])
+def get_jobs():
+    """Recent scrape jobs (without their results)"""
+    try:
+        limit = request.args.get('limit', 50, type=int)
+        return jsonify({'success': True, 'jobs': job_queue.recent(limit)})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/reports', methods=['GET'])
 def get_reports():
     """Get list of all reports"""
     try:
+        from sqlalchemy import func
+        
         db = get_db_session()
         try:
-            # Get total count first
-            total_count = db.query(Report).count()
+            # Get total count first (count the ids: Query.count() wraps every column in a subquery)
+            total_count = db.query(func.count(Report.id)).scalar()
             
             # Get all reports (no limit)
             reports = db.query(Report).order_by(Report.created_at.desc()).all()
@@ -1152,7 +1406,8 @@ def get_report(report_id):
             return jsonify({
                 'success': True,
                 'report': report.to_dict(),
-                'report_content': report.report_content,
+                'analytics': report.analytics,
+                'report_content': stored_report_text(report),
                 'tweets_data': report.tweets_data
             })
         finally:
@@ -1160,6 +1415,35 @@ def get_report(report_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/reports/<int:report_id>/download/<fmt>', methods=['GET'])
+def download_report(report_id, fmt):
+    """
+    Download a stored report as text (fmt='txt') or its raw data as JSON (fmt='json')
+
+    Served from the database row, so no report files are kept on disk.
+    """
+    if fmt not in ('txt', 'json'):
+        return jsonify({'error': "Format must be 'txt' or 'json'"}), 400
+    try:
+        db = get_db_session()
+        try:
+            report = db.query(Report).filter(Report.id == report_id).first()
+            if not report:
+                return jsonify({'error': 'Report not found'}), 404
+
+            timestamp = report.created_at.strftime('%Y%m%d_%H%M%S') if report.created_at else report_id
+            filename = f"{report.platform or 'twitter'}_report_{report.username}_{timestamp}.{fmt}"
+            if fmt == 'txt':
+                body, mimetype = stored_report_text(report) or '', 'text/plain; charset=utf-8'
+            else:
+                body, mimetype = json.dumps(report.tweets_data, indent=2), 'application/json'
+            return Response(body, mimetype=mimetype,
+                            headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+        finally:
+            db.close()
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/search-history', methods=['POST'])
 def search_history():
     """Full-text search across deep_history"""
@@ -1276,6 +1560,11 @@ def get_deep_history_record(record_id):
             if not record:
                 return jsonify({'error': 'Record not found'}), 404
             
+            # Structured numbers of the linked report (no need to re-derive them from raw_json)
+            report_analytics = None
+            if record.report_id:
+                report_analytics = db.query(Report.analytics).filter(Report.id == record.report_id).scalar()
+            
             # Return full record with all data
             record_dict = {
                 'id': record.id,
@@ -1301,7 +1590,8 @@ def get_deep_history_record(record_id):
                 'topics': record.topics,
                 'ai_analysis': record.ai_analysis,
                 'ai_summary': record.ai_summary,
-                'filters_used': record.filters_used
+                'filters_used': record.filters_used,
+                'report_analytics': report_analytics
             }
             
             return jsonify({
@@ -1464,22 +1754,6 @@ def export_deep_history():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/download/<path:filename>')
-def download(filename):
-    try:
-        return send_file(filename, as_attachment=True)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 404
-
-@app.route('/view-report/<path:filename>')
-def view_report(filename):
-    try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
-        return jsonify({'content': content})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 404
-
 @app.route('/schedules', methods=['GET'])
 def get_schedules():
     """Get all schedules from database (both active and paused)"""
@@ -1660,7 +1934,7 @@ def run_schedule_now(schedule_id):
             print(f"[MANUAL_RUN] Running schedule {schedule_id} for @{schedule.username}")
             
             # Run the scrape
-            scraper = TwitterScraper()
+            scraper = twitter_scraper
             tweets_data = scraper.search_user_tweets(
                 schedule.username, 
                 keywords=schedule.keywords, 
@@ -1669,15 +1943,13 @@ def run_schedule_now(schedule_id):
             
             if tweets_data and 'data' in tweets_data:
                 # Generate report
-                report_file = scraper.generate_report(
+                report_analytics = scraper.generate_report_analytics(
                     tweets_data, 
                     schedule.username, 
                     schedule.keywords
                 )
-                
-                # Read report content
-                with open(report_file, 'r', encoding='utf-8') as f:
-                    report_content = f.read()
+                # Text for the response and deep_history; the report row stores only the analytics
+                report_content = scraper.render_report(report_analytics, tweets_data)
                 
                 # Get account analysis
                 user_profile = tweets_data.get('user_profile', {})
@@ -1691,8 +1963,9 @@ def run_schedule_now(schedule_id):
                     tweet_count=len(tweets_data['data']),
                     account_type=account_analysis.get('type'),
                     lead_score=account_analysis.get('score'),
-                    report_content=report_content,
                     tweets_data=tweets_data,
+                    analytics=report_analytics.to_dict(),
+                    summary=report_analytics.summary,
                     filters={}
                 )
                 db.add(db_report)
@@ -1768,6 +2041,5 @@ def get_historical(username):
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
-    os.makedirs('reports', exist_ok=True)
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=False)
@@ -0,0 +1,127 @@
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from twitter_scraper import TwitterScraper
+
+# Maximum number of accounts fetched at the same time
+DEFAULT_CONCURRENCY = int(os.getenv('TWITTER_CONCURRENCY', '10'))
+
+
+class AsyncTwitterScraper:
+    """
+    Asyncio counterpart to TwitterScraper for concurrent multi-account fetches
+
+    Fetches are still done by the sync TwitterScraper methods, but many run at
+    once on a bounded worker pool that shares the scraper's keep-alive
+    connection pool.
+    """
+
+    def __init__(self, scraper=None, concurrency=DEFAULT_CONCURRENCY):
+        """
+        Args:
+            scraper: TwitterScraper to delegate to (one is created if omitted)
+            concurrency: Maximum number of in-flight account fetches
+        """
+        self.scraper = scraper or TwitterScraper()
+        # Never run more fetches than the HTTP pool has connections for
+        self.concurrency = max(1, min(concurrency, self.scraper.pool_size))
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix='twitter-fetch'
+        )
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def search_user_tweets(self, username, keywords=None, max_results=100, filters=None, since_id=None):
+        """Async version of TwitterScraper.search_user_tweets"""
+        return await self._run(self.scraper.search_user_tweets, username, keywords, max_results, filters, since_id)
+
+    async def search_user_group(self, usernames, keywords=None, max_results=100, filters=None, since_ids=None,
+                                compact=False):
+        """Async version of TwitterScraper.search_user_group"""
+        return await self._run(self.scraper.search_user_group, usernames, keywords, max_results, filters, since_ids,
+                               compact)
+
+    async def search_many(self, usernames, keywords=None, max_results=100, filters=None, since_ids=None,
+                          coalesce=False, compact=False, on_result=None):
+        """
+        Search tweets for many accounts concurrently
+
+        By default each account is searched on its own, so every result is what
+        TwitterScraper.search_user_tweets returns for it. With coalesce enabled,
+        accounts are packed into combined (from:a OR from:b ...) queries (see
+        TwitterScraper.plan_user_groups and search_user_group) and the groups
+        are searched concurrently: each account gets the same tweets in fewer
+        requests, but the result's meta/includes are rebuilt from the group's
+        pages rather than being the API's own.
+
+        Args:
+            usernames: List of Twitter handles (without @)
+            keywords, max_results, filters: Same as TwitterScraper.search_user_tweets
+            since_ids: Optional dict of username -> since_id watermark
+            coalesce: Combine accounts into shared search queries (off by default)
+            compact: Hold results as TweetRecords (see compact_tweets_data), built
+                page by page as each group is read, so the full API dicts of all
+                in-flight groups are never alive at the same time
+            on_result: Optional callback(username, tweets_data) called as each
+                account's result arrives, before the remaining groups finish
+                (e.g. to start building its report)
+
+        Returns:
+            Dict of username -> tweets data (None if nothing found). If a fetch
+            raised, the exception instance is returned as that username's value;
+            handles that could not be resolved get a LookupError without being
+            searched.
+        """
+        unique_usernames = list(dict.fromkeys(usernames))
+
+        # Resolve every profile up front in batched /users/by lookups; the
+        # per-account searches below then hit the profile cache
+        try:
+            await self._run(self.scraper.get_user_infos, unique_usernames)
+        except Exception as e:
+            print(f"Batched profile lookup failed, falling back to per-account lookups: {e}")
+
+        # Unknown handles were cached as missing by the lookup; record them
+        # instead of spending a search (and another lookup) on each
+        unresolved = {username for username in unique_usernames if self.scraper.profile_cache.is_missing(username)}
+        if coalesce:
+            groups = self.scraper.plan_user_groups(unique_usernames, keywords, filters)
+        else:
+            groups = [[username] for username in unique_usernames if username not in unresolved]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(group):
+            async with semaphore:
+                group_result = await self.search_user_group(group, keywords, max_results, filters, since_ids, compact)
+            if on_result:
+                for username in group:
+                    on_result(username, group_result.get(username))
+            return group_result
+
+        group_results = await asyncio.gather(
+            *(fetch(group) for group in groups),
+            return_exceptions=True
+        )
+
+        results = {username: LookupError(f"Could not find user @{username}") for username in unresolved}
+        for group, group_result in zip(groups, group_results):
+            for username in group:
+                if isinstance(group_result, Exception):
+                    results[username] = group_result
+                else:
+                    results[username] = group_result.get(username)
+        return {username: results[username] for username in unique_usernames}
+
+    def run_search_many(self, usernames, keywords=None, max_results=100, filters=None, since_ids=None,
+                        coalesce=False, compact=False, on_result=None):
+        """Blocking wrapper around search_many for sync callers (Flask routes, cron)"""
+        return asyncio.run(self.search_many(usernames, keywords, max_results, filters, since_ids, coalesce, compact,
+                                            on_result))
+
+    def close(self):
+        """Shut down the worker pool"""
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Python-level aggregates vs. the NumPy analytics module
+
+On synthetic tweets (mock X API fixtures), computes the engagement aggregates
+the report and deep_history need - per-metric totals, mean and median score,
+the top 5 tweets and the sentiment distribution - first with the original
+generator sums and sorted(), then with analytics (one load into an array,
+then vectorized math), and checks the results agree.
+
+Usage:
+    python benchmarks/bench_analytics.py [tweets]
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analytics
+from benchmarks.mock_x_api import build_synthetic_fixtures
+
+SENTIMENTS = ('Positive', 'Negative', 'Neutral')
+
+
+def python_aggregates(tweets, labels):
+    scores = []
+    for tweet in tweets:
+        metrics = tweet.get('public_metrics', {})
+        scores.append(metrics.get('like_count', 0) * 1 + metrics.get('retweet_count', 0) * 3 +
+                      metrics.get('reply_count', 0) * 2 + metrics.get('quote_count', 0) * 2)
+    totals = {
+        field: sum(tweet.get('public_metrics', {}).get(field, 0) for tweet in tweets)
+        for field in analytics.TWEET_METRIC_FIELDS
+    }
+    top = [i for i, _ in sorted(enumerate(scores), key=lambda entry: entry[1], reverse=True)[:5]]
+    distribution = {sentiment: sum(1 for label in labels if label == sentiment) for sentiment in SENTIMENTS}
+    return totals, sum(scores) / len(scores), statistics.median(scores), top, distribution
+
+
+def numpy_aggregates(tweets, labels):
+    metrics = analytics.tweet_metrics(tweets)
+    scores = analytics.engagement_scores(metrics)
+    summary = analytics.summarize(scores)
+    return (analytics.metric_totals(metrics), summary['mean'], summary['p50'],
+            analytics.top_k(scores, 5).tolist(), analytics.label_counts(labels, SENTIMENTS))
+
+
+def best_of(func, repeats=3):
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    per_user = 1000
+    tweets = build_synthetic_fixtures(users=max(1, count // per_user), tweets_per_user=per_user, seed=4)['tweets']
+    rng = random.Random(4)
+    labels = [rng.choice(SENTIMENTS) for _ in tweets]
+
+    python_time, expected = best_of(lambda: python_aggregates(tweets, labels))
+    numpy_time, result = best_of(lambda: numpy_aggregates(tweets, labels))
+    assert result[0] == expected[0] and result[3:] == expected[3:], "results differ"
+    assert abs(result[1] - expected[1]) < 1e-9 and result[2] == expected[2], "results differ"
+
+    print(f"{len(tweets):,} tweets")
+    print(f"  generator sums + sorted: {python_time * 1000:8.1f} ms")
+    print(f"  numpy analytics:         {numpy_time * 1000:8.1f} ms  ({python_time / numpy_time:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak RSS of a 100-account /bulk-scrape, full tweet dicts vs TweetRecords
+
+Runs the real /bulk-scrape job (Flask test client, polling /jobs/<id>) against
+the mock X API and a throwaway SQLite database, once with COMPACT_TWEETS=0
+(every fetched account held as full API dicts until the loop reaches it) and
+once with COMPACT_TWEETS=1 (held as compact TweetRecords, expanded one account
+at a time for saving). Each mode runs in a fresh subprocess; the figure
+reported is the peak RSS reached during the job minus the RSS just before it,
+so the mock server's fixtures and the imports are not counted.
+
+The synthetic tweets are padded with the fields real v2 responses carry
+(entity offsets, annotations, edit_history_tweet_ids, referenced_tweets,
+bookmark/impression counts) so the dicts are sized like production payloads.
+
+Usage:
+    python benchmarks/bench_bulk_rss.py [accounts]
+"""
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def current_rss_kb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+
+def enrich_like_api(fixtures, seed=5):
+    """Add the fields a real search response carries to each synthetic tweet"""
+    rng = random.Random(seed)
+    for tweet in fixtures['tweets']:
+        tweet['edit_history_tweet_ids'] = [tweet['id']]
+        tweet['lang'] = 'en'
+        tweet['conversation_id'] = tweet['id']
+        tweet['public_metrics'].update(bookmark_count=rng.randint(0, 5), impression_count=rng.randint(0, 20000))
+        if rng.random() < 0.3:
+            tweet['referenced_tweets'] = [{'type': 'replied_to', 'id': str(rng.randint(10 ** 18, 10 ** 19))}]
+        entities = tweet.setdefault('entities', {})
+        for url in entities.get('urls', []):
+            url.update(start=10, end=33, display_url=url['url'][8:30], status=200, unwound_url=url['expanded_url'])
+        for mention in entities.get('mentions', []):
+            mention.update(start=0, end=len(mention['username']) + 1, id=str(rng.randint(10 ** 8, 10 ** 9)))
+        for tag in entities.get('hashtags', []):
+            tag.update(start=40, end=40 + len(tag['tag']) + 1)
+        entities['annotations'] = [{'start': 5, 'end': 12, 'probability': round(rng.random(), 4),
+                                    'type': 'Product', 'normalized_text': 'Product'}]
+    return fixtures
+
+
+def child(accounts):
+    tmp = tempfile.TemporaryDirectory()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp.name, 'bench.db')}"
+    os.environ.setdefault('TWITTER_BEARER_TOKEN', 'benchmark-token')
+
+    from benchmarks.mock_x_api import MockXAPI, build_synthetic_fixtures
+    api = MockXAPI(enrich_like_api(build_synthetic_fixtures(users=accounts, tweets_per_user=150)),
+                   rate_limit=None).start()
+    os.environ['TWITTER_API_BASE_URL'] = api.base_url
+
+    import contextlib
+    import gc
+    import io
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app as flask_app
+    client = flask_app.app.test_client()
+    usernames = [f"user{i:04d}" for i in range(accounts)]
+
+    gc.collect()
+    before = current_rss_kb()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        job_id = client.post('/bulk-scrape', json={'usernames': usernames, 'keywords': ''}).get_json()['job_id']
+        job = client.get(f"/jobs/{job_id}").get_json()['job']
+        while job['status'] in ('queued', 'running'):
+            time.sleep(0.01)
+            job = client.get(f"/jobs/{job_id}").get_json()['job']
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux
+    api.stop()
+    print(f"{peak - before} {elapsed:.2f} {job['progress']['succeeded']}")
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--child':
+        child(int(sys.argv[2]))
+        return
+
+    accounts = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    print(f"/bulk-scrape, {accounts} accounts x 100 tweets")
+    for label, flag in (('full API dicts', '0'), ('TweetRecords', '1')):
+        env = dict(os.environ, COMPACT_TWEETS=flag)
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', str(accounts)],
+                                env=env, cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        growth_kb, elapsed, successful = output.strip().splitlines()[-1].split()
+        print(f"  {label:<15} peak RSS +{int(growth_kb) / 1024:7.1f} MiB  {float(elapsed):6.2f} s  "
+              f"({successful} reports)")
+
+
+if __name__ == "__main__":
+    main()
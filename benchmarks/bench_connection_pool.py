@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pooled keep-alive session vs. a fresh connection per request
+
+Starts a local HTTP/1.1 server that mimics the X API user lookup endpoint and
+times the same request issued with a bare `requests.get` (new TCP connection
+every call) and through TwitterScraper's pooled session.
+
+Usage:
+    python benchmarks/bench_connection_pool.py [requests]
+
+Note: the local server is plain HTTP, so this only measures the TCP
+handshake saved per request. Against api.x.com the TLS handshake is saved as
+well, which is typically several times larger.
+"""
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('TWITTER_BEARER_TOKEN', 'benchmark-token')
+
+import requests
+from twitter_scraper import TwitterScraper
+
+USER_PAYLOAD = json.dumps({
+    'data': {
+        'id': '12345',
+        'username': 'benchmark',
+        'name': 'Benchmark Account',
+        'public_metrics': {'followers_count': 1000, 'following_count': 100, 'tweet_count': 5000}
+    }
+}).encode('utf-8')
+
+
+class UserLookupHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Required for keep-alive
+    disable_nagle_algorithm = True
+    
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(USER_PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(USER_PAYLOAD)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def time_requests(fetch, count):
+    """Return per-request latencies in milliseconds"""
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = fetch()
+        response.content
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), UserLookupHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_port}/2/users/by/username/benchmark"
+    
+    scraper = TwitterScraper()
+    
+    # Warm up both paths (imports, first connection)
+    requests.get(endpoint, headers=scraper.headers).content
+    scraper._get(endpoint).content
+    
+    bare = time_requests(lambda: requests.get(endpoint, headers=scraper.headers), count)
+    pooled = time_requests(lambda: scraper._get(endpoint), count)
+    
+    server.shutdown()
+    scraper.close()
+    
+    print(f"Requests per mode: {count}")
+    print(f"{'mode':<22}{'mean ms':>10}{'median ms':>12}{'p95 ms':>10}")
+    for label, latencies in (('requests.get (fresh)', bare), ('pooled session', pooled)):
+        p95 = statistics.quantiles(latencies, n=20)[18]
+        print(f"{label:<22}{statistics.mean(latencies):>10.3f}{statistics.median(latencies):>12.3f}{p95:>10.3f}")
+    
+    saved = statistics.mean(bare) - statistics.mean(pooled)
+    print(f"\nSaved per request: {saved:.3f} ms ({saved / statistics.mean(bare) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
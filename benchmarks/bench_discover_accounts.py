@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: author resolution in discover_accounts
+
+Compares the original per-tweet linear scan of includes.users plus per-author
+re-count (O(tweets x users + tweets x authors)) against the user-ID index and
+single-pass Counter now used by TwitterScraper, on a synthetic set of 10k
+tweets, and checks both produce the same accounts.
+
+Usage:
+    python benchmarks/bench_discover_accounts.py [tweets] [authors]
+"""
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('TWITTER_BEARER_TOKEN', 'benchmark-token')
+
+from twitter_scraper import TwitterScraper
+
+
+def build_tweets_data(tweet_count, author_count, seed=3):
+    """A merged search result: tweets with author_id plus includes.users"""
+    rng = random.Random(seed)
+    users = [
+        {
+            'id': str(1000 + i),
+            'username': f"author{i}",
+            'name': f"Author {i}",
+            'description': rng.choice(['Founder at Acme', 'Marketing lead', 'Official account', '']),
+            'verified': rng.random() < 0.1,
+            'public_metrics': {
+                'followers_count': int(rng.paretovariate(1.2) * 100),
+                'following_count': rng.randint(0, 3000),
+                'tweet_count': rng.randint(10, 50000)
+            }
+        }
+        for i in range(author_count)
+    ]
+    # Skewed authorship: a few authors write most tweets
+    weights = [1 / (rank + 1) for rank in range(author_count)]
+    authors = rng.choices(users, weights=weights, k=tweet_count)
+    tweets = [{'id': str(10 ** 18 + i), 'author_id': author['id'], 'text': 'matching tweet'}
+              for i, author in enumerate(authors)]
+    return {'data': tweets, 'includes': {'users': users}}
+
+
+def legacy_accounts(scraper, tweets_data, filters=None):
+    """The original discover_accounts loop, kept verbatim for comparison"""
+    accounts = {}
+    for tweet in tweets_data['data']:
+        author_id = tweet.get('author_id')
+        if author_id and author_id not in accounts:
+            user_info = None
+            if 'includes' in tweets_data and 'users' in tweets_data['includes']:
+                for user in tweets_data['includes']['users']:
+                    if user['id'] == author_id:
+                        user_info = user
+                        break
+
+            if user_info:
+                followers = user_info.get('public_metrics', {}).get('followers_count', 0)
+                if filters and filters.get('min_followers'):
+                    if followers < filters['min_followers']:
+                        continue
+
+                tweet_count = sum(1 for t in tweets_data['data'] if t.get('author_id') == author_id)
+                quality_score = scraper._calculate_account_quality_score(user_info, tweet_count)
+                account_type = scraper._detect_account_type(user_info)
+
+                accounts[author_id] = {
+                    'id': user_info['id'],
+                    'username': user_info['username'],
+                    'name': user_info['name'],
+                    'description': user_info.get('description', ''),
+                    'followers_count': followers,
+                    'following_count': user_info.get('public_metrics', {}).get('following_count', 0),
+                    'tweet_count': user_info.get('public_metrics', {}).get('tweet_count', 0),
+                    'verified': user_info.get('verified', False),
+                    'created_at': user_info.get('created_at', ''),
+                    'profile_image_url': user_info.get('profile_image_url', ''),
+                    'matching_tweets': tweet_count,
+                    'location': user_info.get('location', ''),
+                    'quality_score': quality_score,
+                    'account_type': account_type
+                }
+    return accounts
+
+
+def indexed_accounts(scraper, tweets_data, filters=None):
+    """The current discover_accounts path"""
+    users_by_id = scraper._index_users(tweets_data.get('includes', {}).get('users', []))
+    author_counts = Counter(tweet.get('author_id') for tweet in tweets_data['data'])
+    return scraper._build_accounts(author_counts, users_by_id, filters)
+
+
+def best_of(func, repeats=3):
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    tweet_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    author_count = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+    scraper = TwitterScraper()
+    tweets_data = build_tweets_data(tweet_count, author_count)
+
+    for filters in (None, {'min_followers': 500}):
+        legacy_time, legacy = best_of(lambda: legacy_accounts(scraper, tweets_data, filters))
+        indexed_time, indexed = best_of(lambda: indexed_accounts(scraper, tweets_data, filters))
+        assert list(legacy.items()) == list(indexed.items()), "results differ"
+
+        print(f"{tweet_count:,} tweets / {author_count:,} authors, filters={filters} -> {len(indexed):,} accounts")
+        print(f"  linear scan + re-count: {legacy_time * 1000:9.1f} ms")
+        print(f"  id index + Counter:     {indexed_time * 1000:9.1f} ms  ({legacy_time / indexed_time:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: scrape_jobs queue throughput as worker processes are added
+
+Queues N jobs in a throwaway SQLite database (or DATABASE_URL, if set to a
+PostgreSQL database you can write to), then drains them with 1, 2 and 4 worker
+processes, each running a JobQueue with JOB_WORKERS threads. The handler
+sleeps for a fixed time to stand in for a scrape's API wait, so the numbers
+show how claiming scales out; each run also checks that every job ran
+exactly once.
+
+Usage:
+    python benchmarks/bench_job_queue.py [jobs] [handler_ms]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def worker(threads, handler_seconds, done):
+    import contextlib
+    import io
+    with contextlib.redirect_stdout(io.StringIO()):
+        from jobs import JobQueue
+
+    def handler(job, n):
+        time.sleep(handler_seconds)
+        return {'n': n}
+
+    queue = JobQueue(workers=threads, poll_interval=0.05)
+    queue.register('bench', handler)
+    with contextlib.redirect_stdout(io.StringIO()):
+        queue.start()
+        done.wait()
+        queue.stop()
+
+
+def drain(processes, jobs, threads, handler_seconds):
+    import contextlib
+    import io
+    from sqlalchemy import func
+    from database import ScrapeJob, enqueue_scrape_job, get_db_session
+
+    session = get_db_session()
+    session.query(ScrapeJob).delete()
+    session.commit()
+    for n in range(jobs):
+        enqueue_scrape_job(f"{processes:02d}{n:030d}", 'bench', {'n': n})
+
+    context = multiprocessing.get_context('spawn')
+    done = context.Event()
+    start = time.perf_counter()
+    workers = [context.Process(target=worker, args=(threads, handler_seconds, done)) for _ in range(processes)]
+    for process in workers:
+        process.start()
+    while True:
+        finished = session.query(func.count(ScrapeJob.id)).filter(ScrapeJob.status == 'succeeded').scalar()
+        session.commit()
+        if finished == jobs:
+            break
+        time.sleep(0.02)
+    elapsed = time.perf_counter() - start
+    done.set()
+    for process in workers:
+        process.join()
+
+    attempts = session.query(func.sum(ScrapeJob.attempts)).scalar()
+    session.close()
+    assert attempts == jobs, f"{attempts} attempts for {jobs} jobs"
+    return elapsed
+
+
+def main():
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    handler_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 50
+    threads = int(os.getenv('JOB_WORKERS', '2'))
+
+    import contextlib
+    import io
+    with contextlib.redirect_stdout(io.StringIO()):
+        from database import engine, init_db
+        init_db()
+
+    print(f"{jobs} jobs x {handler_ms:.0f} ms handler, {threads} thread(s) per process, {engine.dialect.name}")
+    baseline = None
+    for processes in (1, 2, 4):
+        elapsed = drain(processes, jobs, threads, handler_ms / 1000)
+        baseline = baseline or elapsed
+        print(f"  {processes} process(es): {elapsed:6.2f} s  {jobs / elapsed:7.1f} jobs/s  "
+              f"({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    if not os.getenv('DATABASE_URL'):
+        _tmp = tempfile.TemporaryDirectory()
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_tmp.name, 'bench.db')}"
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: stdlib json vs. fast_json along the scrape-to-response path
+
+A 100-tweet recent-search payload (from the mock X API's synthetic fixtures)
+goes through every JSON step it takes in the app:
+
+    decode     API response bytes -> dict (was response.json())
+    store      Report.tweets_data, DeepHistory.raw_json and one
+               HistoricalTweet.tweet_data per tweet, via the engine's
+               JSON serializer (in-memory SQLite)
+    load       the Report row read back through the JSON deserializer
+    respond    the /reports/<id> body rendered by Flask's JSON provider
+
+Usage:
+    python benchmarks/bench_json.py [iterations]
+"""
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import JSON, Column, Integer, String, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+import fast_json
+from fast_json import FastJSONProvider
+from benchmarks.mock_x_api import build_synthetic_fixtures
+
+Base = declarative_base()
+
+
+class BenchReport(Base):
+    __tablename__ = 'bench_reports'
+    id = Column(Integer, primary_key=True)
+    username = Column(String)
+    tweets_data = Column(JSON)
+    raw_json = Column(JSON)
+
+
+class BenchTweet(Base):
+    __tablename__ = 'bench_tweets'
+    id = Column(Integer, primary_key=True)
+    tweet_id = Column(String)
+    tweet_data = Column(JSON)
+
+
+def build_payload():
+    """A recent-search response with 100 tweets, as raw bytes"""
+    fixtures = build_synthetic_fixtures(users=1, tweets_per_user=100, seed=7)
+    user = fixtures['users'][0]
+    body = {
+        'data': fixtures['tweets'],
+        'includes': {'users': [user]},
+        'meta': {'result_count': len(fixtures['tweets'])}
+    }
+    return json.dumps(body).encode('utf-8'), user
+
+
+def run_backend(name, loads, dumps, provider_class, payload, user, iterations):
+    engine = create_engine('sqlite://', json_serializer=dumps, json_deserializer=loads)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    app = Flask(name)
+    app.json = provider_class(app)
+
+    timings = {'decode': [], 'store': [], 'load': [], 'respond': []}
+    for _ in range(iterations):
+        start = time.perf_counter()
+        tweets_data = loads(payload)
+        tweets_data['user_profile'] = user
+        decoded = time.perf_counter()
+
+        db = Session()
+        report = BenchReport(
+            username=user['username'],
+            tweets_data=tweets_data,
+            raw_json={'tweets': tweets_data['data'], 'account_info': user}
+        )
+        db.add(report)
+        db.add_all(BenchTweet(tweet_id=tweet['id'], tweet_data=tweet) for tweet in tweets_data['data'])
+        db.commit()
+        report_id = report.id
+        db.close()
+        stored = time.perf_counter()
+
+        db = Session()
+        loaded_report = db.get(BenchReport, report_id)
+        body = {'success': True, 'report': {'id': loaded_report.id, 'username': loaded_report.username},
+                'tweets_data': loaded_report.tweets_data}
+        db.close()
+        loaded = time.perf_counter()
+
+        with app.app_context():
+            app.json.response(body).get_data()
+        responded = time.perf_counter()
+
+        timings['decode'].append((decoded - start) * 1000)
+        timings['store'].append((stored - decoded) * 1000)
+        timings['load'].append((loaded - stored) * 1000)
+        timings['respond'].append((responded - loaded) * 1000)
+
+    engine.dispose()
+    return {step: statistics.median(values) for step, values in timings.items()}
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    payload, user = build_payload()
+
+    stdlib = run_backend('stdlib', json.loads, json.dumps, DefaultJSONProvider, payload, user, iterations)
+    fast = run_backend('fast', fast_json.loads, fast_json.dumps, FastJSONProvider, payload, user, iterations)
+
+    print(f"Payload: 100 tweets, {len(payload) / 1024:.1f} KiB | iterations: {iterations} | fast backend: {fast_json.BACKEND}")
+    print(f"{'step':<10}{'stdlib ms':>12}{'fast ms':>12}{'speedup':>10}")
+    for step in stdlib:
+        print(f"{step:<10}{stdlib[step]:>12.3f}{fast[step]:>12.3f}{stdlib[step] / fast[step]:>9.1f}x")
+    total_stdlib = sum(stdlib.values())
+    total_fast = sum(fast.values())
+    print(f"{'total':<10}{total_stdlib:>12.3f}{total_fast:>12.3f}{total_stdlib / total_fast:>9.1f}x")
+    print("\n'store' and 'load' include SQLite work; only their JSON share changes between backends.")
+
+
+if __name__ == "__main__":
+    main()
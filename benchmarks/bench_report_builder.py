@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Benchmark: report generation time vs. tweet count
+
+Runs the report builder behind TwitterScraper.generate_report on 1k, 10k and
+100k synthetic tweets and prints the time per tweet. Every per-tweet feature is computed once by the
+builder's TweetAnalysis stage, so the per-tweet cost should stay flat as the
+tweet count grows.
+
+Usage:
+    python benchmarks/bench_report_builder.py [max_tweets]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('TWITTER_BEARER_TOKEN', 'benchmark-token')
+
+from twitter_scraper import TwitterScraper
+from report_builder import TweetReportBuilder
+from benchmarks.bench_text_matcher import KEYWORDS, build_tweets
+
+
+def main():
+    max_tweets = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    scraper = TwitterScraper()
+    all_tweets = build_tweets(max_tweets)
+    profile = {'username': 'bench', 'description': 'Founder and CEO', 'public_metrics': {'followers_count': 5000}}
+
+    print(f"{'tweets':>10}{'total ms':>12}{'us/tweet':>12}")
+    count = 1_000
+    while count <= max_tweets:
+        start = time.perf_counter()
+        builder = TweetReportBuilder(scraper, 'bench', KEYWORDS, user_profile=profile)
+        builder.add_tweets(all_tweets[:count])
+        builder.render()
+        elapsed = time.perf_counter() - start
+        print(f"{count:>10,}{elapsed * 1000:>12.1f}{elapsed / count * 1e6:>12.1f}")
+        count *= 10
+
+
+if __name__ == "__main__":
+    main()
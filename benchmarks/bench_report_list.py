@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: report list view with and without the deferred text columns
+
+Fills a throwaway SQLite database with Twitter reports (100 synthetic tweets
+each, stored the way /scrape stores them: tweets_data + analytics), then times
+the /reports list query two ways: loading every column, as it did when the
+full report text lived in each row, and with report_content/tweets_data/
+analytics deferred so only the metadata and the small summary column are read. Also times
+rendering one report's text from its analytics, which is what
+GET /reports/<id> now does.
+
+Usage:
+    python benchmarks/bench_report_list.py [reports]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('TWITTER_BEARER_TOKEN', 'benchmark-token')
+# Never touch a real database
+_tmp = tempfile.TemporaryDirectory()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_tmp.name, 'bench.db')}"
+
+from sqlalchemy.orm import undefer
+
+import fast_json
+from database import Report, get_db_session, init_db
+from twitter_scraper import TwitterScraper
+from benchmarks.bench_text_matcher import KEYWORDS, build_tweets
+
+
+def best_of(func, repeats=5):
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def list_reports(*options):
+    db = get_db_session()
+    try:
+        reports = db.query(Report).options(*options).order_by(Report.created_at.desc()).all()
+        return [r.to_dict() for r in reports]
+    finally:
+        db.close()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    init_db()
+    scraper = TwitterScraper()
+    tweets_data = {'data': build_tweets(100), 'user_profile': {'username': 'bench', 'public_metrics': {}}}
+    report_analytics = scraper.generate_report_analytics(tweets_data, 'bench', KEYWORDS)
+    report_text = scraper.render_report(report_analytics, tweets_data)
+
+    db = get_db_session()
+    try:
+        for i in range(count):
+            db.add(Report(platform='twitter', username=f"bench{i}", keywords=KEYWORDS, tweet_count=100,
+                          tweets_data=tweets_data, analytics=report_analytics.to_dict(),
+                          summary=report_analytics.summary))
+        db.commit()
+    finally:
+        db.close()
+
+    full_time, _ = best_of(lambda: list_reports(undefer(Report.report_content), undefer(Report.tweets_data),
+                                                undefer(Report.analytics)))
+    deferred_time, rows = best_of(lambda: list_reports())
+    render_time, rendered = best_of(lambda: scraper.render_report(report_analytics.to_dict(), tweets_data))
+    assert rendered == report_text and len(rows) == count
+
+    print(f"{count:,} reports x 100 tweets")
+    print(f"  list, all columns:      {full_time * 1000:8.1f} ms")
+    print(f"  list, deferred columns: {deferred_time * 1000:8.1f} ms  ({full_time / deferred_time:.1f}x faster)")
+    print(f"  render one report:      {render_time * 1000:8.2f} ms  (text {len(report_text):,} chars, "
+          f"analytics {len(fast_json.dumps(report_analytics.to_dict())):,} chars)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: building a batch of reports in-process vs on the report pool
+
+Builds the analytics and text of N accounts x 100 synthetic tweets (held as
+compact TweetRecords, as /bulk-scrape holds them), first one after another in
+the calling process, as /bulk-scrape and the cron batch did, then through a
+ReportPool. Both give identical results. Pool workers are started (and warmed)
+before timing, as they are reused across batches in the app.
+
+The speedup is bounded by the CPUs the container actually gets
+(report_pool.available_cpus()); on a single CPU the pool only adds pickling.
+
+Usage:
+    python benchmarks/bench_report_pool.py [accounts] [workers]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('TWITTER_BEARER_TOKEN', 'benchmark-token')
+
+from report_pool import ReportPool, available_cpus, build_report
+from tweet_record import compact_tweets_data
+from benchmarks.bench_text_matcher import KEYWORDS, build_tweets
+
+
+def build_batch(accounts):
+    tweets = build_tweets(accounts * 100)
+    return [
+        (f"user{i:04d}", compact_tweets_data({'data': tweets[i * 100:(i + 1) * 100],
+                                              'user_profile': {'username': f"user{i:04d}", 'public_metrics': {}}}))
+        for i in range(accounts)
+    ]
+
+
+def run_inline(batch):
+    return [build_report(tweets_data, username, KEYWORDS) for username, tweets_data in batch]
+
+
+def run_pool(pool, batch):
+    futures = [pool.submit(tweets_data, username, KEYWORDS) for username, tweets_data in batch]
+    return [future.result() for future in futures]
+
+
+def comparable(results):
+    # generated_at (and the Generated: header line) differs between runs
+    return [(analytics.to_dict() | {'generated_at': None}, text.split('\n', 4)[4]) for analytics, text in results]
+
+
+def main():
+    accounts = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else max(2, available_cpus())
+    batch = build_batch(accounts)
+
+    pool = ReportPool(workers=workers)
+    run_pool(pool, batch[:workers])  # start and warm the workers
+
+    start = time.perf_counter()
+    inline = run_inline(batch)
+    inline_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pooled = run_pool(pool, batch)
+    pool_time = time.perf_counter() - start
+    pool.close()
+
+    assert comparable(inline) == comparable(pooled)
+    print(f"{accounts} reports x 100 tweets, {available_cpus()} usable CPU(s)")
+    print(f"  in-process:           {inline_time * 1000:8.1f} ms")
+    print(f"  pool, {workers} worker(s):   {pool_time * 1000:8.1f} ms  ({inline_time / pool_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: report file round trip vs. in-memory rendering
+
+Generates the per-scrape report (100 tweets, like /scrape) repeatedly, first
+the old way - write reports/twitter_report_*.txt, then open it again to read
+report_content - and then with generate_report returning the text directly.
+Checks both give the same report (apart from the Generated timestamp).
+
+Usage:
+    python benchmarks/bench_report_render.py [reports]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('TWITTER_BEARER_TOKEN', 'benchmark-token')
+
+from twitter_scraper import TwitterScraper
+from report_builder import TweetReportBuilder
+from benchmarks.bench_text_matcher import KEYWORDS, build_tweets
+
+TWEETS_PER_REPORT = 100
+PASSES = 5
+
+
+def strip_generated(report):
+    return [line for line in report.splitlines() if not line.startswith(('Generated:', 'Date:'))]
+
+
+def file_round_trip(scraper, tweets_data, directory):
+    """The old flow: the builder writes a file, the caller reads it back"""
+    builder = TweetReportBuilder(scraper, 'bench', KEYWORDS, user_profile=tweets_data['user_profile'])
+    builder.add_tweets(tweets_data['data'])
+    report_file = builder.write(os.path.join(directory, f"twitter_report_bench_{time.perf_counter_ns()}.txt"))
+    with open(report_file, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def main():
+    reports = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    scraper = TwitterScraper()
+    tweets_data = {
+        'data': build_tweets(TWEETS_PER_REPORT),
+        'user_profile': {'username': 'bench', 'description': 'Founder and CEO',
+                         'public_metrics': {'followers_count': 5000}}
+    }
+
+    # Alternate the two flows and keep each one's best pass, so warm-up and
+    # page-cache effects don't favour either. builder.write() logs every saved file.
+    disk_time = memory_time = float('inf')
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(PASSES):
+            start = time.perf_counter()
+            for _ in range(reports):
+                expected = file_round_trip(scraper, tweets_data, tmp)
+            disk_time = min(disk_time, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for _ in range(reports):
+                result = scraper.generate_report(tweets_data, 'bench', KEYWORDS)
+            memory_time = min(memory_time, time.perf_counter() - start)
+        files_left = len(os.listdir(tmp))
+    assert strip_generated(result) == strip_generated(expected), "reports differ"
+
+    print(f"{reports:,} reports x {TWEETS_PER_REPORT} tweets")
+    print(f"  write file + read back: {disk_time / reports * 1000:7.2f} ms/report  ({files_left:,} files left behind)")
+    print(f"  render in memory:       {memory_time / reports * 1000:7.2f} ms/report  ({disk_time / memory_time:.2f}x faster, 0 files)")
+
+
+if __name__ == "__main__":
+    main()
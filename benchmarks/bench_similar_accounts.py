@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: local similar-account search
+
+Builds an AccountVectorIndex over synthetic stored accounts (each account
+writes about one of a set of topics, plus filler words everyone uses), then
+reports:
+
+    build      time to turn raw term counts into vectors + postings
+    update     first query after 1% more accounts arrive (only their rows are re-weighed)
+    query      per-lookup latency of cosine top-k for indexed accounts
+    precision  share of the top 10 that write about the reference's topic
+    api calls  upstream requests made by find_similar_accounts (should be 0)
+
+The live path it replaces costs at least 3 API calls per lookup (profile,
+timeline, one discovery search).
+
+Usage:
+    python benchmarks/bench_similar_accounts.py [accounts] [tweets_per_account]
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('TWITTER_BEARER_TOKEN', 'benchmark-token')
+
+from account_index import AccountVectorIndex
+from twitter_scraper import TwitterScraper
+
+TOPICS = 40
+TOPIC_WORDS = 30
+FILLER = ['today', 'really', 'great', 'thanks', 'people', 'thing', 'week', 'team', 'love', 'check']
+
+
+def build_accounts(account_count, tweets_per_account, seed=11):
+    """Synthetic profiles and tweets; returns (profiles, tweets, topic by username)"""
+    rng = random.Random(seed)
+    # Letters only, so the tokenizer keeps them
+    vocab = [[''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(8)) for _ in range(TOPIC_WORDS)]
+             for _ in range(TOPICS)]
+    profiles, tweets, topics = [], [], {}
+    sequence = 0
+    for i in range(account_count):
+        topic = rng.randrange(TOPICS)
+        username = f"account{i:05d}"
+        topics[username] = topic
+        profiles.append({
+            'id': str(20_000_000 + i),
+            'username': username,
+            'name': f"Account {i}",
+            'description': ' '.join(rng.sample(vocab[topic], 4) + rng.sample(FILLER, 2)),
+            'verified': rng.random() < 0.1,
+            'public_metrics': {
+                'followers_count': int(rng.paretovariate(1.2) * 200),
+                'following_count': rng.randint(10, 2000),
+                'tweet_count': rng.randint(100, 5000)
+            }
+        })
+        for _ in range(tweets_per_account):
+            sequence += 1
+            words = rng.sample(vocab[topic], 3) + rng.sample(FILLER, 3) + [rng.choice(rng.choice(vocab))]
+            tweets.append({'id': str(10 ** 18 + sequence), 'username': username, 'text': ' '.join(words)})
+    return profiles, tweets, topics
+
+
+def main():
+    account_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    tweets_per_account = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    late_count = max(1, account_count // 100)
+    profiles, tweets, topics = build_accounts(account_count + late_count, tweets_per_account)
+    late_profiles, profiles = profiles[account_count:], profiles[:account_count]
+    late_tweets, tweets = tweets[account_count * tweets_per_account:], tweets[:account_count * tweets_per_account]
+    index = AccountVectorIndex(persist=False)
+    start = time.perf_counter()
+    for profile in profiles:
+        index.add_account(profile)
+    index.add_tweets(tweets)
+    loaded = time.perf_counter()
+    index.similar(profiles[0]['username'])  # first query rebuilds vectors and postings
+    built = time.perf_counter()
+
+    rng = random.Random(5)
+    references = rng.sample(profiles, 200)
+    latencies = []
+    precisions = []
+    for reference in references:
+        query_start = time.perf_counter()
+        matches = index.similar(reference['username'], limit=10)
+        latencies.append((time.perf_counter() - query_start) * 1000)
+        hits = sum(1 for profile, _, _ in matches if topics[profile['username']] == topics[reference['username']])
+        precisions.append(hits / 10)
+
+    for profile in late_profiles:
+        index.add_account(profile)
+    index.add_tweets(late_tweets)
+    update_start = time.perf_counter()
+    index.similar(late_profiles[0]['username'])
+    update_time = time.perf_counter() - update_start
+
+    # Nothing listens on port 9: any upstream request would fail loudly
+    scraper = TwitterScraper(account_index=index, base_url='http://127.0.0.1:9', max_retries=0)
+    result = scraper.find_similar_accounts(references[0]['username'], max_results=20)
+    api_calls = scraper.single_flight.stats()['executed']
+
+    latencies.sort()
+    print(f"{account_count:,} accounts x {tweets_per_account} tweets ({len(tweets):,} tweets), "
+          f"{index.stats()['vectors']:,} vectors")
+    print(f"  load counts:    {(loaded - start) * 1000:9.1f} ms")
+    print(f"  build index:    {(built - loaded) * 1000:9.1f} ms")
+    print(f"  {f'update (+{late_count}):':<16}{update_time * 1000:9.1f} ms")
+    print(f"  query p50:      {statistics.median(latencies):9.2f} ms")
+    print(f"  query p95:      {latencies[int(len(latencies) * 0.95)]:9.2f} ms")
+    print(f"  precision@10:   {statistics.mean(precisions):9.2f}")
+    print(f"  find_similar_accounts -> {result['total_accounts']} accounts, source={result['source']}, "
+          f"api calls={api_calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-word substring scans vs. the compiled multi-pattern matcher
+
+Runs the text-scanning hot spots over 100k synthetic tweets (mock X API
+fixtures), first with the original loops (one `word in text.lower()` scan per
+lexicon entry or keyword), then with text_matcher, and checks both give the
+same results:
+
+    sentiment   TwitterScraper.perform_sentiment_analysis (34 lexicon words)
+    report      the report builder's per-tweet sentiment + keyword counts
+                (now one scan for lexicons and keywords together)
+    filter      TwitterScraper.filter_by_keywords
+    reddit      RedditScraper.perform_sentiment_analysis (25 lexicon words)
+
+Usage:
+    python benchmarks/bench_text_matcher.py [tweets]
+
+Without pyahocorasick installed the matcher falls back to per-word scans and
+only saves the repeated lowercasing.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('TWITTER_BEARER_TOKEN', 'benchmark-token')
+
+from lexicon import SENTIMENT_WORDS
+from twitter_scraper import TwitterScraper
+from reddit_scraper import RedditScraper
+from text_matcher import BACKEND, compile_matcher
+from benchmarks.mock_x_api import build_synthetic_fixtures
+
+KEYWORDS = ['launch', 'pricing', 'Roadmap', 'customer success', 'api']
+
+
+def legacy_twitter_sentiment(text):
+    """The original TwitterScraper.perform_sentiment_analysis, kept verbatim for comparison"""
+    positive_words = ['great', 'excellent', 'amazing', 'love', 'best', 'awesome',
+                     'fantastic', 'wonderful', 'excited', 'happy', 'success', 'win']
+    negative_words = ['bad', 'terrible', 'worst', 'hate', 'awful', 'disappointed',
+                     'fail', 'problem', 'issue', 'broken', 'poor', 'sad']
+    opportunity_words = ['looking for', 'need', 'seeking', 'hiring', 'opportunity',
+                       'help', 'recommend', 'suggestion', 'advice', 'question']
+    text_lower = text.lower()
+    positive_count = sum(1 for word in positive_words if word in text_lower)
+    negative_count = sum(1 for word in negative_words if word in text_lower)
+    opportunity_count = sum(1 for word in opportunity_words if word in text_lower)
+    if positive_count > negative_count:
+        sentiment = 'Positive'
+    elif negative_count > positive_count:
+        sentiment = 'Negative'
+    else:
+        sentiment = 'Neutral'
+    return {
+        'sentiment': sentiment,
+        'positive_score': positive_count,
+        'negative_score': negative_count,
+        'opportunity_signals': opportunity_count,
+        'is_opportunity': opportunity_count > 0
+    }
+
+
+def legacy_reddit_sentiment(text):
+    """The original RedditScraper.perform_sentiment_analysis, kept verbatim for comparison"""
+    if not text:
+        return {'sentiment': 'Neutral', 'signals': []}
+    text_lower = text.lower()
+    positive_words = ['great', 'excellent', 'amazing', 'love', 'best', 'awesome', 'fantastic', 'perfect']
+    negative_words = ['bad', 'terrible', 'worst', 'hate', 'awful', 'poor', 'disappointing', 'issue', 'problem']
+    opportunity_words = ['looking for', 'need', 'want', 'seeking', 'recommend', 'suggestion', 'help', 'advice']
+    positive_count = sum(1 for word in positive_words if word in text_lower)
+    negative_count = sum(1 for word in negative_words if word in text_lower)
+    signals = [word for word in opportunity_words if word in text_lower]
+    if positive_count > negative_count:
+        sentiment = 'Positive'
+    elif negative_count > positive_count:
+        sentiment = 'Negative'
+    else:
+        sentiment = 'Neutral'
+    return {'sentiment': sentiment, 'signals': signals}
+
+
+def legacy_filter(tweets, keywords):
+    filtered = []
+    for tweet in tweets:
+        text_lower = tweet['text'].lower()
+        for keyword in keywords:
+            if keyword.lower() in text_lower:
+                filtered.append(tweet)
+                break
+    return filtered
+
+
+def legacy_report_scan(tweets, keywords):
+    """The report builder's original sentiment call plus keyword count loop"""
+    sentiments = []
+    counts = {keyword: 0 for keyword in keywords}
+    for tweet in tweets:
+        sentiments.append(legacy_twitter_sentiment(tweet['text']))
+        text_lower = tweet['text'].lower()
+        for keyword in keywords:
+            if keyword.lower() in text_lower:
+                counts[keyword] += 1
+    return sentiments, counts
+
+
+def matcher_report_scan(scraper, tweets, keywords):
+    """The report builder's current path: one scan for lexicons and keywords"""
+    matcher = compile_matcher(SENTIMENT_WORDS + tuple(keywords))
+    keys = [(keyword, keyword.lower()) for keyword in keywords]
+    sentiments = []
+    counts = {keyword: 0 for keyword in keywords}
+    for tweet in tweets:
+        hits = matcher.find(tweet['text'])
+        sentiments.append(scraper.perform_sentiment_analysis(tweet['text'], hits))
+        if hits:
+            for keyword, key in keys:
+                if key in hits:
+                    counts[keyword] += 1
+    return sentiments, counts
+
+
+def build_tweets(count):
+    """Synthetic tweets with sentiment words sprinkled in"""
+    per_user = 1000
+    fixtures = build_synthetic_fixtures(users=max(1, count // per_user), tweets_per_user=per_user, seed=9)
+    tweets = fixtures['tweets'][:count]
+    extras = ['Great launch!', 'this is broken, need help', 'Looking for pricing advice',
+              'sadvice about the roadmap', 'worst API ever', '']
+    for i, tweet in enumerate(tweets):
+        tweet['text'] += ' ' + extras[i % len(extras)]
+    return tweets
+
+
+def timed(func, repeats=3):
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    tweets = build_tweets(count)
+    texts = [tweet['text'] for tweet in tweets]
+    scraper = TwitterScraper()
+
+    cases = [
+        ('sentiment',
+         lambda: [legacy_twitter_sentiment(text) for text in texts],
+         lambda: [scraper.perform_sentiment_analysis(text) for text in texts]),
+        ('report',
+         lambda: legacy_report_scan(tweets, KEYWORDS),
+         lambda: matcher_report_scan(scraper, tweets, KEYWORDS)),
+        ('filter',
+         lambda: legacy_filter(tweets, KEYWORDS),
+         lambda: scraper.filter_by_keywords({'data': tweets}, KEYWORDS)),
+        ('reddit',
+         lambda: [legacy_reddit_sentiment(text) for text in texts],
+         lambda: [RedditScraper.perform_sentiment_analysis(None, text) for text in texts]),
+    ]
+
+    print(f"{len(tweets):,} tweets, {len(KEYWORDS)} keywords, backend: {BACKEND}")
+    print(f"{'step':<12}{'per-word ms':>14}{'matcher ms':>14}{'speedup':>10}")
+    total_legacy = total_matcher = 0
+    for name, legacy, current in cases:
+        legacy_time, expected = timed(legacy)
+        matcher_time, result = timed(current)
+        assert result == expected, f"{name}: results differ"
+        total_legacy += legacy_time
+        total_matcher += matcher_time
+        print(f"{name:<12}{legacy_time * 1000:>14.1f}{matcher_time * 1000:>14.1f}{legacy_time / matcher_time:>9.1f}x")
+    print(f"{'total':<12}{total_legacy * 1000:>14.1f}{total_matcher * 1000:>14.1f}{total_legacy / total_matcher:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
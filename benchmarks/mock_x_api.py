@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the X API v2, for offline benchmarks and load tests
+
+Serves the endpoints TwitterScraper uses from synthetic or recorded fixtures:
+
+    GET /2/tweets/search/recent     from:/-from:/OR queries, quoted keywords, a
+                                    few operators, since_id, until_id,
+                                    max_results, next_token
+    GET /2/users/by/username/:name  single profile lookup
+    GET /2/users/by                 multi-user lookup (?usernames=a,b,c)
+    GET /2/users/:id/tweets         user timeline, since_id, pagination_token
+
+Every response carries x-rate-limit-limit / -remaining / -reset headers from a
+per-endpoint window, and requests over the limit get a 429 just like the real
+API. Latency, random 429s and the query-length limit are configurable.
+
+Fixtures are either synthetic (seeded, so runs are repeatable) or recorded: a
+JSON/JSONL file of saved search responses (e.g. Report.tweets_data or the
+reports/twitter_raw_<username>_<timestamp>.jsonl pages written by
+run_scraper.py), or a {"users": [...], "tweets": [...]} document.
+
+Usage:
+    python benchmarks/mock_x_api.py --port 8099 --latency-ms 80 --rate-limit 450
+    TWITTER_API_BASE_URL=http://127.0.0.1:8099/2 python run_scraper.py user0001
+
+In-process (benchmarks):
+    with MockXAPI(latency_ms=50) as api:
+        scraper = TwitterScraper(base_url=api.base_url)
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rate_limiter import endpoint_key
+
+TWITTER_EPOCH_MS = 1288834974657
+
+WORDS = [
+    'startup', 'growth', 'marketing', 'saas', 'product', 'launch', 'team', 'hiring',
+    'funding', 'customers', 'pricing', 'feedback', 'roadmap', 'design', 'api', 'data',
+    'sales', 'pipeline', 'analytics', 'automation', 'ai', 'cloud', 'security', 'update'
+]
+PHRASES = [
+    'looking for a tool that', 'anyone recommend', 'need help with', 'just shipped',
+    'great results from', 'frustrated with', 'thinking about switching to', 'loving the new'
+]
+
+
+def snowflake_id(created_at, sequence):
+    """Build a tweet ID whose timestamp bits match created_at (like real IDs)"""
+    ms = int(created_at.timestamp() * 1000) - TWITTER_EPOCH_MS
+    return str((ms << 22) | (sequence & 0x3FFFFF))
+
+
+def build_synthetic_fixtures(users=100, tweets_per_user=150, seed=42):
+    """
+    Generate repeatable users and tweets spread over the last 6 days
+
+    Returns:
+        Dict with 'users' and 'tweets' lists in API object shape
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    user_objects = []
+    tweets = []
+    sequence = 0
+
+    for i in range(users):
+        user_id = str(10_000_000 + i)
+        username = f"user{i:04d}"
+        followers = int(rng.paretovariate(1.2) * 200)
+        user_objects.append({
+            'id': user_id,
+            'username': username,
+            'name': f"User {i}",
+            'description': f"{rng.choice(WORDS).title()} and {rng.choice(WORDS)} at a {rng.choice(WORDS)} company",
+            'location': rng.choice(['San Francisco, CA', 'London', 'Berlin', 'New York', '']),
+            'url': f"https://example.com/{username}" if rng.random() < 0.6 else '',
+            'verified': rng.random() < 0.1,
+            'created_at': (now - timedelta(days=rng.randint(200, 4000))).strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+            'public_metrics': {
+                'followers_count': followers,
+                'following_count': rng.randint(10, 2000),
+                'tweet_count': rng.randint(tweets_per_user, tweets_per_user * 20),
+                'listed_count': rng.randint(0, 50)
+            }
+        })
+
+        for _ in range(tweets_per_user):
+            created_at = now - timedelta(seconds=rng.randint(60, 6 * 24 * 3600))
+            sequence += 1
+            words = rng.sample(WORDS, 6)
+            text = f"{rng.choice(PHRASES)} {' '.join(words)}"
+            entities = {}
+            if rng.random() < 0.3:
+                url = f"https://example.com/{rng.choice(WORDS)}/{sequence}"
+                text += f" {url}"
+                entities['urls'] = [{'url': url, 'expanded_url': url}]
+            if rng.random() < 0.25:
+                mentioned = f"user{rng.randrange(users):04d}"
+                text = f"@{mentioned} {text}"
+                entities['mentions'] = [{'username': mentioned}]
+            if rng.random() < 0.2:
+                tag = rng.choice(WORDS)
+                text += f" #{tag}"
+                entities['hashtags'] = [{'tag': tag}]
+
+            tweet = {
+                'id': snowflake_id(created_at, sequence),
+                'author_id': user_id,
+                'text': text,
+                'created_at': created_at.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+                'public_metrics': {
+                    'like_count': int(rng.paretovariate(1.5)) - 1,
+                    'retweet_count': int(rng.paretovariate(2.0)) - 1,
+                    'reply_count': int(rng.paretovariate(2.5)) - 1,
+                    'quote_count': 0
+                }
+            }
+            if entities:
+                tweet['entities'] = entities
+            tweets.append(tweet)
+
+    return {'users': user_objects, 'tweets': tweets}
+
+
+def load_fixtures(path):
+    """
+    Load recorded fixtures
+
+    Accepts a {"users": [...], "tweets": [...]} document, a saved search
+    response (with 'data' and 'user_profile'), a JSON list of those, or a JSONL
+    file with one response per line.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            documents = [json.loads(line) for line in f if line.strip()]
+        else:
+            loaded = json.load(f)
+            documents = loaded if isinstance(loaded, list) else [loaded]
+
+    users = {}
+    tweets = {}
+    for document in documents:
+        for user in document.get('users', []):
+            users[user['id']] = user
+        profile = document.get('user_profile')
+        if profile:
+            users[profile['id']] = profile
+        for user in document.get('includes', {}).get('users', []):
+            users.setdefault(user['id'], user)
+        for tweet in document.get('tweets', []) + document.get('data', []):
+            tweet = dict(tweet)
+            if 'author_id' not in tweet and profile:
+                tweet['author_id'] = profile['id']
+            tweets[tweet['id']] = tweet
+
+    return {'users': list(users.values()), 'tweets': list(tweets.values())}
+
+
+class FixtureStore:
+    """Indexes fixtures for the request handlers"""
+
+    def __init__(self, fixtures):
+        self.users_by_id = {user['id']: user for user in fixtures['users']}
+        self.users_by_name = {user['username'].lower(): user for user in fixtures['users']}
+        # Newest first, like the API
+        self.tweets = sorted(fixtures['tweets'], key=lambda tweet: int(tweet['id']), reverse=True)
+        self.tweets_by_author = {}
+        for tweet in self.tweets:
+            self.tweets_by_author.setdefault(tweet.get('author_id'), []).append(tweet)
+
+
+class _Window:
+    __slots__ = ('remaining', 'reset_at')
+
+    def __init__(self, limit, window):
+        self.remaining = limit
+        self.reset_at = time.time() + window
+
+
+class MockXAPI:
+    """
+    In-process mock X API server
+
+    Args:
+        fixtures: Fixture dict (synthetic fixtures are generated if omitted)
+        host, port: Bind address (port 0 picks a free port)
+        latency_ms: Fixed delay added to every response
+        jitter_ms: Extra random delay of up to this many milliseconds
+        error_rate: Fraction of requests answered with an injected 429
+        rate_limit: Requests allowed per endpoint per window (None for unlimited)
+        window: Rate-limit window length in seconds
+        max_query_length: Longest search query accepted
+        seed: Seed for latency jitter and 429 injection
+    """
+
+    def __init__(self, fixtures=None, host='127.0.0.1', port=0, latency_ms=0.0, jitter_ms=0.0,
+                 error_rate=0.0, rate_limit=450, window=900, max_query_length=512, seed=None):
+        self.store = FixtureStore(fixtures or build_synthetic_fixtures())
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.window = window
+        self.max_query_length = max_query_length
+        self._random = random.Random(seed)
+        self._windows = {}
+        self._lock = threading.Lock()
+        self.request_counts = {}
+        self.throttled = 0
+
+        handler = type('MockXAPIHandler', (_Handler,), {'api': self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/2"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def admit(self, key):
+        """
+        Count a request against its endpoint's window
+
+        Returns:
+            (allowed, headers) - allowed is False when the request gets a 429
+        """
+        with self._lock:
+            self.request_counts[key] = self.request_counts.get(key, 0) + 1
+            injected = self.error_rate and self._random.random() < self.error_rate
+            delay = self.latency_ms + (self._random.random() * self.jitter_ms if self.jitter_ms else 0)
+
+            if self.rate_limit is None:
+                allowed = not injected
+                headers = {}
+            else:
+                now = time.time()
+                window = self._windows.get(key)
+                if window is None or now >= window.reset_at:
+                    window = self._windows[key] = _Window(self.rate_limit, self.window)
+                allowed = window.remaining > 0 and not injected
+                if allowed:
+                    window.remaining -= 1
+                headers = {
+                    'x-rate-limit-limit': str(self.rate_limit),
+                    'x-rate-limit-remaining': str(window.remaining),
+                    'x-rate-limit-reset': str(int(window.reset_at))
+                }
+            if not allowed:
+                self.throttled += 1
+
+        if delay:
+            time.sleep(delay / 1000)
+        return allowed, headers
+
+    def stats(self):
+        with self._lock:
+            return {'requests': dict(self.request_counts), 'throttled': self.throttled}
+
+
+def _paginate(items, params, token_param, default_max, min_max):
+    """Slice a newest-first list into one page; returns (page, meta) or raises ValueError"""
+    max_results = int(params.get('max_results', default_max))
+    if not min_max <= max_results <= 100:
+        raise ValueError(f"The `max_results` query parameter value [{max_results}] is not between {min_max} and 100")
+
+    since_id = params.get('since_id')
+    if since_id:
+        items = [item for item in items if int(item['id']) > int(since_id)]
+    until_id = params.get('until_id')
+    if until_id:
+        items = [item for item in items if int(item['id']) < int(until_id)]
+
+    start = int(params.get(token_param, '0') or 0)
+    page = items[start:start + max_results]
+    meta = {'result_count': len(page)}
+    if page:
+        meta['newest_id'] = page[0]['id']
+        meta['oldest_id'] = page[-1]['id']
+    if start + max_results < len(items):
+        meta['next_token'] = str(start + max_results)
+    return page, meta
+
+
+_FROM = re.compile(r'(?<![-\w])from:(\w+)', re.IGNORECASE)
+_NOT_FROM = re.compile(r'-from:(\w+)', re.IGNORECASE)
+_QUOTED = re.compile(r'"([^"]+)"')
+_MIN_METRIC = re.compile(r'min_(faves|retweets|replies):(\d+)')
+_METRIC_FIELDS = {'faves': 'like_count', 'retweets': 'retweet_count', 'replies': 'reply_count'}
+
+
+def _search_filter(query, users_by_name):
+    """Compile the subset of search syntax TwitterScraper generates into a predicate"""
+    keywords = [keyword.lower() for keyword in _QUOTED.findall(query)]
+    excluded = {users_by_name[name.lower()]['id'] for name in _NOT_FROM.findall(query) if name.lower() in users_by_name}
+    minimums = [(_METRIC_FIELDS[name], int(value)) for name, value in _MIN_METRIC.findall(query)]
+    has_links = 'has:links' in query
+    no_retweets = '-is:retweet' in query
+
+    def matches(tweet):
+        if tweet.get('author_id') in excluded:
+            return False
+        if keywords:
+            text = tweet['text'].lower()
+            if not any(keyword in text for keyword in keywords):
+                return False
+        if has_links and not tweet.get('entities', {}).get('urls'):
+            return False
+        if no_retweets and any(ref.get('type') == 'retweeted' for ref in tweet.get('referenced_tweets', [])):
+            return False
+        metrics = tweet.get('public_metrics', {})
+        return all(metrics.get(field, 0) >= minimum for field, minimum in minimums)
+
+    return matches
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+    disable_nagle_algorithm = True
+    api = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split('/') if part]
+        key = endpoint_key(url.path)
+
+        allowed, headers = self.api.admit(key)
+        if not allowed:
+            self._send(429, {'title': 'Too Many Requests', 'detail': 'Too Many Requests', 'status': 429}, headers)
+            return
+
+        try:
+            if parts[:4] == ['2', 'tweets', 'search', 'recent']:
+                status, body = self._search(params)
+            elif parts[:4] == ['2', 'users', 'by', 'username'] and len(parts) == 5:
+                status, body = self._user_by_username(parts[4])
+            elif parts == ['2', 'users', 'by']:
+                status, body = self._users_by(params)
+            elif len(parts) == 4 and parts[:2] == ['2', 'users'] and parts[3] == 'tweets':
+                status, body = self._user_tweets(parts[2], params)
+            else:
+                status, body = 404, {'title': 'Not Found Error', 'detail': f"No route for {url.path}"}
+        except ValueError as e:
+            status, body = 400, {'title': 'Invalid Request', 'detail': str(e)}
+
+        self._send(status, body, headers)
+
+    def _search(self, params):
+        store = self.api.store
+        query = params.get('query', '')
+        if not query:
+            raise ValueError("The `query` query parameter can not be empty")
+        if len(query) > self.api.max_query_length:
+            raise ValueError(f"The `query` query parameter value is too long (max {self.api.max_query_length})")
+
+        authors = [store.users_by_name.get(name.lower()) for name in _FROM.findall(query)]
+        author_ids = {user['id'] for user in authors if user}
+        matches = _search_filter(query, store.users_by_name)
+        if author_ids:
+            candidates = [tweet for tweet in store.tweets if tweet.get('author_id') in author_ids]
+        else:
+            candidates = store.tweets
+        results = [tweet for tweet in candidates if matches(tweet)]
+
+        page, meta = _paginate(results, params, 'next_token', 10, 10)
+        return 200, self._tweets_body(page, meta)
+
+    def _user_by_username(self, username):
+        user = self.api.store.users_by_name.get(username.lower())
+        if user is None:
+            return 200, {'errors': [self._not_found(username)]}
+        return 200, {'data': user}
+
+    def _users_by(self, params):
+        found = []
+        errors = []
+        for username in params.get('usernames', '').split(','):
+            user = self.api.store.users_by_name.get(username.lower())
+            if user:
+                found.append(user)
+            elif username:
+                errors.append(self._not_found(username))
+        body = {'data': found} if found else {}
+        if errors:
+            body['errors'] = errors
+        return 200, body
+
+    def _user_tweets(self, user_id, params):
+        store = self.api.store
+        if user_id not in store.users_by_id:
+            return 404, {'title': 'Not Found Error', 'detail': f"Could not find user with id: [{user_id}]."}
+        page, meta = _paginate(store.tweets_by_author.get(user_id, []), params, 'pagination_token', 10, 5)
+        return 200, self._tweets_body(page, meta)
+
+    def _tweets_body(self, page, meta):
+        body = {'meta': meta}
+        if page:
+            body['data'] = page
+            author_ids = dict.fromkeys(tweet.get('author_id') for tweet in page)
+            users = [self.api.store.users_by_id[a] for a in author_ids if a in self.api.store.users_by_id]
+            if users:
+                body['includes'] = {'users': users}
+        return body
+
+    @staticmethod
+    def _not_found(username):
+        return {
+            'value': username,
+            'detail': f"Could not find user with username: [{username}].",
+            'title': 'Not Found Error',
+            'resource_type': 'user'
+        }
+
+    def _send(self, status, body, headers):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a mock X API v2 for offline benchmarks")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--fixtures', help="Recorded fixture file (.json or .jsonl); synthetic if omitted")
+    parser.add_argument('--users', type=int, default=100, help="Synthetic accounts to generate")
+    parser.add_argument('--tweets-per-user', type=int, default=150, help="Synthetic tweets per account")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Fixed delay per response")
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help="Random extra delay per response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests given an injected 429")
+    parser.add_argument('--rate-limit', type=int, default=450, help="Requests per endpoint per window (0 for unlimited)")
+    parser.add_argument('--window', type=float, default=900, help="Rate-limit window in seconds")
+    parser.add_argument('--max-query-length', type=int, default=512)
+    parser.add_argument('--dump-fixtures', help="Write the fixtures in use to this JSON file and exit")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        fixtures = load_fixtures(args.fixtures)
+    else:
+        fixtures = build_synthetic_fixtures(args.users, args.tweets_per_user, args.seed)
+
+    if args.dump_fixtures:
+        with open(args.dump_fixtures, 'w', encoding='utf-8') as f:
+            json.dump(fixtures, f)
+        print(f"Wrote {len(fixtures['users'])} users and {len(fixtures['tweets'])} tweets to {args.dump_fixtures}")
+        return
+
+    api = MockXAPI(
+        fixtures,
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit or None,
+        window=args.window,
+        max_query_length=args.max_query_length,
+        seed=args.seed
+    )
+    print(f"Mock X API serving {len(fixtures['users'])} users / {len(fixtures['tweets'])} tweets at {api.base_url}")
+    print(f"Point the scraper at it with TWITTER_API_BASE_URL={api.base_url}")
+    try:
+        api.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import os
+import time
+import threading
+
+# Consecutive transient failures (5xx / connection errors) that open an endpoint's circuit
+DEFAULT_FAILURE_THRESHOLD = int(os.getenv('TWITTER_BREAKER_THRESHOLD', '5'))
+# Seconds an open circuit fails fast before letting a trial request through
+DEFAULT_RECOVERY_TIMEOUT = float(os.getenv('TWITTER_BREAKER_COOLDOWN', '30'))
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while an endpoint's circuit is open"""
+
+    def __init__(self, key, retry_after):
+        self.key = key
+        self.retry_after = retry_after
+        super().__init__(f"X API endpoint {key} is unavailable (circuit open), retry in {retry_after:.0f}s")
+
+
+class _Circuit:
+    __slots__ = ('state', 'failures', 'opened_at', 'trial_started', 'times_opened')
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0  # Consecutive failures
+        self.opened_at = 0.0
+        self.trial_started = None  # Set while a half-open trial request is in flight
+        self.times_opened = 0
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker for the X API
+
+    After `failure_threshold` consecutive transient failures an endpoint's
+    circuit opens and requests to it fail immediately with CircuitOpenError
+    instead of waiting out timeouts. Once `recovery_timeout` has passed a
+    single trial request is let through: success closes the circuit, failure
+    opens it again.
+    """
+
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD, recovery_timeout=DEFAULT_RECOVERY_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._circuits = {}
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def _circuit(self, key):
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit()
+        return circuit
+
+    def before_request(self, key):
+        """Check an endpoint may be called, raising CircuitOpenError if not"""
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state == CLOSED:
+                return
+
+            now = time.time()
+            if circuit.state == OPEN:
+                retry_after = circuit.opened_at + self.recovery_timeout - now
+                if retry_after > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(key, retry_after)
+                circuit.state = HALF_OPEN
+                circuit.trial_started = None
+
+            # Half-open: one trial at a time (a stuck trial is given up on after a timeout)
+            if circuit.trial_started is not None and now - circuit.trial_started < self.recovery_timeout:
+                self.rejected += 1
+                raise CircuitOpenError(key, circuit.trial_started + self.recovery_timeout - now)
+            circuit.trial_started = now
+
+    def record_success(self, key):
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state != CLOSED:
+                print(f"[CIRCUIT] {key}: recovered, circuit closed")
+            circuit.state = CLOSED
+            circuit.failures = 0
+            circuit.trial_started = None
+
+    def record_failure(self, key):
+        with self._lock:
+            circuit = self._circuit(key)
+            circuit.failures += 1
+            circuit.trial_started = None
+            if circuit.state == HALF_OPEN or (circuit.state == CLOSED and circuit.failures >= self.failure_threshold):
+                circuit.state = OPEN
+                circuit.opened_at = time.time()
+                circuit.times_opened += 1
+                print(f"[CIRCUIT] {key}: {circuit.failures} consecutive failures, "
+                      f"failing fast for {self.recovery_timeout:.0f}s")
+
+    def stats(self):
+        """Snapshot of circuit state for monitoring"""
+        with self._lock:
+            return {
+                'rejected': self.rejected,
+                'endpoints': {
+                    key: {
+                        'state': circuit.state,
+                        'consecutive_failures': circuit.failures,
+                        'times_opened': circuit.times_opened
+                    }
+                    for key, circuit in self._circuits.items()
+                }
+            }
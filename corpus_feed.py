@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+
+# Minimum seconds between checks of the database for newly stored tweets
+# (KEYWORD_IDF_REFRESH and ACCOUNT_INDEX_REFRESH are still honoured as older names)
+DEFAULT_REFRESH_INTERVAL = float(os.getenv('CORPUS_REFRESH') or os.getenv('KEYWORD_IDF_REFRESH')
+                                 or os.getenv('ACCOUNT_INDEX_REFRESH') or '60')
+
+# Tweet IDs remembered per account to drop repeats; once full, the first IDs
+# seen are forgotten
+DEFAULT_SEEN_PER_ACCOUNT = int(os.getenv('CORPUS_SEEN_PER_ACCOUNT', '5000'))
+
+
+class CorpusFeed:
+    """
+    One incremental reader of the stored tweet corpus, shared by its consumers
+
+    CorpusIDF and AccountVectorIndex both fold every stored tweet
+    (historical_tweets plus the tweets inside deep_history records) into
+    their tables. The feed reads the database once per refresh for all of
+    them and hands each batch to every subscriber, so a process scans the
+    corpus once rather than once per consumer.
+
+    The last row read from each table is kept as a row-ID cursor, so a
+    refresh only reads rows stored since the previous one. Repeats (the same
+    tweet in several deep_history records, in historical_tweets, or added
+    in-process) are dropped by tweet ID against a set kept per author.
+    Keyword-filtered scrapes return interleaved ID ranges, so no ordering
+    between tweets is assumed. Each author's set holds at most
+    seen_per_account IDs, so memory stays bounded however large the corpus
+    grows.
+    """
+
+    def __init__(self, persist=True, refresh_interval=DEFAULT_REFRESH_INTERVAL,
+                 seen_per_account=DEFAULT_SEEN_PER_ACCOUNT):
+        """
+        Args:
+            persist: Read stored tweets from the database (False: only tweets added in-process)
+            refresh_interval: Minimum seconds between database reads
+            seen_per_account: Tweet IDs remembered per author for dropping repeats
+        """
+        self.persist = persist
+        self.refresh_interval = refresh_interval
+        self.seen_per_account = seen_per_account
+        self.tweet_count = 0
+        self._subscribers = []
+        self._seen = {}
+        self._last_historical_id = 0
+        self._last_deep_history_id = 0
+        self._last_refresh = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def subscribe(self, callback):
+        """
+        Receive every new batch (subscribe before the first refresh; earlier
+        batches are not replayed)
+
+        Args:
+            callback: Called as callback(tweets, accounts) with the batch's new
+                tweets (each with a 'username') and a dict of username -> profile
+        """
+        self._subscribers.append(callback)
+
+    def _new_tweets(self, tweets, username=None):
+        """Tweets whose IDs have not been seen for their author, remembering them"""
+        fresh = []
+        with self._lock:
+            for tweet in tweets:
+                author = username or tweet.get('username')
+                try:
+                    tweet_id = int(tweet['id'])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if not author:
+                    continue
+                # A dict keeps insertion order, so the first ID seen is the one evicted
+                seen = self._seen.setdefault(author.lower(), {})
+                if tweet_id in seen:
+                    continue
+                seen[tweet_id] = None
+                if len(seen) > self.seen_per_account:
+                    del seen[next(iter(seen))]
+                if username:
+                    tweet = dict(tweet, username=username)
+                fresh.append(tweet)
+            self.tweet_count += len(fresh)
+        return fresh
+
+    def _publish(self, tweets, accounts):
+        if not tweets and not accounts:
+            return
+        for callback in self._subscribers:
+            callback(tweets, accounts)
+
+    def add(self, tweets=(), accounts=None, username=None):
+        """
+        Publish tweets and profiles fetched in-process (repeats of counted tweets are skipped)
+
+        Args:
+            tweets: Tweet dicts with id/text/entities
+            accounts: Dict of username -> profile
+            username: Author of every tweet; otherwise each tweet's 'username' key
+        """
+        self._publish(self._new_tweets(tweets, username), accounts or {})
+
+    def refresh(self, force=False):
+        """Publish tweets stored since the last refresh (at most once per refresh_interval)"""
+        if not self.persist:
+            return
+        now = time.monotonic()
+        if not force and self._last_refresh is not None and now - self._last_refresh < self.refresh_interval:
+            return
+        # Another thread is already catching up; consumers use their tables as they stand
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            from database import iter_corpus_tweets
+            before = self.tweet_count
+            for source, row_id, tweets, accounts in iter_corpus_tweets(self._last_historical_id,
+                                                                       self._last_deep_history_id):
+                self._publish(self._new_tweets(tweets), accounts)
+                if source == 'historical_tweets':
+                    self._last_historical_id = row_id
+                else:
+                    self._last_deep_history_id = row_id
+            self._last_refresh = time.monotonic()
+            if self.tweet_count > before:
+                print(f"[CORPUS] +{self.tweet_count - before} tweets ({self.tweet_count} total, "
+                      f"{len(self._seen)} accounts)")
+        except Exception as e:
+            print(f"[CORPUS] Could not refresh the tweet corpus: {e}")
+        finally:
+            self._refresh_lock.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'tweets': self.tweet_count,
+                'accounts': len(self._seen),
+                'persistent': self.persist
+            }
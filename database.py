@@ -1,9 +1,12 @@
 import os
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, JSON, Float, ARRAY, ForeignKey, Index, func
+import json
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, JSON, Float, ARRAY, ForeignKey, Index, UniqueConstraint, and_, func, inspect, or_, text
 from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from datetime import datetime
+from sqlalchemy.orm import sessionmaker, deferred
+from datetime import datetime, timedelta
+import fast_json
+import analytics
 
 # Get database URL from environment variable (Railway provides this automatically)
 # Try multiple possible environment variable names
@@ -50,7 +53,8 @@ else:
     print("[DATABASE] ⚠️ Please ensure PostgreSQL is properly connected")
 
 try:
-    engine = create_engine(DATABASE_URL)
+    # JSON columns (tweets_data, raw_json, tweet_data) go through the fast JSON backend
+    engine = create_engine(DATABASE_URL, json_serializer=fast_json.dumps, json_deserializer=fast_json.loads)
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     Base = declarative_base()
     print("[DATABASE] ✓ Database engine created successfully")
@@ -99,11 +103,22 @@ class Report(Base):
     tweet_count = Column(Integer)  # or post_count for Reddit
     account_type = Column(String)
     lead_score = Column(Integer)
-    report_content = Column(Text)  # Full text report
-    tweets_data = Column(JSON)  # Raw tweet/post data as JSON
+    # Full text report. Twitter reports store None and are rendered from
+    # analytics + tweets_data on request; Reddit and older reports keep the text.
+    # The large columns are deferred: list views never load them and read
+    # the small summary column instead.
+    report_content = deferred(Column(Text))
+    tweets_data = deferred(Column(JSON))  # Raw tweet/post data as JSON
+    analytics = deferred(Column(JSON))  # ReportAnalytics.to_dict(): summary, top/opportunity tweets, per-tweet rows
+    summary = Column(JSON)  # Copy of analytics['summary'] for list views
     filters = Column(JSON)  # Filters used
+    job_id = Column(String(32))  # scrape_jobs id that saved it; a retried job reuses its reports
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     
+    __table_args__ = (
+        Index('idx_reports_job_username', 'job_id', 'username'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -113,6 +128,7 @@ class Report(Base):
             'tweet_count': self.tweet_count,
             'account_type': self.account_type,
             'lead_score': self.lead_score,
+            'summary': self.summary,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
@@ -140,6 +156,34 @@ class HistoricalTweet(Base):
         }
 
 
+class ScrapeWatermark(Base):
+    """
+    Newest tweet ID already collected per (username, query), kept separately
+    for each schedule. Passed as since_id so scheduled runs only fetch new tweets
+    """
+    __tablename__ = 'scrape_watermarks'
+    
+    id = Column(Integer, primary_key=True, index=True)
+    username = Column(String, nullable=False, index=True)
+    query_key = Column(String, nullable=False)  # Normalized keywords/filters/schedule (see watermark_query_key)
+    since_id = Column(String, nullable=False)   # Newest tweet ID seen
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint('username', 'query_key', name='uq_scrape_watermark_username_query'),
+    )
+
+
+class UserProfile(Base):
+    """Cached X user profiles - lets the profile cache survive restarts"""
+    __tablename__ = 'user_profiles'
+    
+    username = Column(String, primary_key=True)  # Lowercased handle
+    user_id = Column(String, index=True)
+    profile = Column(JSON)  # Full /users/by/username payload
+    fetched_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
 class DeepHistory(Base):
     """
     Deep History table - stores all scraping data in multiple formats
@@ -215,11 +259,159 @@ class DeepHistory(Base):
         }
 
 
+class ScrapeJob(Base):
+    """
+    Durable queue of background scrape jobs (/scrape, /bulk-scrape)
+    
+    Any app process can run any job: workers claim queued rows (see
+    claim_scrape_job), hold a lease they renew with heartbeats while running,
+    and retry failed jobs up to max_attempts. A job whose lease runs out
+    (its worker died) is claimed again by another worker.
+    """
+    __tablename__ = 'scrape_jobs'
+    
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    kind = Column(String, nullable=False)      # Handler name: 'scrape', 'bulk_scrape'
+    params = Column(JSON)                      # Handler keyword arguments
+    status = Column(String, nullable=False, default='queued')  # queued, running, succeeded, failed
+    total = Column(Integer, default=1)         # Accounts the job will process
+    
+    # Progress and outcome
+    results = deferred(Column(JSON))  # Per-account successes, appended as they are saved
+    errors = deferred(Column(JSON))   # Per-account failures
+    result = deferred(Column(JSON))   # Handler return value
+    error = Column(Text)              # Last failure message
+    
+    # Claiming, leases and retries
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    worker_id = Column(String)               # host:pid:thread of the current owner
+    lease_expires_at = Column(DateTime)      # Another worker may claim the job after this
+    heartbeat_at = Column(DateTime)
+    available_at = Column(DateTime, default=datetime.utcnow)  # Not claimed before this (retry backoff)
+    
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    
+    __table_args__ = (
+        Index('idx_scrape_jobs_claim', 'status', 'available_at'),
+    )
+    
+    def to_dict(self, include_results=True):
+        results = (self.results or []) if include_results else None
+        errors = (self.errors or []) if include_results else None
+        job = {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'params': self.params,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'worker_id': self.worker_id,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'heartbeat_at': self.heartbeat_at.isoformat() if self.heartbeat_at else None
+        }
+        if include_results:
+            job['progress'] = {
+                'total': self.total,
+                'completed': len(results) + len(errors),
+                'succeeded': len(results),
+                'failed': len(errors)
+            }
+            job['results'] = results
+            job['errors'] = errors
+            job['result'] = self.result
+        return job
+
+
 # Database helper functions
 
+# Columns added to existing tables after their first release: (table, column, SQL type).
+# create_all() only creates missing tables, so init_db() adds these in place.
+ADDED_COLUMNS = [
+    ('reports', 'analytics', 'JSON'),
+    ('reports', 'job_id', 'VARCHAR(32)'),
+    ('reports', 'summary', 'JSON'),
+]
+
+
+def migrate_added_columns():
+    """
+    Add any ADDED_COLUMNS missing from existing tables (nullable, no backfill),
+    with the model's indexes on them
+
+    Returns:
+        List of "table.column" names that were added
+    """
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    added = []
+    with engine.begin() as conn:
+        for table, column, sql_type in ADDED_COLUMNS:
+            if table not in tables:
+                continue
+            if column in {c['name'] for c in inspector.get_columns(table)}:
+                continue
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {sql_type}"))
+            for index in Base.metadata.tables[table].indexes:
+                if column in index.columns:
+                    index.create(conn, checkfirst=True)
+            added.append(f"{table}.{column}")
+    for name in added:
+        print(f"[DATABASE] Added column {name}")
+    return added
+
+
+def backfill_report_summaries(batch_size=200):
+    """
+    Copy analytics['summary'] into Report.summary for reports saved before
+    the column existed
+
+    Args:
+        batch_size: Reports read (with their analytics) per query
+
+    Returns:
+        Number of reports updated
+    """
+    session = get_db_session()
+    updated = 0
+    last_id = 0
+    try:
+        while True:
+            rows = session.query(Report.id, Report.analytics).filter(
+                Report.id > last_id,
+                Report.summary.is_(None),
+                Report.analytics.isnot(None)
+            ).order_by(Report.id).limit(batch_size).all()
+            if not rows:
+                break
+            for report_id, report_analytics in rows:
+                if report_analytics and report_analytics.get('summary') is not None:
+                    session.query(Report).filter(Report.id == report_id).update(
+                        {Report.summary: report_analytics['summary']}, synchronize_session=False)
+                    updated += 1
+            session.commit()
+            last_id = rows[-1][0]
+        if updated:
+            print(f"[DATABASE] Backfilled the summary of {updated} report(s)")
+        return updated
+    except Exception as e:
+        session.rollback()
+        print(f"[DATABASE] Error backfilling report summaries: {e}")
+        return updated
+    finally:
+        session.close()
+
+
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+    if 'reports.summary' in migrate_added_columns():
+        backfill_report_summaries()
     print("Database initialized successfully")
 
 
@@ -237,6 +429,178 @@ def get_db_session():
     return SessionLocal()
 
 
+def watermark_query_key(keywords=None, filters=None, schedule_id=None):
+    """
+    Normalize keywords and filters into a stable key for ScrapeWatermark
+
+    Args:
+        keywords, filters: The search's keywords and advanced filters
+        schedule_id: Schedule the watermark belongs to, so schedules on the
+            same query (e.g. an hourly and a daily one) each report every
+            new tweet instead of splitting them
+    """
+    key = {'keywords': sorted(k.lower() for k in keywords) if keywords else []}
+    if filters:
+        key['filters'] = filters
+    if schedule_id is not None:
+        key['schedule'] = schedule_id
+    return json.dumps(key, sort_keys=True)
+
+
+def get_since_id(username, keywords=None, filters=None, schedule_id=None):
+    """
+    Get the since_id watermark for a (username, query), per schedule if given
+    
+    A schedule without a watermark of its own starts from the query's shared
+    one (written before watermarks were kept per schedule). Falls back to the
+    newest HistoricalTweet stored for the account the first time a query is seen.
+    
+    Returns:
+        Tweet ID string, or None if nothing has been collected yet
+    """
+    session = get_db_session()
+    try:
+        query_keys = [watermark_query_key(keywords, filters, schedule_id)]
+        if schedule_id is not None:
+            query_keys.append(watermark_query_key(keywords, filters))
+        for query_key in query_keys:
+            watermark = session.query(ScrapeWatermark).filter(
+                ScrapeWatermark.username == username,
+                ScrapeWatermark.query_key == query_key
+            ).first()
+            if watermark:
+                return watermark.since_id
+        
+        # Tweet IDs are stored as strings: order by length first so they sort numerically
+        newest = session.query(HistoricalTweet.tweet_id).filter(
+            HistoricalTweet.username == username
+        ).order_by(func.length(HistoricalTweet.tweet_id).desc(), HistoricalTweet.tweet_id.desc()).first()
+        return newest[0] if newest else None
+    except Exception as e:
+        print(f"[WATERMARK] Error reading watermark for @{username}: {e}")
+        return None
+    finally:
+        session.close()
+
+
+def update_watermark(username, newest_tweet_id, keywords=None, filters=None, schedule_id=None):
+    """Advance the since_id watermark for a (username, query), per schedule if given; never moves backwards"""
+    if not newest_tweet_id:
+        return
+    
+    session = get_db_session()
+    try:
+        query_key = watermark_query_key(keywords, filters, schedule_id)
+        watermark = session.query(ScrapeWatermark).filter(
+            ScrapeWatermark.username == username,
+            ScrapeWatermark.query_key == query_key
+        ).first()
+        
+        if watermark is None:
+            session.add(ScrapeWatermark(username=username, query_key=query_key, since_id=str(newest_tweet_id)))
+        elif int(newest_tweet_id) > int(watermark.since_id):
+            watermark.since_id = str(newest_tweet_id)
+        
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"[WATERMARK] Error updating watermark for @{username}: {e}")
+    finally:
+        session.close()
+
+
+def get_cached_profile(username, max_age_seconds):
+    """
+    Get a stored user profile if it was fetched within max_age_seconds
+    
+    Returns:
+        (profile dict, fetched_at) or None
+    """
+    session = get_db_session()
+    try:
+        row = session.query(UserProfile).filter(
+            UserProfile.username == username.lower(),
+            UserProfile.fetched_at >= datetime.utcnow() - timedelta(seconds=max_age_seconds)
+        ).first()
+        return (row.profile, row.fetched_at) if row else None
+    except Exception as e:
+        print(f"[PROFILE_CACHE] Error reading profile for @{username}: {e}")
+        return None
+    finally:
+        session.close()
+
+
+def save_cached_profiles(profiles):
+    """Upsert user profiles (dict of username -> profile) into user_profiles"""
+    if not profiles:
+        return
+    
+    session = get_db_session()
+    try:
+        now = datetime.utcnow()
+        for username, profile in profiles.items():
+            session.merge(UserProfile(
+                username=username.lower(),
+                user_id=profile.get('id'),
+                profile=profile,
+                fetched_at=now
+            ))
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"[PROFILE_CACHE] Error saving profiles: {e}")
+    finally:
+        session.close()
+
+
+def iter_corpus_tweets(after_historical_id=0, after_deep_history_id=0, batch_size=500):
+    """
+    Stream stored tweets newer than the given row IDs, for corpus statistics
+    
+    Yields:
+        (source, row_id, tweets, accounts) - source is 'historical_tweets' or
+        'deep_history', row_id the last row read, tweets a list of tweet dicts
+        with id/text/entities/username, accounts a dict of username -> account
+        snapshot (empty for historical_tweets batches)
+    """
+    session = get_db_session()
+    try:
+        query = session.query(
+            HistoricalTweet.id, HistoricalTweet.tweet_id, HistoricalTweet.username,
+            HistoricalTweet.text, HistoricalTweet.tweet_data
+        ).filter(
+            HistoricalTweet.id > after_historical_id
+        ).order_by(HistoricalTweet.id).yield_per(batch_size)
+        batch = []
+        row_id = None
+        for row_id, tweet_id, username, text, tweet_data in query:
+            batch.append({
+                'id': tweet_id,
+                'username': username,
+                'text': text or (tweet_data or {}).get('text', ''),
+                'entities': (tweet_data or {}).get('entities', {})
+            })
+            if len(batch) >= batch_size:
+                yield 'historical_tweets', row_id, batch, {}
+                batch = []
+        if batch:
+            yield 'historical_tweets', row_id, batch, {}
+        
+        query = session.query(
+            DeepHistory.id, DeepHistory.username, DeepHistory.raw_json, DeepHistory.account_snapshot
+        ).filter(
+            DeepHistory.id > after_deep_history_id,
+            DeepHistory.platform == 'twitter'
+        ).order_by(DeepHistory.id).yield_per(50)
+        for row_id, username, raw_json, account_snapshot in query:
+            tweets = (raw_json or {}).get('tweets', [])
+            for tweet in tweets:
+                tweet.setdefault('username', username)
+            yield 'deep_history', row_id, tweets, ({username: account_snapshot} if account_snapshot else {})
+    finally:
+        session.close()
+
+
 def save_to_deep_history(
     username, 
     platform, 
@@ -272,19 +636,15 @@ def save_to_deep_history(
         total_engagement = 0
         
         if raw_json and 'tweets' in raw_json:
+            # Engagement (likes + retweets + replies), summed over the metrics array
+            totals = analytics.metric_totals(analytics.tweet_metrics(raw_json['tweets']))
+            total_engagement = totals['like_count'] + totals['retweet_count'] + totals['reply_count']
+            
             for tweet in raw_json['tweets']:
                 # Tweet IDs
                 if 'id' in tweet:
                     tweet_ids.append(tweet['id'])
                 
-                # Engagement
-                metrics = tweet.get('public_metrics', {})
-                total_engagement += (
-                    metrics.get('like_count', 0) +
-                    metrics.get('retweet_count', 0) +
-                    metrics.get('reply_count', 0)
-                )
-                
                 # Entities
                 entities = tweet.get('entities', {})
                 if 'hashtags' in entities:
@@ -415,3 +775,262 @@ def search_deep_history(query_text, platform=None, limit=50):
     finally:
         session.close()
 
+
+
+# Scrape job queue (see ScrapeJob)
+
+def enqueue_scrape_job(job_id, kind, params, total=1, max_attempts=3):
+    """Insert a queued ScrapeJob; raises if it can't be stored"""
+    session = get_db_session()
+    try:
+        session.add(ScrapeJob(id=job_id, kind=kind, params=params, total=total, max_attempts=max_attempts,
+                              status='queued', results=[], errors=[], available_at=datetime.utcnow()))
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def claim_scrape_job(worker_id, lease_seconds, kinds=None, candidates=5):
+    """
+    Claim the oldest runnable job for a worker
+    
+    Runnable jobs are queued ones whose retry delay has passed, and running
+    ones whose lease expired (their worker died). On PostgreSQL the candidates
+    are locked with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers
+    never wait on or pick the same rows. SQLite has no row locks (FOR UPDATE
+    is dropped there); the claim UPDATE is guarded by the status and attempt
+    count that were read, so only one of two racing workers gets a row.
+    
+    A job whose lease expired on its last attempt is marked failed instead.
+    
+    Args:
+        worker_id: Identifier stored on the claimed row
+        lease_seconds: How long the claim holds without a heartbeat
+        kinds: Only claim jobs of these kinds (default: any)
+        candidates: Rows examined per call
+    
+    Returns:
+        ScrapeJob dict for the claimed job, including the results and errors
+        recorded by earlier attempts, or None
+    """
+    session = get_db_session()
+    try:
+        now = datetime.utcnow()
+        query = session.query(ScrapeJob.id, ScrapeJob.status, ScrapeJob.attempts, ScrapeJob.max_attempts).filter(
+            or_(
+                and_(ScrapeJob.status == 'queued', ScrapeJob.available_at <= now),
+                and_(ScrapeJob.status == 'running', ScrapeJob.lease_expires_at < now)
+            )
+        )
+        if kinds:
+            query = query.filter(ScrapeJob.kind.in_(list(kinds)))
+        rows = query.order_by(ScrapeJob.available_at).limit(candidates).with_for_update(skip_locked=True).all()
+        
+        for job_id, status, attempts, max_attempts in rows:
+            guard = session.query(ScrapeJob).filter(
+                ScrapeJob.id == job_id,
+                ScrapeJob.status == status,
+                ScrapeJob.attempts == attempts
+            )
+            if attempts >= max_attempts:
+                # Lease ran out on the last attempt
+                if guard.update({'status': 'failed', 'finished_at': now, 'lease_expires_at': None,
+                                 'error': f"Worker lease expired after {attempts} attempt(s)"},
+                                synchronize_session=False):
+                    print(f"[JOBS] Job {job_id} failed: lease expired after {attempts} attempt(s)")
+                continue
+            claimed = guard.update({
+                'status': 'running',
+                'worker_id': worker_id,
+                'attempts': attempts + 1,
+                'lease_expires_at': now + timedelta(seconds=lease_seconds),
+                'heartbeat_at': now,
+                'started_at': now,
+                'finished_at': None
+                # results/errors are kept: a retry resumes after the items
+                # earlier attempts already committed
+            }, synchronize_session=False)
+            if claimed:
+                session.commit()
+                if status == 'running':
+                    print(f"[JOBS] Reclaimed job {job_id} after its lease expired")
+                return session.query(ScrapeJob).filter(ScrapeJob.id == job_id).one().to_dict()
+        
+        session.commit()
+        return None
+    except Exception as e:
+        session.rollback()
+        print(f"[JOBS] Error claiming a job: {e}")
+        return None
+    finally:
+        session.close()
+
+
+def heartbeat_scrape_job(job_id, worker_id, lease_seconds):
+    """
+    Extend a running job's lease
+    
+    Returns:
+        False if the worker no longer owns the job (its lease expired and it was reclaimed)
+    """
+    session = get_db_session()
+    try:
+        now = datetime.utcnow()
+        renewed = session.query(ScrapeJob).filter(
+            ScrapeJob.id == job_id,
+            ScrapeJob.worker_id == worker_id,
+            ScrapeJob.status == 'running'
+        ).update({'lease_expires_at': now + timedelta(seconds=lease_seconds), 'heartbeat_at': now},
+                 synchronize_session=False)
+        session.commit()
+        return bool(renewed)
+    except Exception as e:
+        session.rollback()
+        print(f"[JOBS] Error renewing lease for job {job_id}: {e}")
+        # Keep working; the next heartbeat retries
+        return True
+    finally:
+        session.close()
+
+
+def record_scrape_job_item(job_id, worker_id, result=None, error=None):
+    """
+    Append one account's outcome to a running job owned by worker_id
+    
+    Returns:
+        True once recorded, False if the worker no longer owns the job, None on a database error
+    """
+    session = get_db_session()
+    try:
+        job = session.query(ScrapeJob).filter(
+            ScrapeJob.id == job_id,
+            ScrapeJob.worker_id == worker_id,
+            ScrapeJob.status == 'running'
+        ).first()
+        if job is None:
+            return False
+        # Reassign: JSON columns don't track in-place changes
+        if result is not None:
+            job.results = (job.results or []) + [result]
+        if error is not None:
+            job.errors = (job.errors or []) + [error]
+        session.commit()
+        return True
+    except Exception as e:
+        session.rollback()
+        print(f"[JOBS] Error recording progress for job {job_id}: {e}")
+        return None
+    finally:
+        session.close()
+
+
+def finish_scrape_job(job_id, worker_id, result=None, error=None, retry=True, retry_backoff_seconds=30):
+    """
+    Complete a running job owned by worker_id
+    
+    Without an error the job succeeds with `result`. With one it is queued
+    again after retry_backoff_seconds * 2^(attempts - 1), or marked failed once
+    max_attempts is reached (or straight away when retry is False).
+    
+    Returns:
+        The new status, or None if the worker no longer owns the job
+    """
+    session = get_db_session()
+    try:
+        job = session.query(ScrapeJob).filter(
+            ScrapeJob.id == job_id,
+            ScrapeJob.worker_id == worker_id,
+            ScrapeJob.status == 'running'
+        ).first()
+        if job is None:
+            return None
+        
+        now = datetime.utcnow()
+        job.lease_expires_at = None
+        if error is None:
+            job.status = 'succeeded'
+            job.result = result
+            job.error = None
+            job.finished_at = now
+        elif retry and job.attempts < job.max_attempts:
+            job.status = 'queued'
+            job.error = error
+            job.worker_id = None
+            job.available_at = now + timedelta(seconds=retry_backoff_seconds * 2 ** (job.attempts - 1))
+        else:
+            job.status = 'failed'
+            job.error = error
+            job.finished_at = now
+        session.commit()
+        return job.status
+    except Exception as e:
+        session.rollback()
+        print(f"[JOBS] Error finishing job {job_id}: {e}")
+        return None
+    finally:
+        session.close()
+
+
+def get_scrape_job(job_id):
+    """ScrapeJob dict with its progress and result, or None"""
+    session = get_db_session()
+    try:
+        job = session.query(ScrapeJob).filter(ScrapeJob.id == job_id).first()
+        return job.to_dict() if job else None
+    finally:
+        session.close()
+
+
+def recent_scrape_jobs(limit=50):
+    """Newest ScrapeJob dicts first (without results)"""
+    session = get_db_session()
+    try:
+        jobs = session.query(ScrapeJob).order_by(ScrapeJob.created_at.desc()).limit(limit).all()
+        return [job.to_dict(include_results=False) for job in jobs]
+    finally:
+        session.close()
+
+
+def saved_job_reports(job_id):
+    """
+    Reports a job has already saved, keyed by username
+    
+    A retried job uses these to record accounts whose report an earlier
+    attempt committed but did not get to record as progress.
+    
+    Returns:
+        Dict mapping username to its job result item fields
+    """
+    session = get_db_session()
+    try:
+        rows = session.query(
+            Report.username, Report.id, Report.tweet_count, Report.account_type, Report.lead_score
+        ).filter(Report.job_id == job_id).all()
+        return {
+            username: {'report_id': report_id, 'tweet_count': tweet_count,
+                       'account_type': account_type, 'lead_score': lead_score}
+            for username, report_id, tweet_count, account_type, lead_score in rows
+        }
+    finally:
+        session.close()
+
+
+def prune_scrape_jobs(max_age_seconds):
+    """Delete jobs that finished more than max_age_seconds ago; returns how many"""
+    session = get_db_session()
+    try:
+        deleted = session.query(ScrapeJob).filter(
+            ScrapeJob.status.in_(['succeeded', 'failed']),
+            ScrapeJob.finished_at < datetime.utcnow() - timedelta(seconds=max_age_seconds)
+        ).delete(synchronize_session=False)
+        session.commit()
+        return deleted
+    except Exception as e:
+        session.rollback()
+        print(f"[JOBS] Error pruning old jobs: {e}")
+        return 0
+    finally:
+        session.close()
@@ -0,0 +1,69 @@
+import json
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Name of the JSON backend in use ('orjson' when installed, else the stdlib 'json')
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+def loads(data):
+    """
+    Decode JSON from str or UTF-8 bytes
+
+    Pass response.content rather than response.json() so the payload is
+    decoded straight from bytes without building an intermediate str.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, default=None, sort_keys=False, indent=False, passthrough_datetime=False):
+    """
+    Encode an object to a JSON str
+
+    Args:
+        obj: Object to encode
+        default: Called for objects the encoder doesn't support
+        sort_keys: Sort object keys
+        indent: Pretty-print with two-space indentation
+        passthrough_datetime: Hand datetimes to `default` instead of encoding
+            them as ISO 8601 (orjson only; the stdlib always does this)
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if passthrough_datetime:
+            option |= orjson.OPT_PASSTHROUGH_DATETIME
+        try:
+            return orjson.dumps(obj, default=default, option=option).decode('utf-8')
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits - let the stdlib encoder try
+            pass
+
+    if indent:
+        return json.dumps(obj, default=default, sort_keys=sort_keys, indent=2)
+    return json.dumps(obj, default=default, sort_keys=sort_keys, separators=(',', ':'))
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider (jsonify, request.json) backed by this module"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(
+            obj,
+            default=kwargs.get('default', self.default),
+            sort_keys=kwargs.get('sort_keys', self.sort_keys),
+            indent=bool(kwargs.get('indent')),
+            passthrough_datetime=True  # Keep Flask's HTTP-date format for datetimes
+        )
+
+    def loads(self, s, **kwargs):
+        return loads(s)
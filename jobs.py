@@ -0,0 +1,228 @@
+import os
+import socket
+import threading
+import time
+import uuid
+
+from database import (
+    claim_scrape_job,
+    enqueue_scrape_job,
+    finish_scrape_job,
+    get_scrape_job,
+    heartbeat_scrape_job,
+    prune_scrape_jobs,
+    recent_scrape_jobs,
+    record_scrape_job_item
+)
+
+# Background worker threads running scrape jobs in each app process
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+# How long finished jobs stay available to GET /jobs/<id> (seconds)
+JOB_RETENTION_SECONDS = int(os.getenv('JOB_RETENTION_SECONDS', '3600'))
+# A claimed job goes back to the queue if its worker sends no heartbeat for this long (seconds)
+JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', '120'))
+# How often idle workers look for queued jobs (seconds)
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '1'))
+# Attempts per job before it is marked failed
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+# Delay before the first retry; doubles with each further attempt (seconds)
+JOB_RETRY_BACKOFF_SECONDS = float(os.getenv('JOB_RETRY_BACKOFF_SECONDS', '30'))
+
+
+class JobFailed(Exception):
+    """Raised by a handler to fail its job without retrying (e.g. the account has no tweets)"""
+
+
+class LeaseLost(Exception):
+    """Raised inside a handler once its worker no longer owns the job, so it stops writing"""
+
+
+class Job:
+    """
+    Handle a job handler runs with
+
+    Handlers report per-item outcomes with add_result()/add_error() as they go;
+    each one is written to the job's row, so pollers on any process see
+    progress before the job finishes. The handler's return value becomes the
+    job's `result`; an exception it raises is retried (see JobQueue), except
+    JobFailed, which fails the job straight away.
+
+    A retried job starts with the results and errors of earlier attempts, so
+    handlers skip the usernames in `done` instead of saving them twice. Once
+    the worker loses the job's lease, check_lease(), add_result() and
+    add_error() raise LeaseLost and the handler stops.
+    """
+
+    def __init__(self, job_id, kind, params, worker_id, results=None, errors=None):
+        self.id = job_id
+        self.kind = kind
+        self.params = params
+        self.worker_id = worker_id
+        self.results = list(results or [])
+        self.errors = list(errors or [])
+        self.lease_lost = threading.Event()
+
+    @property
+    def done(self):
+        """Usernames already processed, by this attempt or an earlier one"""
+        return {item.get('username') for item in self.results + self.errors}
+
+    def check_lease(self):
+        """Raise LeaseLost if another worker may have taken the job over"""
+        if self.lease_lost.is_set():
+            raise LeaseLost(f"Lost the lease on job {self.id}")
+
+    def _record(self, **item):
+        self.check_lease()
+        if record_scrape_job_item(self.id, self.worker_id, **item) is False:
+            self.lease_lost.set()
+            self.check_lease()
+
+    def add_result(self, item):
+        """Record one successfully processed item"""
+        self._record(result=item)
+        self.results.append(item)
+
+    def add_error(self, item):
+        """Record one failed item"""
+        self._record(error=item)
+        self.errors.append(item)
+
+
+class JobQueue:
+    """
+    Durable background job queue backed by the scrape_jobs table
+
+    Routes enqueue a job and return its id right away. Every app process runs
+    a few worker threads that claim queued jobs from the database (SELECT ...
+    FOR UPDATE SKIP LOCKED on PostgreSQL), so jobs are shared by all gunicorn
+    workers and replicas and throughput grows with the number of processes.
+    A running job's lease is renewed by heartbeats; if its process dies, the
+    lease runs out and another worker picks the job up. Failed jobs are
+    retried with exponential backoff up to JOB_MAX_ATTEMPTS, resuming after
+    the items earlier attempts recorded.
+    """
+
+    def __init__(self, workers=JOB_WORKERS, lease_seconds=JOB_LEASE_SECONDS, poll_interval=JOB_POLL_INTERVAL,
+                 max_attempts=JOB_MAX_ATTEMPTS, retry_backoff_seconds=JOB_RETRY_BACKOFF_SECONDS,
+                 retention_seconds=JOB_RETENTION_SECONDS):
+        """
+        Args:
+            workers: Jobs run at the same time by this process
+            lease_seconds: How long a claim holds without a heartbeat
+            poll_interval: Seconds between queue checks when idle
+            max_attempts: Attempts per job before it fails
+            retry_backoff_seconds: Delay before the first retry (doubles after)
+            retention_seconds: How long finished jobs are kept for polling
+        """
+        self.handlers = {}
+        self.workers = max(1, workers)
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.retention_seconds = retention_seconds
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def register(self, kind, handler):
+        """
+        Register the function that runs jobs of a kind
+
+        Args:
+            kind: Job kind name
+            handler: Called as handler(job, **params); returns the job result
+        """
+        self.handlers[kind] = handler
+
+    def submit(self, kind, params, total=1):
+        """
+        Queue a job
+
+        Args:
+            kind: Registered job kind
+            params: JSON-serializable keyword arguments for the handler
+            total: Number of items (accounts) the job will process
+
+        Returns:
+            The queued job's dict
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = uuid.uuid4().hex
+        enqueue_scrape_job(job_id, kind, params, total, self.max_attempts)
+        print(f"[JOBS] Queued {kind} job {job_id}")
+        # Let an idle local worker pick it up without waiting for its next poll
+        self._wakeup.set()
+        return {'id': job_id, 'kind': kind, 'status': 'queued'}
+
+    def get(self, job_id):
+        """The job's dict with progress and result, or None if it is unknown or expired"""
+        return get_scrape_job(job_id)
+
+    def recent(self, limit=50):
+        """Most recently created jobs first (without results)"""
+        return recent_scrape_jobs(limit)
+
+    def start(self):
+        """Start this process's worker threads"""
+        if self._threads:
+            return
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, args=(f"{prefix}:{index}",), daemon=True,
+                                      name=f"job-worker-{index}")
+            thread.start()
+            self._threads.append(thread)
+        print(f"[JOBS] Started {self.workers} job worker thread(s)")
+
+    def stop(self, timeout=None):
+        """Stop the worker threads after their current jobs"""
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._stop.clear()
+
+    def _work(self, worker_id):
+        last_prune = 0.0
+        while not self._stop.is_set():
+            if time.monotonic() - last_prune > 60:
+                prune_scrape_jobs(self.retention_seconds)
+                last_prune = time.monotonic()
+
+            job = claim_scrape_job(worker_id, self.lease_seconds, kinds=list(self.handlers))
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            self._run(job, worker_id)
+
+    def _run(self, job, worker_id):
+        handle = Job(job['id'], job['kind'], job['params'] or {}, worker_id,
+                     results=job.get('results'), errors=job.get('errors'))
+        done = threading.Event()
+
+        def heartbeat():
+            while not done.wait(self.lease_seconds / 3):
+                if not heartbeat_scrape_job(handle.id, worker_id, self.lease_seconds):
+                    print(f"[JOBS] Lost the lease on job {handle.id}; stopping it")
+                    handle.lease_lost.set()
+                    return
+
+        threading.Thread(target=heartbeat, daemon=True, name=f"job-heartbeat-{handle.id[:8]}").start()
+        print(f"[JOBS] Running {handle.kind} job {handle.id} (attempt {job['attempts']}/{job['max_attempts']})")
+        try:
+            result = self.handlers[handle.kind](handle, **handle.params)
+            finish_scrape_job(handle.id, worker_id, result=result)
+        except LeaseLost:
+            # The job is another worker's now; leave its row alone
+            print(f"[JOBS] {handle.kind} job {handle.id} stopped after losing its lease")
+        except Exception as e:
+            status = finish_scrape_job(handle.id, worker_id, error=str(e), retry=not isinstance(e, JobFailed),
+                                       retry_backoff_seconds=self.retry_backoff_seconds)
+            print(f"[JOBS] {handle.kind} job {handle.id} failed: {e} ({status or 'lease lost'})")
+        finally:
+            done.set()
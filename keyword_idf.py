@@ -0,0 +1,115 @@
+import re
+import math
+import threading
+from collections import Counter
+
+from corpus_feed import CorpusFeed
+
+_BIO_NOISE = re.compile(r'http\S+|@\w+|#\w+')
+_TWEET_NOISE = re.compile(r'http\S+|@\w+|#\w+|RT')
+_WORD = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+STOP_WORDS = frozenset({
+    'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'her', 'was', 'one',
+    'our', 'out', 'day', 'get', 'has', 'him', 'his', 'how', 'its', 'may', 'new', 'now',
+    'old', 'see', 'two', 'who', 'boy', 'did', 'let', 'put', 'say', 'she', 'too', 'use',
+    'with', 'this', 'that', 'from', 'have', 'they', 'will', 'what', 'been', 'more',
+    'when', 'your', 'than', 'them', 'some', 'time', 'very', 'just', 'know', 'take',
+    'into', 'year', 'good', 'make', 'over', 'think', 'also', 'back', 'after', 'come',
+    'most', 'work', 'first', 'well', 'way', 'even', 'want', 'because', 'these', 'give',
+    'about', 'being', 'doing', 'going', 'having', 'making', 'saying', 'taking', 'using'
+})
+
+
+def bio_terms(text):
+    """Keyword candidates from a profile bio (URLs, mentions and hashtags removed)"""
+    words = _WORD.findall(_BIO_NOISE.sub('', text or '').lower())
+    return [word for word in words if word not in STOP_WORDS]
+
+
+def tweet_terms(tweet):
+    """Keyword candidates from a tweet: its words plus its hashtags"""
+    words = _WORD.findall(_TWEET_NOISE.sub('', tweet.get('text') or '').lower())
+    terms = [word for word in words if word not in STOP_WORDS]
+    for tag in tweet.get('entities', {}).get('hashtags', []):
+        tag = tag['tag'].lower()
+        if len(tag) >= 3 and tag not in STOP_WORDS:
+            terms.append(tag)
+    return terms
+
+
+class CorpusIDF:
+    """
+    Inverse document frequencies over the tweets we have stored
+
+    Every stored tweet (historical_tweets plus the tweets inside deep_history
+    records) is one document. Tweets arrive through a CorpusFeed, which can be
+    shared with AccountVectorIndex so the corpus is read once per process: the
+    table is loaded on first use and then kept current incrementally, each
+    refresh only reading rows past the feed's row-ID cursors.
+
+    With `persist` disabled (or an empty database) every term gets the same
+    IDF, so rankings fall back to plain term frequency.
+    """
+
+    def __init__(self, feed=None, persist=True):
+        """
+        Args:
+            feed: Shared CorpusFeed (a private one is created if omitted)
+            persist: Whether a private feed reads the database
+        """
+        self.feed = feed or CorpusFeed(persist=persist)
+        self.persist = self.feed.persist
+        self.doc_count = 0
+        self.doc_freq = Counter()
+        self._lock = threading.Lock()
+        self.feed.subscribe(self._count_tweets)
+
+    def _count_tweets(self, tweets, accounts=None):
+        terms = [set(tweet_terms(tweet)) for tweet in tweets]
+        with self._lock:
+            self.doc_count += len(terms)
+            for term_set in terms:
+                self.doc_freq.update(term_set)
+
+    def add_tweets(self, tweets):
+        """Count tweets as corpus documents (through the feed, which skips repeats)"""
+        self.feed.add(tweets)
+
+    def refresh(self, force=False):
+        """Fold in tweets stored since the last refresh (at most once per the feed's refresh_interval)"""
+        self.feed.refresh(force)
+
+    def idf(self, term):
+        """Smoothed IDF: log((1 + N) / (1 + df)) + 1"""
+        with self._lock:
+            return math.log((1 + self.doc_count) / (1 + self.doc_freq.get(term, 0))) + 1
+
+    def top_terms(self, term_counts, limit=20):
+        """
+        Rank terms by TF-IDF
+
+        Args:
+            term_counts: Counter of term -> occurrences in the account's text
+            limit: Number of terms to return
+
+        Returns:
+            Terms, highest (1 + log tf) * idf first; ties keep first-seen order
+        """
+        with self._lock:
+            doc_count = self.doc_count
+            doc_freq = self.doc_freq
+            scored = [
+                ((1 + math.log(count)) * (math.log((1 + doc_count) / (1 + doc_freq.get(term, 0))) + 1), term)
+                for term, count in term_counts.items()
+            ]
+        scored.sort(key=lambda entry: entry[0], reverse=True)
+        return [term for _, term in scored[:limit]]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'documents': self.doc_count,
+                'terms': len(self.doc_freq),
+                'persistent': self.persist
+            }
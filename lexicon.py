@@ -0,0 +1,12 @@
+from text_matcher import compile_matcher
+
+# Sentiment lexicons for Twitter reports (substring matches on the lowercased tweet text)
+POSITIVE_WORDS = ('great', 'excellent', 'amazing', 'love', 'best', 'awesome',
+                  'fantastic', 'wonderful', 'excited', 'happy', 'success', 'win')
+NEGATIVE_WORDS = ('bad', 'terrible', 'worst', 'hate', 'awful', 'disappointed',
+                  'fail', 'problem', 'issue', 'broken', 'poor', 'sad')
+# Business opportunity indicators
+OPPORTUNITY_WORDS = ('looking for', 'need', 'seeking', 'hiring', 'opportunity',
+                     'help', 'recommend', 'suggestion', 'advice', 'question')
+SENTIMENT_WORDS = POSITIVE_WORDS + NEGATIVE_WORDS + OPPORTUNITY_WORDS
+SENTIMENT_MATCHER = compile_matcher(SENTIMENT_WORDS)
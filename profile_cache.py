@@ -0,0 +1,173 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+# Profile cache defaults (override via environment variables)
+DEFAULT_TTL = float(os.getenv('PROFILE_CACHE_TTL', str(6 * 60 * 60)))
+DEFAULT_MAX_SIZE = int(os.getenv('PROFILE_CACHE_SIZE', '2000'))
+DEFAULT_PERSIST = os.getenv('PROFILE_CACHE_PERSIST', 'true').lower() in ('1', 'true', 'yes')
+# How long a handle the API could not resolve is remembered as missing (seconds)
+DEFAULT_NEGATIVE_TTL = float(os.getenv('PROFILE_CACHE_NEGATIVE_TTL', '300'))
+
+
+class ProfileCache:
+    """
+    TTL-bounded LRU cache of X user profiles, keyed by lowercased username
+
+    Entries expire after `ttl` seconds and the least recently used entry is
+    evicted once `max_size` is reached. With `persist` enabled, misses fall
+    through to the user_profiles table and new profiles are written back, so
+    the cache survives restarts and is shared by every worker.
+
+    Handles the API could not resolve (unknown or suspended accounts) are
+    remembered in memory for `negative_ttl` seconds, so they aren't looked up
+    again by every caller in the meantime. The table is read at most once per
+    memory miss: a profile found there joins the LRU, and a handle with no
+    fresh row is remembered as absent (also for `negative_ttl`, or until it
+    is set), so repeated misses don't query the database again.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, max_size=DEFAULT_MAX_SIZE, persist=DEFAULT_PERSIST,
+                 negative_ttl=DEFAULT_NEGATIVE_TTL):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.persist = persist
+        self.negative_ttl = negative_ttl
+        self._entries = OrderedDict()  # username -> (expires_at, profile)
+        self._missing = OrderedDict()  # username -> expires_at
+        self._absent = OrderedDict()  # username -> expires_at, no fresh row in user_profiles
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.db_hits = 0
+        self.db_reads = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.evictions = 0
+
+    def get(self, username):
+        """Return a cached profile (a copy) or None on a miss"""
+        key = username.lower()
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, profile = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(profile)
+                del self._entries[key]
+            # Handles that failed to resolve have no row; is_missing() counts them
+            if self._unexpired(self._missing, key, now):
+                return None
+            read_db = self.persist and not self._unexpired(self._absent, key, now)
+
+        if read_db:
+            from database import get_cached_profile
+            stored = get_cached_profile(key, self.ttl)
+            with self._lock:
+                self.db_reads += 1
+            if stored:
+                profile, fetched_at = stored
+                # Keep the original fetch time so DB entries expire on schedule
+                age = max(0.0, (datetime.utcnow() - fetched_at).total_seconds())
+                self._store(key, profile, now + self.ttl - age)
+                with self._lock:
+                    self.db_hits += 1
+                return dict(profile)
+            self._remember(self._absent, [key])
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    @staticmethod
+    def _unexpired(entries, key, now):
+        """True if key is in an expiry map (username -> expires_at) and still live; call with the lock held"""
+        expires_at = entries.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= now:
+            del entries[key]
+            return False
+        return True
+
+    def _remember(self, entries, keys):
+        """Add keys to an expiry map for negative_ttl seconds, bounded by max_size"""
+        if not self.negative_ttl:
+            return
+        expires_at = time.time() + self.negative_ttl
+        with self._lock:
+            for key in keys:
+                entries[key] = expires_at
+                entries.move_to_end(key)
+            while len(entries) > self.max_size:
+                entries.popitem(last=False)
+
+    def set(self, username, profile):
+        """Cache a freshly fetched profile"""
+        self.set_many({username: profile})
+
+    def set_many(self, profiles):
+        """Cache several freshly fetched profiles (dict of username -> profile)"""
+        if not profiles:
+            return
+        expires_at = time.time() + self.ttl
+        for username, profile in profiles.items():
+            self._store(username.lower(), profile, expires_at)
+        with self._lock:
+            for username in profiles:
+                self._missing.pop(username.lower(), None)
+                self._absent.pop(username.lower(), None)
+
+        if self.persist:
+            from database import save_cached_profiles
+            save_cached_profiles(profiles)
+
+    def _store(self, key, profile, expires_at):
+        with self._lock:
+            self._entries[key] = (expires_at, profile)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def set_missing(self, usernames):
+        """Remember handles the API could not resolve (in memory only, for negative_ttl)"""
+        self._remember(self._missing, [username.lower() for username in usernames])
+
+    def is_missing(self, username):
+        """True if the handle failed to resolve within the last negative_ttl seconds"""
+        with self._lock:
+            if not self._unexpired(self._missing, username.lower(), time.time()):
+                return False
+            self.negative_hits += 1
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._missing.clear()
+            self._absent.clear()
+
+    def stats(self):
+        """Hit/miss counters for /health"""
+        with self._lock:
+            lookups = self.hits + self.db_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'persistent': self.persist,
+                'hits': self.hits,
+                'db_hits': self.db_hits,
+                'db_reads': self.db_reads,
+                'misses': self.misses,
+                'missing_handles': len(self._missing),
+                'negative_hits': self.negative_hits,
+                'evictions': self.evictions,
+                'hit_rate': round((self.hits + self.db_hits) / lookups, 3) if lookups else None
+            }
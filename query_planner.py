@@ -0,0 +1,52 @@
+import os
+
+# Longest query recent search accepts (512 on Basic, 1024 on Pro and above)
+DEFAULT_MAX_QUERY_LENGTH = int(os.getenv('TWITTER_QUERY_MAX_LENGTH', '512'))
+
+
+def plan_query_groups(usernames, build_query, max_length=DEFAULT_MAX_QUERY_LENGTH):
+    """
+    Pack accounts into groups that can share one (from:a OR from:b ...) search
+
+    Accounts are packed greedily in order, starting a new group whenever adding
+    the next account would push the combined query over max_length.
+
+    Args:
+        usernames: Twitter handles to pack (without @)
+        build_query: Callable turning a list of handles into the full query
+        max_length: Longest query the API accepts
+
+    Returns:
+        List of username lists. An account whose query is too long on its own
+        still gets a group, so the API reports the error as it did before.
+    """
+    groups = []
+    current = []
+    for username in usernames:
+        if current and len(build_query(current + [username])) > max_length:
+            groups.append(current)
+            current = []
+        current.append(username)
+    if current:
+        groups.append(current)
+    return groups
+
+
+def split_tweets_by_author(tweets, usernames_by_author_id):
+    """
+    Split a combined search page back out per account
+
+    Args:
+        tweets: Tweets from a page ('data'), each carrying author_id
+        usernames_by_author_id: Dict of user ID -> username for the group
+
+    Returns:
+        Dict of username -> list of that account's tweets, in page order.
+        Tweets from authors outside the group are dropped.
+    """
+    split = {}
+    for tweet in tweets:
+        username = usernames_by_author_id.get(tweet.get('author_id'))
+        if username is not None:
+            split.setdefault(username, []).append(tweet)
+    return split
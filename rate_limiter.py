@@ -0,0 +1,173 @@
+import os
+import re
+import time
+import threading
+from urllib.parse import urlparse
+
+# Longest a caller will be queued waiting for a rate-limit window to reset
+DEFAULT_MAX_WAIT = float(os.getenv('TWITTER_RATE_LIMIT_MAX_WAIT', '900'))
+# Tokens held back per window for other processes sharing the same app token
+DEFAULT_RESERVE = int(os.getenv('TWITTER_RATE_LIMIT_RESERVE', '0'))
+# Extra delay after a reset so we don't race the server's clock
+RESET_MARGIN_SECONDS = 1.0
+# X API rate-limit windows are 15 minutes
+WINDOW_SECONDS = 15 * 60
+
+_NUMERIC_SEGMENT = re.compile(r'^\d+$')
+
+
+def endpoint_key(url):
+    """
+    Normalize an API URL to its rate-limit bucket
+
+    e.g. https://api.x.com/2/users/by/username/nasa -> users/by/username/:username
+         https://api.x.com/2/users/123/tweets       -> users/:id/tweets
+    """
+    parts = [p for p in urlparse(url).path.split('/') if p]
+    if parts and parts[0] == '2':
+        parts = parts[1:]
+    if parts[:3] == ['users', 'by', 'username'] and len(parts) > 3:
+        parts = parts[:3] + [':username']
+    parts = [':id' if _NUMERIC_SEGMENT.match(p) else p for p in parts]
+    return '/'.join(parts)
+
+
+class _Bucket:
+    __slots__ = ('limit', 'remaining', 'reset_at', 'in_flight', 'observed')
+
+    def __init__(self):
+        self.observed = False  # Whether any response has been seen yet
+        self.limit = None
+        self.remaining = None  # Unknown until the first response
+        self.reset_at = 0.0
+        self.in_flight = 0
+
+
+class RateLimitGovernor:
+    """
+    Per-endpoint token buckets driven by X API rate-limit headers
+
+    Each response's x-rate-limit-limit / -remaining / -reset headers refill the
+    bucket for its endpoint. Callers take a token before sending a request;
+    when a bucket is empty they are queued until the window resets instead of
+    sending a request that would come back 429.
+    """
+
+    def __init__(self, max_wait=DEFAULT_MAX_WAIT, reserve=DEFAULT_RESERVE):
+        self.max_wait = max_wait
+        self.reserve = reserve
+        self._buckets = {}
+        self._condition = threading.Condition()
+        self.waits = 0
+        self.seconds_waited = 0.0
+        self.throttled_responses = 0
+
+    def _bucket(self, key):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket()
+        return bucket
+
+    def _refresh(self, bucket, now):
+        """Forget the remaining count once a bucket's window has reset"""
+        if bucket.remaining is not None and now >= bucket.reset_at + RESET_MARGIN_SECONDS:
+            bucket.remaining = None
+
+    def _available(self, bucket):
+        if bucket.remaining is None:
+            # Limits not known yet: unlimited if the API never reports one,
+            # otherwise probe with one request to learn the current window
+            if bucket.observed and bucket.limit is None:
+                return True
+            return bucket.in_flight == 0
+        return bucket.remaining - bucket.in_flight > self.reserve
+
+    def acquire(self, key):
+        """
+        Take a token for an endpoint, blocking until the window resets if needed
+
+        Returns:
+            Seconds spent waiting. If the reset is further away than max_wait the
+            call returns immediately without waiting.
+        """
+        waited = 0.0
+        with self._condition:
+            bucket = self._bucket(key)
+            while True:
+                now = time.time()
+                self._refresh(bucket, now)
+                if self._available(bucket):
+                    break
+                if bucket.remaining is None:
+                    # Another caller is probing the new window
+                    if waited >= self.max_wait:
+                        break
+                    self._condition.wait(self.max_wait - waited)
+                    waited += time.time() - now
+                    continue
+                wait = bucket.reset_at + RESET_MARGIN_SECONDS - now
+                if waited + wait > self.max_wait:
+                    print(f"[RATE_LIMIT] {key}: window resets in {wait:.0f}s, exceeds max wait of {self.max_wait:.0f}s")
+                    break
+                if waited == 0.0:
+                    self.waits += 1
+                    print(f"[RATE_LIMIT] {key}: quota exhausted, waiting {wait:.0f}s for reset")
+                self._condition.wait(wait)
+                waited += time.time() - now
+            bucket.in_flight += 1
+            self.seconds_waited += waited
+        return waited
+
+    def release(self, key, response=None):
+        """Return a token and update the bucket from the response's headers"""
+        with self._condition:
+            bucket = self._bucket(key)
+            bucket.in_flight = max(0, bucket.in_flight - 1)
+            if response is not None:
+                bucket.observed = True
+                headers = response.headers
+                try:
+                    if 'x-rate-limit-limit' in headers:
+                        bucket.limit = int(headers['x-rate-limit-limit'])
+                    if 'x-rate-limit-remaining' in headers:
+                        bucket.remaining = int(headers['x-rate-limit-remaining'])
+                    if 'x-rate-limit-reset' in headers:
+                        bucket.reset_at = float(headers['x-rate-limit-reset'])
+                except ValueError:
+                    pass
+                if response.status_code == 429:
+                    self.throttled_responses += 1
+                    bucket.remaining = 0
+                    if bucket.reset_at <= time.time():
+                        # No usable reset header - back off for a full window
+                        bucket.reset_at = time.time() + WINDOW_SECONDS
+            self._condition.notify_all()
+
+    def seconds_until_available(self, key):
+        """Seconds until the endpoint's bucket has a token (0 if available now)"""
+        with self._condition:
+            bucket = self._bucket(key)
+            now = time.time()
+            self._refresh(bucket, now)
+            if self._available(bucket) or bucket.remaining is None:
+                return 0.0
+            return bucket.reset_at + RESET_MARGIN_SECONDS - now
+
+    def stats(self):
+        """Snapshot of bucket state for monitoring"""
+        with self._condition:
+            now = time.time()
+            return {
+                'waits': self.waits,
+                'seconds_waited': round(self.seconds_waited, 1),
+                'throttled_responses': self.throttled_responses,
+                'endpoints': {
+                    key: {
+                        'limit': bucket.limit,
+                        'remaining': bucket.remaining,
+                        'resets_in': max(0, round(bucket.reset_at - now)) if bucket.reset_at else None,
+                        'in_flight': bucket.in_flight
+                    }
+                    for key, bucket in self._buckets.items()
+                }
+            }
@@ -1,11 +1,22 @@
+import io
 import os
 import praw
 from datetime import datetime
 from dotenv import load_dotenv
 import json
+import analytics
+from text_matcher import compile_matcher
 
 load_dotenv()
 
+# Sentiment lexicons (substring matches on the lowercased post text)
+POSITIVE_WORDS = ('great', 'excellent', 'amazing', 'love', 'best', 'awesome', 'fantastic', 'perfect')
+NEGATIVE_WORDS = ('bad', 'terrible', 'worst', 'hate', 'awful', 'poor', 'disappointing', 'issue', 'problem')
+# Opportunity signals
+OPPORTUNITY_WORDS = ('looking for', 'need', 'want', 'seeking', 'recommend', 'suggestion', 'help', 'advice')
+SENTIMENT_WORDS = POSITIVE_WORDS + NEGATIVE_WORDS + OPPORTUNITY_WORDS
+SENTIMENT_MATCHER = compile_matcher(SENTIMENT_WORDS)
+
 class RedditScraper:
     def __init__(self):
         self.client_id = os.getenv('REDDIT_CLIENT_ID')
@@ -99,18 +110,12 @@ class RedditScraper:
         if not text:
             return {'sentiment': 'Neutral', 'signals': []}
         
-        text_lower = text.lower()
-        
-        # Positive indicators
-        positive_words = ['great', 'excellent', 'amazing', 'love', 'best', 'awesome', 'fantastic', 'perfect']
-        # Negative indicators
-        negative_words = ['bad', 'terrible', 'worst', 'hate', 'awful', 'poor', 'disappointing', 'issue', 'problem']
-        # Opportunity signals
-        opportunity_words = ['looking for', 'need', 'want', 'seeking', 'recommend', 'suggestion', 'help', 'advice']
+        # All three lexicons in one scan of the text
+        hits = SENTIMENT_MATCHER.find(text)
         
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
-        signals = [word for word in opportunity_words if word in text_lower]
+        positive_count = len(hits.intersection(POSITIVE_WORDS))
+        negative_count = len(hits.intersection(NEGATIVE_WORDS))
+        signals = [word for word in OPPORTUNITY_WORDS if word in hits]
         
         if positive_count > negative_count:
             sentiment = 'Positive'
@@ -124,131 +129,141 @@ class RedditScraper:
             'signals': signals
         }
     
-    def generate_report(self, posts_data, subreddit_name, keywords=None, min_keyword_mentions=1):
-        """Generate analysis report from Reddit posts"""
+    def generate_report(self, posts_data, subreddit_name, keywords=None, min_keyword_mentions=1, stream=None):
+        """
+        Generate analysis report from Reddit posts
+        
+        Args:
+            posts_data: Search result dict with 'data' (and optionally 'subreddit_info')
+            subreddit_name: Subreddit the report is for
+            keywords: Keywords used in the search (optional)
+            min_keyword_mentions: Threshold for the keyword ranking
+            stream: Optional text stream (e.g. an open file) to write the report into
+        
+        Returns:
+            The report text (None when written to a stream or there are no posts)
+        """
         if not posts_data or 'data' not in posts_data:
             return None
         
         posts = posts_data['data']
         subreddit_info = posts_data.get('subreddit_info', {})
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        report_file = f"reports/reddit_report_{subreddit_name}_{timestamp}.txt"
+        f = stream if stream is not None else io.StringIO()
+        f.write("=" * 80 + "\n")
+        f.write("REDDIT ANALYSIS REPORT\n")
+        f.write("=" * 80 + "\n\n")
         
-        os.makedirs('reports', exist_ok=True)
+        f.write(f"Subreddit: r/{subreddit_name}\n")
+        f.write(f"Subscribers: {subreddit_info.get('subscribers', 'N/A'):,}\n")
+        if subreddit_info.get('description'):
+            f.write(f"Description: {subreddit_info['description']}\n")
+        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}\n")
+        f.write(f"Total Posts Analyzed: {len(posts)}\n")
+        if keywords:
+            f.write(f"Keywords: {', '.join(keywords)}\n")
+        f.write("\n" + "=" * 80 + "\n\n")
         
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write("=" * 80 + "\n")
-            f.write("REDDIT ANALYSIS REPORT\n")
-            f.write("=" * 80 + "\n\n")
-            
-            f.write(f"Subreddit: r/{subreddit_name}\n")
-            f.write(f"Subscribers: {subreddit_info.get('subscribers', 'N/A'):,}\n")
-            if subreddit_info.get('description'):
-                f.write(f"Description: {subreddit_info['description']}\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}\n")
-            f.write(f"Total Posts Analyzed: {len(posts)}\n")
-            if keywords:
-                f.write(f"Keywords: {', '.join(keywords)}\n")
-            f.write("\n" + "=" * 80 + "\n\n")
-            
-            # Keyword Analysis
-            if keywords:
-                f.write("KEYWORD ANALYSIS\n")
-                f.write("-" * 80 + "\n")
-                keyword_counts = {}
-                for keyword in keywords:
-                    count = sum(1 for post in posts 
-                              if keyword.lower() in post.get('title', '').lower() 
-                              or keyword.lower() in post.get('text', '').lower())
-                    keyword_counts[keyword] = count
-                
-                # Sort by frequency
-                sorted_keywords = sorted(keyword_counts.items(), key=lambda x: x[1], reverse=True)
-                
-                qualified_keywords = [(k, c) for k, c in sorted_keywords if c >= min_keyword_mentions]
-                disqualified_keywords = [(k, c) for k, c in sorted_keywords if c < min_keyword_mentions]
-                
-                f.write(f"\nQualified Keywords (≥{min_keyword_mentions} mentions):\n")
-                for keyword, count in qualified_keywords:
-                    percentage = (count / len(posts)) * 100
-                    f.write(f"  • {keyword}: {count} mentions ({percentage:.1f}% of posts)\n")
-                
-                if disqualified_keywords:
-                    f.write(f"\nDisqualified Keywords (<{min_keyword_mentions} mentions):\n")
-                    for keyword, count in disqualified_keywords:
-                        f.write(f"  • {keyword}: {count} mentions\n")
-                
-                f.write("\n")
-            
-            # Engagement Analysis
-            f.write("ENGAGEMENT ANALYSIS\n")
+        # Keyword Analysis
+        if keywords:
+            f.write("KEYWORD ANALYSIS\n")
             f.write("-" * 80 + "\n")
-            
-            # Calculate engagement scores
+            # One scan per title and body for all keywords
+            matcher = compile_matcher(tuple(keywords))
+            keyword_counts = {keyword: 0 for keyword in keywords}
             for post in posts:
-                post['engagement_score'] = self.analyze_post_engagement(post)
-            
-            # Top posts by engagement
-            top_posts = sorted(posts, key=lambda x: x['engagement_score'], reverse=True)[:5]
-            
-            f.write("\nTop 5 Posts by Engagement:\n")
-            for i, post in enumerate(top_posts, 1):
-                f.write(f"\n{i}. {post['title']}\n")
-                f.write(f"   Score: {post['score']} | Comments: {post['num_comments']} | ")
-                f.write(f"Upvote Ratio: {post['upvote_ratio']:.0%}\n")
-                f.write(f"   Engagement Score: {post['engagement_score']}\n")
-                f.write(f"   Link: {post['permalink']}\n")
-            
-            # Sentiment Analysis
-            f.write("\n" + "=" * 80 + "\n")
-            f.write("SENTIMENT ANALYSIS\n")
-            f.write("-" * 80 + "\n")
+                hits = matcher.find(post.get('title', '')) | matcher.find(post.get('text', ''))
+                if hits:
+                    for keyword in keywords:
+                        if keyword.lower() in hits:
+                            keyword_counts[keyword] += 1
             
-            sentiments = {'Positive': 0, 'Negative': 0, 'Neutral': 0}
-            opportunity_posts = []
+            # Sort by frequency
+            sorted_keywords = sorted(keyword_counts.items(), key=lambda x: x[1], reverse=True)
             
-            for post in posts:
-                combined_text = f"{post.get('title', '')} {post.get('text', '')}"
-                analysis = self.perform_sentiment_analysis(combined_text)
-                post['sentiment'] = analysis['sentiment']
-                post['signals'] = analysis['signals']
-                
-                sentiments[analysis['sentiment']] += 1
-                
-                if analysis['signals']:
-                    opportunity_posts.append(post)
+            qualified_keywords = [(k, c) for k, c in sorted_keywords if c >= min_keyword_mentions]
+            disqualified_keywords = [(k, c) for k, c in sorted_keywords if c < min_keyword_mentions]
             
-            f.write(f"\nSentiment Distribution:\n")
-            for sentiment, count in sentiments.items():
+            f.write(f"\nQualified Keywords (≥{min_keyword_mentions} mentions):\n")
+            for keyword, count in qualified_keywords:
                 percentage = (count / len(posts)) * 100
-                f.write(f"  • {sentiment}: {count} posts ({percentage:.1f}%)\n")
+                f.write(f"  • {keyword}: {count} mentions ({percentage:.1f}% of posts)\n")
             
-            # Opportunity signals
-            if opportunity_posts:
-                f.write(f"\n\nLead Opportunity Posts ({len(opportunity_posts)} found):\n")
-                f.write("-" * 80 + "\n")
-                for post in opportunity_posts[:10]:  # Top 10
-                    f.write(f"\n• {post['title']}\n")
-                    f.write(f"  Signals: {', '.join(post['signals'])}\n")
-                    f.write(f"  Score: {post['score']} | Comments: {post['num_comments']}\n")
-                    f.write(f"  Link: {post['permalink']}\n")
+            if disqualified_keywords:
+                f.write(f"\nDisqualified Keywords (<{min_keyword_mentions} mentions):\n")
+                for keyword, count in disqualified_keywords:
+                    f.write(f"  • {keyword}: {count} mentions\n")
             
-            # All Posts
-            f.write("\n" + "=" * 80 + "\n")
-            f.write("ALL POSTS\n")
-            f.write("-" * 80 + "\n\n")
+            f.write("\n")
+        
+        # Engagement Analysis
+        f.write("ENGAGEMENT ANALYSIS\n")
+        f.write("-" * 80 + "\n")
+        
+        # Calculate engagement scores (vectorized; same values as analyze_post_engagement)
+        engagement_scores = analytics.reddit_engagement_scores(posts)
+        for post, engagement_score in zip(posts, engagement_scores):
+            post['engagement_score'] = engagement_score
+        
+        # Top posts by engagement (ties keep post order)
+        top_posts = [posts[i] for i in analytics.top_k(engagement_scores, 5).tolist()]
+        
+        f.write("\nTop 5 Posts by Engagement:\n")
+        for i, post in enumerate(top_posts, 1):
+            f.write(f"\n{i}. {post['title']}\n")
+            f.write(f"   Score: {post['score']} | Comments: {post['num_comments']} | ")
+            f.write(f"Upvote Ratio: {post['upvote_ratio']:.0%}\n")
+            f.write(f"   Engagement Score: {post['engagement_score']}\n")
+            f.write(f"   Link: {post['permalink']}\n")
+        
+        # Sentiment Analysis
+        f.write("\n" + "=" * 80 + "\n")
+        f.write("SENTIMENT ANALYSIS\n")
+        f.write("-" * 80 + "\n")
+        
+        opportunity_posts = []
+        
+        for post in posts:
+            combined_text = f"{post.get('title', '')} {post.get('text', '')}"
+            analysis = self.perform_sentiment_analysis(combined_text)
+            post['sentiment'] = analysis['sentiment']
+            post['signals'] = analysis['signals']
             
-            for i, post in enumerate(posts, 1):
-                f.write(f"{i}. {post['title']}\n")
-                f.write(f"   Author: u/{post['author']} | Score: {post['score']} | ")
-                f.write(f"Comments: {post['num_comments']}\n")
-                if post.get('text'):
-                    preview = post['text'][:200] + "..." if len(post['text']) > 200 else post['text']
-                    f.write(f"   {preview}\n")
-                f.write(f"   Link: {post['permalink']}\n")
-                f.write(f"   Sentiment: {post.get('sentiment', 'N/A')}\n")
-                f.write("\n")
-        
-        print(f"Report generated: {report_file}")
-        return report_file
+            if analysis['signals']:
+                opportunity_posts.append(post)
+        
+        sentiments = analytics.label_counts([post['sentiment'] for post in posts],
+                                            ('Positive', 'Negative', 'Neutral'))
+        
+        f.write(f"\nSentiment Distribution:\n")
+        for sentiment, count in sentiments.items():
+            percentage = (count / len(posts)) * 100
+            f.write(f"  • {sentiment}: {count} posts ({percentage:.1f}%)\n")
+        
+        # Opportunity signals
+        if opportunity_posts:
+            f.write(f"\n\nLead Opportunity Posts ({len(opportunity_posts)} found):\n")
+            f.write("-" * 80 + "\n")
+            for post in opportunity_posts[:10]:  # Top 10
+                f.write(f"\n• {post['title']}\n")
+                f.write(f"  Signals: {', '.join(post['signals'])}\n")
+                f.write(f"  Score: {post['score']} | Comments: {post['num_comments']}\n")
+                f.write(f"  Link: {post['permalink']}\n")
+        
+        # All Posts
+        f.write("\n" + "=" * 80 + "\n")
+        f.write("ALL POSTS\n")
+        f.write("-" * 80 + "\n\n")
+        
+        for i, post in enumerate(posts, 1):
+            f.write(f"{i}. {post['title']}\n")
+            f.write(f"   Author: u/{post['author']} | Score: {post['score']} | ")
+            f.write(f"Comments: {post['num_comments']}\n")
+            if post.get('text'):
+                preview = post['text'][:200] + "..." if len(post['text']) > 200 else post['text']
+                f.write(f"   {preview}\n")
+            f.write(f"   Link: {post['permalink']}\n")
+            f.write(f"   Sentiment: {post.get('sentiment', 'N/A')}\n")
+            f.write("\n")
+        
+        return f.getvalue() if stream is None else None
@@ -0,0 +1,584 @@
+import io
+import os
+import heapq
+import shutil
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+import analytics
+from lexicon import SENTIMENT_WORDS
+from text_matcher import compile_matcher
+
+# Detailed per-tweet section is kept in memory up to this size, then spilled to disk
+SPOOL_MAX_BYTES = 1024 * 1024
+# Directory for reports saved to disk (CLI runs; the web app keeps reports in the database)
+REPORTS_DIR = os.getenv('REPORTS_DIR', 'reports')
+# Layout version of ReportAnalytics.to_dict(), stored with every result
+ANALYTICS_VERSION = 1
+
+
+def default_report_path(platform, name):
+    """
+    Timestamped path for a report saved to disk, creating REPORTS_DIR if needed
+
+    Args:
+        platform: 'twitter' or 'reddit'
+        name: Username or subreddit the report is for
+
+    Returns:
+        Path like reports/twitter_report_<name>_<timestamp>.txt
+    """
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(REPORTS_DIR, f"{platform}_report_{name}_{timestamp}.txt")
+
+
+class TweetAnalysis:
+    """
+    Every per-tweet feature the report uses, computed once
+
+    Aggregation and rendering read these instead of calling the scraper's
+    analysis methods again.
+    """
+
+    def __init__(self, index, tweet, engagement, entities, sentiment, keyword_hits):
+        """
+        Args:
+            index: 1-based position of the tweet in the report
+            tweet: The tweet dict from the API
+            engagement: calculate_engagement_score() result (score, likes, retweets, replies, quotes)
+            entities: extract_entities() result (urls, mentions, hashtags, has_* flags)
+            sentiment: perform_sentiment_analysis() result
+            keyword_hits: Report keywords found in the tweet text
+        """
+        self.index = index
+        self.tweet = tweet
+        self.engagement = engagement
+        self.entities = entities
+        self.sentiment = sentiment
+        self.keyword_hits = keyword_hits
+
+
+def format_tweet_detail(index, tweet, engagement, entities, sentiment, is_opportunity):
+    """Text of one tweet's entry in the DETAILED TWEET ANALYSIS section"""
+    parts = [
+        f"Tweet #{index}\n",
+        f"Date: {tweet.get('created_at', 'N/A')}\n",
+        f"Text: {tweet['text']}\n",
+        f"Sentiment: {sentiment}",
+        " 🎯 OPPORTUNITY\n" if is_opportunity else "\n",
+        f"Engagement Score: {engagement['score']}\n",
+        f"Likes: {engagement['likes']} | Retweets: {engagement['retweets']} | Replies: {engagement['replies']}\n"
+    ]
+    if entities['urls']:
+        parts.append(f"Links: {', '.join(entities['urls'])}\n")
+    if entities['mentions']:
+        parts.append(f"Mentions: @{', @'.join(entities['mentions'])}\n")
+    if entities['hashtags']:
+        parts.append(f"Hashtags: #{', #'.join(entities['hashtags'])}\n")
+    parts.append("-" * 80 + "\n\n")
+    return ''.join(parts)
+
+
+class ReportAnalytics:
+    """
+    Structured result of a Twitter report: the numbers behind the text
+
+    Persisted as Report.analytics (see to_dict/from_dict); the report text is
+    rendered from it on request. Holds:
+
+        summary             tweet_count, account, engagement, content, sentiment
+                            and the ranked keyword counts (what list views show)
+        top_tweets          the 5 highest-engagement tweets
+        opportunity_tweets  the first 5 tweets with opportunity signals
+        tweets              per-tweet [id, sentiment, opportunity_signals] rows,
+                            so rendering the detailed section needs no re-analysis
+    """
+
+    def __init__(self, username, generated_at, keywords, min_keyword_mentions, summary,
+                 top_tweets, opportunity_tweets, tweets=None, version=ANALYTICS_VERSION):
+        self.username = username
+        self.generated_at = generated_at
+        self.keywords = keywords
+        self.min_keyword_mentions = min_keyword_mentions
+        self.summary = summary
+        self.top_tweets = top_tweets
+        self.opportunity_tweets = opportunity_tweets
+        self.tweets = tweets or []
+        self.version = version
+
+    def to_dict(self):
+        return {
+            'version': self.version,
+            'username': self.username,
+            'generated_at': self.generated_at,
+            'keywords': self.keywords,
+            'min_keyword_mentions': self.min_keyword_mentions,
+            'summary': self.summary,
+            'top_tweets': self.top_tweets,
+            'opportunity_tweets': self.opportunity_tweets,
+            'tweets': self.tweets
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data['username'],
+            data['generated_at'],
+            data.get('keywords'),
+            data.get('min_keyword_mentions', 1),
+            data['summary'],
+            data.get('top_tweets', []),
+            data.get('opportunity_tweets', []),
+            data.get('tweets'),
+            data.get('version', ANALYTICS_VERSION)
+        )
+
+    def render(self, scraper, tweets):
+        """
+        Render the full report text
+
+        Args:
+            scraper: TwitterScraper (entity extraction, and sentiment if per-tweet rows are missing)
+            tweets: The report's tweets in report order (e.g. Report.tweets_data['data'])
+        """
+        buffer = io.StringIO()
+        self.write_summary(buffer)
+        buffer.write("\n\nDETAILED TWEET ANALYSIS\n")
+        buffer.write("-" * 80 + "\n\n")
+        self.write_details(buffer, scraper, tweets)
+        return buffer.getvalue()
+
+    def write_details(self, f, scraper, tweets):
+        """Detailed per-tweet section, using the stored sentiment rows when present"""
+        rows = self.tweets if len(self.tweets) == len(tweets) else None
+        for index, tweet in enumerate(tweets, 1):
+            if rows is not None:
+                _, sentiment, signals = rows[index - 1]
+            else:
+                analysis = scraper.perform_sentiment_analysis(tweet['text'])
+                sentiment, signals = analysis['sentiment'], analysis['opportunity_signals']
+            f.write(format_tweet_detail(index, tweet, scraper.calculate_engagement_score(tweet),
+                                        scraper.extract_entities(tweet), sentiment, signals > 0))
+
+    def write_summary(self, f):
+        summary = self.summary
+        account = summary['account']
+        engagement = summary['engagement']
+        content = summary['content']
+        sentiment = summary['sentiment']
+        count = summary['tweet_count']
+        keywords = self.keywords
+        min_keyword_mentions = self.min_keyword_mentions
+
+        f.write("=" * 80 + "\n")
+        f.write(f"TWITTER LEAD GENERATION REPORT\n")
+        f.write(f"Username: @{self.username}\n")
+        f.write(f"Generated: {self.generated_at}\n")
+        if keywords:
+            f.write(f"Keywords: {', '.join(keywords)}\n")
+        f.write(f"Total Tweets Found: {count}\n")
+        f.write("=" * 80 + "\n\n")
+
+        # Account Profile Analysis
+        f.write("ACCOUNT PROFILE ANALYSIS\n")
+        f.write("-" * 80 + "\n")
+        f.write(f"Account Type: {account['type']}\n")
+        f.write(f"Lead Quality Score: {account['score']}/7\n")
+        f.write(f"Verified: {'Yes' if account['is_verified'] else 'No'}\n")
+        f.write(f"Followers: {account['follower_count']:,}\n")
+        f.write(f"Bio: {account['bio']}\n")
+        f.write(f"Location: {account['location']}\n")
+        if account.get('url'):
+            f.write(f"Website: {account['url']}\n")
+        f.write(f"\nQuality Indicators:\n")
+        for indicator in account['indicators']:
+            f.write(f"  • {indicator}\n")
+        f.write("\n")
+
+        # Engagement Summary
+        f.write("ENGAGEMENT SUMMARY\n")
+        f.write("-" * 80 + "\n")
+        f.write(f"Total Likes: {engagement['total_likes']:,}\n")
+        f.write(f"Total Retweets: {engagement['total_retweets']:,}\n")
+        f.write(f"Total Replies: {engagement['total_replies']:,}\n")
+        f.write(f"Average Likes per Tweet: {engagement['avg_likes']:.2f}\n")
+        f.write(f"Average Retweets per Tweet: {engagement['avg_retweets']:.2f}\n")
+        # p50/p90/p99 stay in the structured analytics; the text keeps its original layout
+        f.write(f"Average Engagement Score: {engagement['avg_score']:.2f}\n\n")
+
+        # Content Analysis
+        tweets_with_links = content['tweets_with_links']
+        tweets_with_mentions = content['tweets_with_mentions']
+        f.write("CONTENT ANALYSIS\n")
+        f.write("-" * 80 + "\n")
+        f.write(f"Tweets with Links: {tweets_with_links} ({tweets_with_links/count*100:.1f}%)\n")
+        f.write(f"Tweets with Mentions: {tweets_with_mentions} ({tweets_with_mentions/count*100:.1f}%)\n")
+
+        # Sentiment Analysis
+        positive_count = sentiment['Positive']
+        negative_count = sentiment['Negative']
+        neutral_count = sentiment['Neutral']
+
+        f.write(f"\nSentiment Distribution:\n")
+        f.write(f"  Positive: {positive_count} ({positive_count/count*100:.1f}%)\n")
+        f.write(f"  Neutral: {neutral_count} ({neutral_count/count*100:.1f}%)\n")
+        f.write(f"  Negative: {negative_count} ({negative_count/count*100:.1f}%)\n")
+        f.write(f"  Opportunity Signals: {sentiment['opportunities']} tweets\n\n")
+
+        # Keyword analysis with ranking and threshold
+        if keywords:
+            f.write("KEYWORD ANALYSIS\n")
+            f.write("-" * 80 + "\n")
+
+            # Ranked by count (descending)
+            keyword_counts = summary['keywords']
+
+            # Filter by minimum threshold
+            qualified_keywords = [(kw, c) for kw, c in keyword_counts if c >= min_keyword_mentions]
+
+            if qualified_keywords:
+                f.write(f"Minimum mentions threshold: {min_keyword_mentions}\n")
+                f.write(f"Qualified keywords: {len(qualified_keywords)} of {len(keywords)}\n\n")
+
+                for rank, (keyword, kw_count) in enumerate(qualified_keywords, 1):
+                    percentage = (kw_count / count) * 100
+                    f.write(f"#{rank}. '{keyword}': {kw_count} mentions ({percentage:.1f}% of tweets)\n")
+
+                # Show disqualified keywords if any
+                disqualified = [(kw, c) for kw, c in keyword_counts if c < min_keyword_mentions]
+                if disqualified:
+                    f.write(f"\nBelow threshold ({min_keyword_mentions} mentions):\n")
+                    for keyword, kw_count in disqualified:
+                        f.write(f"  '{keyword}': {kw_count} mentions\n")
+            else:
+                f.write(f"⚠️ No keywords met the minimum threshold of {min_keyword_mentions} mentions.\n")
+                f.write(f"\nAll keyword counts:\n")
+                for keyword, kw_count in keyword_counts:
+                    f.write(f"  '{keyword}': {kw_count} mentions\n")
+
+            f.write("\n")
+
+        # Top Performing Tweets (by engagement score)
+        f.write("TOP 5 PERFORMING TWEETS\n")
+        f.write("-" * 80 + "\n")
+        for i, tweet in enumerate(self.top_tweets, 1):
+            f.write(f"\n#{i} - Engagement Score: {tweet['score']}\n")
+            f.write(f"Date: {tweet['created_at']}\n")
+            f.write(f"Text: {tweet['text'][:200]}{'...' if len(tweet['text']) > 200 else ''}\n")
+            f.write(f"Likes: {tweet['likes']} | Retweets: {tweet['retweets']} | Replies: {tweet['replies']}\n")
+
+            if tweet['urls']:
+                f.write(f"Links: {', '.join(tweet['urls'][:2])}\n")
+            f.write("-" * 80 + "\n")
+
+        # Opportunity Tweets (tweets with buying signals)
+        if self.opportunity_tweets:
+            f.write("\nLEAD OPPORTUNITY TWEETS\n")
+            f.write("-" * 80 + "\n")
+            for tweet in self.opportunity_tweets:
+                f.write(f"\nDate: {tweet['created_at']}\n")
+                f.write(f"Text: {tweet['text']}\n")
+                f.write(f"Opportunity Signals: {tweet['signals']}\n")
+                f.write(f"Engagement: {tweet['likes']} likes, {tweet['replies']} replies\n")
+                f.write("-" * 80 + "\n")
+
+
+class TweetReportBuilder:
+    """
+    Incrementally builds the Twitter lead generation report
+
+    Tweets can be added a page at a time. Only running totals, the top 5
+    tweets and the first 5 opportunity tweets are held in memory; the detailed
+    per-tweet section is streamed to a spooled temp file as tweets arrive, so
+    memory stays bounded no matter how many pages are consumed.
+    """
+
+    def __init__(self, scraper, username, keywords=None, min_keyword_mentions=1, user_profile=None,
+                 spool_details=True):
+        """
+        Args:
+            scraper: TwitterScraper providing the per-tweet analysis methods
+            username: Account the report is for
+            keywords: Keywords used in the search (optional)
+            min_keyword_mentions: Threshold for the keyword ranking
+            user_profile: Account profile (taken from the first page if omitted)
+            spool_details: Write the detailed section as tweets arrive (needed by
+                write_to/render). When False, only the compact per-tweet rows of
+                result() are kept and the text is rendered later with
+                ReportAnalytics.render().
+        """
+        self.scraper = scraper
+        self.username = username
+        self.keywords = keywords
+        self.min_keyword_mentions = min_keyword_mentions
+        self.user_profile = user_profile
+
+        self.tweet_count = 0
+        self.total_likes = 0
+        self.total_retweets = 0
+        self.total_replies = 0
+        self.total_engagement_score = 0
+        self.tweets_with_links = 0
+        self.tweets_with_mentions = 0
+        self.sentiment_counts = {'Positive': 0, 'Negative': 0, 'Neutral': 0}
+        self.opportunity_count = 0
+        self.keyword_counts = {keyword: 0 for keyword in keywords} if keywords else {}
+        self._keyword_keys = [(keyword, keyword.lower()) for keyword in keywords] if keywords else []
+        # Sentiment lexicons and search keywords are found in one scan per tweet
+        self._matcher = compile_matcher(SENTIMENT_WORDS + tuple(keywords or ()))
+
+        self._score_batches = []  # Engagement score array per add_tweets call, for percentiles
+        self._top_tweets = []  # Min-heap of (score, -index, TweetAnalysis)
+        self._opportunity_tweets = []  # TweetAnalysis of the first 5 opportunity tweets
+        self._result = None
+        self._tweet_rows = None if spool_details else []  # [id, sentiment, opportunity_signals] per tweet
+        self._details = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode='w+', encoding='utf-8') \
+            if spool_details else None
+
+    def add_page(self, page):
+        """Add one page of API results (dict with 'data' and optionally 'user_profile')"""
+        if not page:
+            return
+        if self.user_profile is None and page.get('user_profile'):
+            self.user_profile = page['user_profile']
+        self.add_tweets(page.get('data', []))
+
+    def analyze(self, tweet, index, engagement=None):
+        """
+        Compute every per-tweet feature the report needs, once
+
+        Args:
+            tweet: Tweet dict from the API
+            index: 1-based position of the tweet in the report
+            engagement: Precomputed engagement breakdown (computed here if omitted)
+        """
+        scraper = self.scraper
+        hits = self._matcher.find(tweet['text'])
+        keyword_hits = [keyword for keyword, key in self._keyword_keys if key in hits] if hits else []
+        return TweetAnalysis(
+            index,
+            tweet,
+            engagement or scraper.calculate_engagement_score(tweet),
+            scraper.extract_entities(tweet),
+            scraper.perform_sentiment_analysis(tweet['text'], hits),
+            keyword_hits
+        )
+
+    def add_tweets(self, tweets):
+        """
+        Add tweets to the running analysis
+
+        The batch's metrics are loaded into arrays once: totals, engagement
+        scores and the batch's top-5 candidates are computed vectorized, and
+        the per-tweet stage only handles text features.
+        """
+        if not tweets:
+            return
+        metrics = analytics.tweet_metrics(tweets)
+        scores = analytics.engagement_scores(metrics)
+        totals = analytics.metric_totals(metrics)
+        self.total_likes += totals['like_count']
+        self.total_retweets += totals['retweet_count']
+        self.total_replies += totals['reply_count']
+        self.total_engagement_score += int(scores.sum())
+        self._score_batches.append(scores)
+
+        # Only the batch's own top 5 can enter the report's top 5
+        top_candidates = set(analytics.top_k(scores, 5).tolist())
+        labels = []
+        for position, (tweet, (likes, retweets, replies, quotes), score) in enumerate(
+                zip(tweets, metrics.tolist(), scores.tolist())):
+            self.tweet_count += 1
+            engagement = {'score': score, 'likes': likes, 'retweets': retweets, 'replies': replies, 'quotes': quotes}
+            analysis = self.analyze(tweet, self.tweet_count, engagement)
+            labels.append(analysis.sentiment['sentiment'])
+            self._aggregate(analysis)
+            if position in top_candidates:
+                self._offer_top(analysis)
+            if self._details is not None:
+                self._write_detail(analysis)
+            else:
+                self._tweet_rows.append([tweet.get('id'), analysis.sentiment['sentiment'],
+                                         analysis.sentiment['opportunity_signals']])
+
+        for sentiment, count in analytics.label_counts(labels, tuple(self.sentiment_counts)).items():
+            self.sentiment_counts[sentiment] += count
+
+    def _aggregate(self, analysis):
+        entities = analysis.entities
+        sentiment = analysis.sentiment
+
+        if entities['has_links']:
+            self.tweets_with_links += 1
+        if entities['has_mentions']:
+            self.tweets_with_mentions += 1
+
+        if sentiment['is_opportunity']:
+            self.opportunity_count += 1
+            if len(self._opportunity_tweets) < 5:
+                self._opportunity_tweets.append(analysis)
+
+        for keyword in analysis.keyword_hits:
+            self.keyword_counts[keyword] += 1
+
+    def _offer_top(self, analysis):
+        """Keep the 5 highest scores; earlier tweets win ties (stable sort order)"""
+        entry = (analysis.engagement['score'], -analysis.index, analysis)
+        if len(self._top_tweets) < 5:
+            heapq.heappush(self._top_tweets, entry)
+        elif entry[:2] > self._top_tweets[0][:2]:
+            heapq.heapreplace(self._top_tweets, entry)
+
+    def _write_detail(self, analysis):
+        """Detailed tweet section, written in one call"""
+        sentiment = analysis.sentiment
+        self._details.write(format_tweet_detail(analysis.index, analysis.tweet, analysis.engagement,
+                                                analysis.entities, sentiment['sentiment'],
+                                                sentiment['is_opportunity']))
+
+    def result(self):
+        """
+        The structured analytics result of the tweets added so far
+
+        Returns:
+            ReportAnalytics, or None if nothing was added
+        """
+        if self.tweet_count == 0:
+            return None
+        if self._result is not None and self._result.summary['tweet_count'] == self.tweet_count:
+            return self._result
+
+        user_profile = self.user_profile or {}
+        account_analysis = self.scraper.analyze_account_type(user_profile)
+        count = self.tweet_count
+        score_summary = analytics.summarize(np.concatenate(self._score_batches))
+
+        # Ranked by count (descending); ties keep the search keyword order
+        keyword_ranking = [[keyword, self.keyword_counts[keyword]] for keyword in self.keywords or ()]
+        keyword_ranking.sort(key=lambda entry: entry[1], reverse=True)
+
+        summary = {
+            'tweet_count': count,
+            'account': dict(
+                account_analysis,
+                bio=user_profile.get('description', 'N/A'),
+                location=user_profile.get('location', 'N/A'),
+                url=user_profile.get('url')
+            ),
+            'engagement': {
+                'total_likes': self.total_likes,
+                'total_retweets': self.total_retweets,
+                'total_replies': self.total_replies,
+                'total_score': self.total_engagement_score,
+                'avg_likes': self.total_likes / count,
+                'avg_retweets': self.total_retweets / count,
+                'avg_score': self.total_engagement_score / count,
+                'p50': score_summary['p50'],
+                'p90': score_summary['p90'],
+                'p99': score_summary['p99']
+            },
+            'content': {
+                'tweets_with_links': self.tweets_with_links,
+                'tweets_with_mentions': self.tweets_with_mentions
+            },
+            'sentiment': dict(self.sentiment_counts, opportunities=self.opportunity_count),
+            'keywords': keyword_ranking
+        }
+
+        top_tweets = []
+        for _, _, analysis in sorted(self._top_tweets, key=lambda entry: entry[:2], reverse=True):
+            tweet = analysis.tweet
+            top_tweets.append(dict(
+                analysis.engagement,
+                id=tweet.get('id'),
+                index=analysis.index,
+                created_at=tweet.get('created_at', 'N/A'),
+                text=tweet['text'],
+                urls=analysis.entities['urls']
+            ))
+        opportunity_tweets = [
+            {
+                'id': analysis.tweet.get('id'),
+                'index': analysis.index,
+                'created_at': analysis.tweet.get('created_at', 'N/A'),
+                'text': analysis.tweet['text'],
+                'signals': analysis.sentiment['opportunity_signals'],
+                'likes': analysis.engagement['likes'],
+                'replies': analysis.engagement['replies']
+            }
+            for analysis in self._opportunity_tweets
+        ]
+
+        self._result = ReportAnalytics(
+            self.username,
+            datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            self.keywords,
+            self.min_keyword_mentions,
+            summary,
+            top_tweets,
+            opportunity_tweets,
+            self._tweet_rows
+        )
+        return self._result
+
+    def write_to(self, stream):
+        """
+        Write the finished report into a text stream (open file, StringIO, ...)
+
+        Args:
+            stream: Writable text stream
+
+        Returns:
+            Number of tweets in the report (0 if nothing was added; nothing is written then)
+        """
+        if self._details is None:
+            raise ValueError("Built with spool_details=False: render with result().render()")
+        if self.tweet_count == 0:
+            self._details.close()
+            return 0
+
+        self.result().write_summary(stream)
+        stream.write("\n\nDETAILED TWEET ANALYSIS\n")
+        stream.write("-" * 80 + "\n\n")
+        self._details.seek(0)
+        shutil.copyfileobj(self._details, stream)
+        self._details.close()
+        return self.tweet_count
+
+    def render(self):
+        """
+        Render the finished report in memory
+
+        Returns:
+            Report text, or "No tweets found." if nothing was added
+        """
+        buffer = io.StringIO()
+        if not self.write_to(buffer):
+            return "No tweets found."
+        return buffer.getvalue()
+
+    def write(self, filename=None):
+        """
+        Write the finished report to disk
+
+        Args:
+            filename: Output path (defaults to default_report_path('twitter', username))
+
+        Returns:
+            Path of the written report, or "No tweets found." if nothing was added
+        """
+        if self.tweet_count == 0:
+            self.write_to(io.StringIO())
+            return "No tweets found."
+
+        if filename is None:
+            filename = default_report_path('twitter', self.username)
+
+        with open(filename, 'w', encoding='utf-8') as f:
+            self.write_to(f)
+
+        print(f"Report saved to: {filename}")
+        return filename
@@ -0,0 +1,145 @@
+import math
+import os
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from twitter_scraper import TweetAnalyzer
+
+
+def _cgroup_cpu_quota():
+    """CPU limit set by the container's cgroup (e.g. 1.5), or None if there is none"""
+    # cgroup v2: "<quota> <period>" or "max <period>"
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()[:2]
+        return None if quota == 'max' else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    # cgroup v1: a quota of -1 means unlimited
+    try:
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:
+            quota = int(f.read())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+            period = int(f.read())
+        return quota / period if quota > 0 and period > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def available_cpus():
+    """CPUs this process can actually use: its affinity mask, capped by the cgroup CPU quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    if quota:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return cpus
+
+
+def _default_workers():
+    configured = os.getenv('REPORT_WORKERS')
+    if configured:
+        return max(0, int(configured))
+    # A single CPU gains nothing from a second process, only pickling overhead
+    cpus = available_cpus()
+    return cpus if cpus > 1 else 0
+
+
+# Worker processes building reports for bulk scrapes and cron batches
+# (defaults to the container's usable CPUs; 0 builds reports in-process)
+DEFAULT_REPORT_WORKERS = _default_workers()
+
+
+def build_report(tweets_data, username, keywords=None, min_keyword_mentions=1):
+    """
+    Analyze one account's tweets and render its report text
+
+    Runs in the worker processes, so it needs no TwitterScraper (or bearer
+    token): the analysis methods come from a bare TweetAnalyzer.
+
+    Args:
+        tweets_data: Search result dict (full API dicts or compact TweetRecords)
+        username, keywords, min_keyword_mentions: Same as generate_report_analytics
+
+    Returns:
+        (ReportAnalytics, report text), or None if there are no tweets
+    """
+    analyzer = TweetAnalyzer()
+    report_analytics = analyzer.generate_report_analytics(tweets_data, username, keywords, min_keyword_mentions)
+    if report_analytics is None:
+        return None
+    return report_analytics, analyzer.render_report(report_analytics, tweets_data)
+
+
+class _InlineReport:
+    """Stand-in future used without workers: the report is built when result() is called"""
+    __slots__ = ('args',)
+
+    def __init__(self, *args):
+        self.args = args
+
+    def result(self, timeout=None):
+        return build_report(*self.args)
+
+
+class ReportPool:
+    """
+    Process pool that builds reports off the GIL
+
+    Report analysis and rendering are CPU-bound pure Python, so building many
+    reports in the web process serializes them with everything else. Fetched
+    results are submitted as they arrive and built in worker processes while
+    the main process keeps fetching and saving.
+
+    Workers are started with the 'spawn' method (forking a process that runs
+    the scheduler and HTTP pool threads is unsafe) on the first submit and are
+    reused for every later batch.
+    """
+
+    def __init__(self, workers=DEFAULT_REPORT_WORKERS):
+        """
+        Args:
+            workers: Number of worker processes (0 builds reports in the calling process)
+        """
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                print(f"[REPORT_POOL] Started {self.workers} report worker process(es)")
+            return self._executor
+
+    def submit(self, tweets_data, username, keywords=None, min_keyword_mentions=1):
+        """
+        Queue one account's report
+
+        Returns:
+            Future-like object whose result() is build_report()'s return value
+        """
+        args = (tweets_data, username, keywords, min_keyword_mentions)
+        if not self.workers:
+            return _InlineReport(*args)
+        try:
+            return self._get_executor().submit(build_report, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); replace the pool and carry on
+            print("[REPORT_POOL] Worker pool broken, restarting it")
+            self.close()
+            return self._get_executor().submit(build_report, *args)
+
+    def close(self):
+        """Shut down the worker processes (a later submit starts new ones)"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
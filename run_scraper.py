@@ -1,16 +1,24 @@
-import sys
+import os
+import json
+import argparse
 from twitter_scraper import TwitterScraper
+from report_builder import default_report_path
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python run_scraper.py <username> [keyword1,keyword2,...]")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        usage="python run_scraper.py <username> [keyword1,keyword2,...] [--max-total N] [--time-budget SECONDS]"
+    )
+    parser.add_argument('username')
+    parser.add_argument('keywords', nargs='?')
+    parser.add_argument('--max-total', type=int, help="Follow pagination up to this many tweets")
+    parser.add_argument('--time-budget', type=float, help="Stop paginating after this many seconds")
+    args = parser.parse_args()
     
-    username = sys.argv[1]
+    username = args.username
     keywords = None
     
-    if len(sys.argv) > 2:
-        keywords = [k.strip() for k in sys.argv[2].split(",")]
+    if args.keywords:
+        keywords = [k.strip() for k in args.keywords.split(",")]
     
     scraper = TwitterScraper()
     
@@ -18,19 +26,51 @@ def main():
     if keywords:
         print(f"Filtering by keywords: {', '.join(keywords)}")
     
+    if args.max_total or args.time_budget:
+        run_paginated(scraper, username, keywords, args.max_total, args.time_budget)
+        return
+    
     tweets_data = scraper.search_user_tweets(username, keywords=keywords, max_results=100)
     
-    if tweets_data:
-        report_file = scraper.generate_report(tweets_data, username, keywords)
+    if tweets_data and 'data' in tweets_data:
+        report_file = default_report_path('twitter', username)
+        with open(report_file, 'w', encoding='utf-8') as f:
+            scraper.generate_report(tweets_data, username, keywords, stream=f)
         print(f"\n✓ Analysis complete! Report saved to: {report_file}")
         
         json_file = report_file.replace('.txt', '.json')
-        import json
         with open(json_file, 'w', encoding='utf-8') as f:
             json.dump(tweets_data, f, indent=2)
         print(f"✓ Raw data saved to: {json_file}")
     else:
         print("No tweets found or error occurred.")
 
+def run_paginated(scraper, username, keywords, max_total, time_budget):
+    """Stream pages into the report and a JSON Lines dump without holding them all in memory"""
+    pages = scraper.iter_user_tweet_pages(username, keywords=keywords, max_total=max_total, time_budget=time_budget)
+    page_count = 0
+    
+    def dump_pages(out):
+        nonlocal page_count
+        for page in pages:
+            out.write(json.dumps(page) + "\n")
+            page_count += 1
+            print(f"  Page {page_count}: {len(page['data'])} tweets")
+            yield page
+    
+    report_file = default_report_path('twitter', username)
+    # Same timestamp as the report: reports/twitter_raw_<username>_<timestamp>.jsonl
+    raw_file = report_file.replace('_report_', '_raw_', 1).replace('.txt', '.jsonl')
+    with open(raw_file, 'w', encoding='utf-8') as out, open(report_file, 'w', encoding='utf-8') as f:
+        scraper.generate_report_from_pages(dump_pages(out), username, keywords, stream=f)
+    
+    if page_count:
+        print(f"\n✓ Analysis complete! Report saved to: {report_file}")
+        print(f"✓ Raw pages saved to: {raw_file}")
+    else:
+        os.remove(raw_file)
+        os.remove(report_file)
+        print("No tweets found or error occurred.")
+
 if __name__ == "__main__":
     main()
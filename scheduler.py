@@ -7,8 +7,8 @@ from twitter_scraper import TwitterScraper
 from threading import Thread
 
 class ScheduledScraper:
-    def __init__(self):
-        self.scraper = TwitterScraper()
+    def __init__(self, scraper=None):
+        self.scraper = scraper or TwitterScraper()
         self.schedules = []
         self.load_schedules()
     
@@ -51,22 +51,23 @@ class ScheduledScraper:
     def run_scrape(self, schedule_config):
         """Execute a scheduled scrape"""
         try:
-            from database import get_db_session, Schedule as DBSchedule, HistoricalTweet, Report, save_to_deep_history
+            from database import get_db_session, Schedule as DBSchedule, HistoricalTweet, Report, save_to_deep_history, get_since_id, update_watermark
             
             username = schedule_config['username']
             keywords = schedule_config.get('keywords')
             frequency = schedule_config.get('frequency')
             
+            # Only fetch tweets newer than the last run
+            since_id = get_since_id(username, keywords, schedule_id=schedule_config['id'])
+            
             print(f"Running scheduled scrape for @{username}...")
-            tweets_data = self.scraper.search_user_tweets(username, keywords=keywords, max_results=100)
+            tweets_data = self.scraper.search_user_tweets(username, keywords=keywords, max_results=100, since_id=since_id)
             
             if tweets_data and 'data' in tweets_data:
-                # Generate report file
-                report_file = self.scraper.generate_report(tweets_data, username, keywords)
-                
-                # Read report content
-                with open(report_file, 'r', encoding='utf-8') as f:
-                    report_content = f.read()
+                # Generate report (rendered in memory, stored in the database)
+                report_analytics = self.scraper.generate_report_analytics(tweets_data, username, keywords)
+                # Text for the response and deep_history; the report row stores only the analytics
+                report_content = self.scraper.render_report(report_analytics, tweets_data)
                 
                 # Get account analysis
                 user_profile = tweets_data.get('user_profile', {})
@@ -86,8 +87,9 @@ class ScheduledScraper:
                         tweet_count=len(tweets_data['data']),
                         account_type=account_analysis.get('type'),
                         lead_score=account_analysis.get('score'),
-                        report_content=report_content,
                         tweets_data=tweets_data,
+                        analytics=report_analytics.to_dict(),
+                        summary=report_analytics.summary,
                         filters={}
                     )
                     db.add(db_report)
@@ -145,9 +147,15 @@ class ScheduledScraper:
                                     s['next_run'] = next_run.isoformat() if next_run else None
                     
                     db.commit()
-                    print(f"✓ Scheduled scrape completed and saved to database: {report_file}")
+                    update_watermark(username, self.scraper.newest_tweet_id(tweets_data), keywords,
+                                     schedule_id=schedule_config['id'])
+                    print(f"✓ Scheduled scrape completed and saved to database: report {report_id}")
                 finally:
                     db.close()
+            elif tweets_data is None:
+                print(f"✗ Could not fetch tweets for @{username} (unknown user or API error)")
+            elif since_id:
+                print(f"✓ No new tweets for @{username} since last run")
             else:
                 print(f"✗ No tweets found for @{username}")
         
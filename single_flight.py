@@ -0,0 +1,75 @@
+import threading
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapse concurrent identical calls into one
+
+    The first caller for a key runs the function; callers arriving with the
+    same key while it is in flight wait and get the same result (or exception)
+    instead of making their own call. Nothing is cached once the call returns.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.collapsed = 0
+
+    def do(self, key, func):
+        """
+        Run func() for key, or join an identical call already in flight
+
+        Args:
+            key: Hashable identity of the call
+            func: Zero-argument callable doing the work
+
+        Returns:
+            func()'s result, shared with every caller that joined the flight
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.collapsed += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        """Collapse counters for /health"""
+        with self._lock:
+            total = self.executed + self.collapsed
+            return {
+                'executed': self.executed,
+                'collapsed': self.collapsed,
+                'in_flight': len(self._calls),
+                'collapse_rate': round(self.collapsed / total, 3) if total else None
+            }
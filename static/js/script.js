@@ -1,5 +1,26 @@
 let currentReportContent = '';
 
+// Scrapes run as background jobs: poll /jobs/<id> until the job finishes.
+// onProgress (optional) is called with the job on every poll.
+async function pollJob(jobId, onProgress, intervalMs = 1500) {
+    while (true) {
+        const response = await fetch(`/jobs/${jobId}`);
+        const data = await response.json();
+        if (!response.ok) {
+            throw new Error(data.error || 'Job not found');
+        }
+        
+        const job = data.job;
+        if (onProgress) {
+            onProgress(job);
+        }
+        if (job.status === 'succeeded' || job.status === 'failed') {
+            return job;
+        }
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+}
+
 document.getElementById('scrapeForm').addEventListener('submit', async (e) => {
     e.preventDefault();
     
@@ -50,9 +71,17 @@ document.getElementById('scrapeForm').addEventListener('submit', async (e) => {
             })
         });
         
-        const data = await response.json();
+        const queued = await response.json();
         
-        if (response.ok) {
+        if (!response.ok) {
+            throw new Error(queued.error);
+        }
+        
+        const job = await pollJob(queued.job_id);
+        
+        if (job.status === 'succeeded') {
+            const data = job.result;
+            
             // Store report content
             currentReportContent = data.report_content;
             
@@ -70,8 +99,8 @@ document.getElementById('scrapeForm').addEventListener('submit', async (e) => {
             
             document.getElementById('resultMessage').textContent = message;
             
-            document.getElementById('downloadTxt').href = `/download/${data.report_file}`;
-            document.getElementById('downloadJson').href = `/download/${data.json_file}`;
+            document.getElementById('downloadTxt').href = `/reports/${data.report_id}/download/txt`;
+            document.getElementById('downloadJson').href = `/reports/${data.report_id}/download/json`;
             
             resultsDiv.style.display = 'block';
             
@@ -80,12 +109,12 @@ document.getElementById('scrapeForm').addEventListener('submit', async (e) => {
             console.log('View Report button found:', viewBtn !== null);
         } else {
             // Show error
-            document.getElementById('errorMessage').textContent = data.error;
+            document.getElementById('errorMessage').textContent = job.error;
             errorDiv.style.display = 'block';
         }
     } catch (error) {
         document.getElementById('errorMessage').textContent = 
-            'Network error. Please check your connection and try again.';
+            error.message || 'Network error. Please check your connection and try again.';
         errorDiv.style.display = 'block';
     } finally {
         // Reset button
@@ -798,8 +827,8 @@ document.getElementById('redditForm').addEventListener('submit', async (e) => {
             let message = `Found ${data.post_count} posts from r/${subreddit}`;
             
             document.getElementById('redditResultMessage').textContent = message;
-            document.getElementById('redditDownloadTxt').href = `/download/${data.report_file}`;
-            document.getElementById('redditDownloadJson').href = `/download/${data.json_file}`;
+            document.getElementById('redditDownloadTxt').href = `/reports/${data.report_id}/download/txt`;
+            document.getElementById('redditDownloadJson').href = `/reports/${data.report_id}/download/json`;
             
             resultsDiv.style.display = 'block';
         } else {
@@ -869,6 +898,7 @@ document.getElementById('discoverForm').addEventListener('submit', async (e) =>
     e.preventDefault();
     
     const maxResults = document.getElementById('discover-max-results').value;
+    const targetAccounts = parseInt(document.getElementById('discover-target-accounts').value) || 0;
     
     // Collect filters
     const filters = {
@@ -941,13 +971,44 @@ document.getElementById('discoverForm').addEventListener('submit', async (e) =>
                 throw new Error('Keywords are required');
             }
             
-            response = await fetch('/discover-accounts', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ keywords, max_results: parseInt(maxResults), filters })
-            });
-            
-            data = await response.json();
+            if (targetAccounts > 0) {
+                // Multi-page discovery: show accounts as each page comes in
+                response = await fetch('/discover-accounts', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ keywords, max_results: parseInt(maxResults), filters, target_accounts: targetAccounts, stream: true })
+                });
+                
+                if (response.ok) {
+                    const streamed = [];
+                    data = await readDiscoveryStream(response, (event) => {
+                        streamed.push(...event.accounts);
+                        allAccounts = streamed;
+                        filteredAccounts = streamed;
+                        discoveredAccounts = streamed;
+                        displayDiscoveredAccounts(streamed);
+                        updatePagination();
+                        document.getElementById('accounts-count').textContent = 
+                            `${streamed.length} account${streamed.length !== 1 ? 's' : ''} found so far (${event.tweets_searched} tweets searched)...`;
+                        resultsDiv.style.display = 'block';
+                    });
+                    
+                    if (data.total_accounts === 0) {
+                        response = { ok: false };
+                        data = { error: 'No accounts found' };
+                    }
+                } else {
+                    data = await response.json();
+                }
+            } else {
+                response = await fetch('/discover-accounts', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ keywords, max_results: parseInt(maxResults), filters })
+                });
+                
+                data = await response.json();
+            }
         }
         
         if (response.ok) {
@@ -979,6 +1040,44 @@ document.getElementById('discoverForm').addEventListener('submit', async (e) =>
     }
 });
 
+// Read an NDJSON discovery stream, calling onPage for each page of new accounts.
+// Resolves with the final 'done' event (all accounts, best first).
+async function readDiscoveryStream(response, onPage) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let done = null;
+    
+    while (true) {
+        const { value, done: finished } = await reader.read();
+        if (value) {
+            buffer += decoder.decode(value, { stream: true });
+        }
+        
+        const lines = buffer.split('\n');
+        buffer = finished ? '' : lines.pop();
+        
+        for (const line of lines) {
+            if (!line.trim()) continue;
+            const event = JSON.parse(line);
+            if (event.type === 'error') {
+                throw new Error(event.error);
+            } else if (event.type === 'page') {
+                if (event.accounts.length > 0) onPage(event);
+            } else if (event.type === 'done') {
+                done = event;
+            }
+        }
+        
+        if (finished) break;
+    }
+    
+    if (!done) {
+        throw new Error('Discovery stream ended unexpectedly');
+    }
+    return done;
+}
+
 function displayDiscoveredAccounts(accounts) {
     const container = document.getElementById('accounts-container');
     
@@ -1241,21 +1340,31 @@ document.getElementById('bulk-scrape-btn').addEventListener('click', async () =>
             })
         });
         
-        const data = await response.json();
+        const queued = await response.json();
         
         if (response.ok) {
+            // Show per-account progress while the job runs
+            const job = await pollJob(queued.job_id, (job) => {
+                progressDetails.innerHTML = `<p>Scraped ${job.progress.completed} of ${job.progress.total} accounts...</p>`;
+            });
+            
             progressDiv.style.display = 'none';
             
+            if (job.status === 'failed') {
+                alert('Error: ' + job.error);
+                return;
+            }
+            
             // Show results
             document.getElementById('bulk-results-message').textContent = 
-                `Successfully scraped ${data.successful} of ${data.total_processed} accounts`;
+                `Successfully scraped ${job.result.successful} of ${job.result.total_processed} accounts`;
             
             let detailsHTML = '<div style="margin-top: 15px;">';
             
             // Successful scrapes
-            if (data.results.length > 0) {
+            if (job.results.length > 0) {
                 detailsHTML += '<h4 style="color: #4caf50;">✓ Successful:</h4>';
-                data.results.forEach(result => {
+                job.results.forEach(result => {
                     detailsHTML += `
                         <div class="bulk-progress-item success">
                             <strong>@${result.username}</strong>: ${result.tweet_count} tweets
@@ -1267,9 +1376,9 @@ document.getElementById('bulk-scrape-btn').addEventListener('click', async () =>
             }
             
             // Errors
-            if (data.errors.length > 0) {
+            if (job.errors.length > 0) {
                 detailsHTML += '<h4 style="color: #f44336; margin-top: 15px;">✗ Failed:</h4>';
-                data.errors.forEach(error => {
+                job.errors.forEach(error => {
                     detailsHTML += `
                         <div class="bulk-progress-item error">
                             <strong>@${error.username}</strong>: ${error.error}
@@ -1293,7 +1402,7 @@ document.getElementById('bulk-scrape-btn').addEventListener('click', async () =>
             });
         } else {
             progressDiv.style.display = 'none';
-            alert('Error: ' + data.error);
+            alert('Error: ' + queued.error);
         }
     } catch (error) {
         progressDiv.style.display = 'none';
@@ -0,0 +1,112 @@
+"""
+Coalesced searches must give each account the tweets a solo search would
+
+Runs against the mock X API in benchmarks/mock_x_api.py; no credentials or
+network access needed.
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('TWITTER_BEARER_TOKEN', 'test-token')
+
+from async_scraper import AsyncTwitterScraper
+from benchmarks.mock_x_api import MockXAPI, snowflake_id
+from twitter_scraper import TwitterScraper
+
+
+def make_user(index, username):
+    return {
+        'id': str(10_000_000 + index),
+        'username': username,
+        'name': username.title(),
+        'description': '',
+        'public_metrics': {'followers_count': 100, 'following_count': 10, 'tweet_count': 500}
+    }
+
+
+def make_tweets(user, count, newest, spacing):
+    tweets = []
+    for n in range(count):
+        created_at = newest - n * spacing
+        tweets.append({
+            'id': snowflake_id(created_at, int(user['id']) % 1000 * 1000 + n),
+            'author_id': user['id'],
+            'text': f"thoughts on ai number {n}",
+            'created_at': created_at.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+            'public_metrics': {'like_count': 1, 'retweet_count': 0, 'reply_count': 0, 'quote_count': 0}
+        })
+    return tweets
+
+
+@pytest.fixture
+def busy_and_quiet_api():
+    """A busy account (400 tweets in the last day) and a quiet one (20 tweets, 3 days old)"""
+    now = datetime.now(timezone.utc)
+    busy, quiet = make_user(1, 'busyaccount'), make_user(2, 'quietaccount')
+    fixtures = {
+        'users': [busy, quiet],
+        'tweets': (make_tweets(busy, 400, now - timedelta(minutes=5), timedelta(minutes=3))
+                   + make_tweets(quiet, 20, now - timedelta(days=3), timedelta(minutes=10)))
+    }
+    api = MockXAPI(fixtures, rate_limit=None).start()
+    yield api
+    api.stop()
+
+
+def tweet_ids(tweets_data):
+    return [tweet['id'] for tweet in (tweets_data or {}).get('data', [])]
+
+
+def test_quiet_account_is_not_starved_by_busy_one(busy_and_quiet_api):
+    scraper = TwitterScraper(base_url=busy_and_quiet_api.base_url, max_retries=0)
+    solo = {username: scraper.search_user_tweets(username, keywords=['ai'], max_results=100)
+            for username in ('busyaccount', 'quietaccount')}
+    assert len(tweet_ids(solo['busyaccount'])) == 100
+    assert len(tweet_ids(solo['quietaccount'])) == 20
+
+    async_scraper = AsyncTwitterScraper(TwitterScraper(base_url=busy_and_quiet_api.base_url, max_retries=0))
+    try:
+        coalesced = async_scraper.run_search_many(['busyaccount', 'quietaccount'], keywords=['ai'],
+                                                  max_results=100, coalesce=True)
+    finally:
+        async_scraper.close()
+
+    for username in ('busyaccount', 'quietaccount'):
+        assert tweet_ids(coalesced[username]) == tweet_ids(solo[username])
+
+
+def test_group_search_spends_no_more_requests_than_solo_searches(busy_and_quiet_api):
+    scraper = TwitterScraper(base_url=busy_and_quiet_api.base_url, max_retries=0)
+    scraper.get_user_infos(['busyaccount', 'quietaccount'])
+    before = busy_and_quiet_api.stats()['requests'].get('tweets/search/recent', 0)
+
+    results = scraper.search_user_group(['busyaccount', 'quietaccount'], keywords=['ai'], max_results=100)
+
+    assert len(tweet_ids(results['quietaccount'])) == 20
+    assert busy_and_quiet_api.stats()['requests']['tweets/search/recent'] - before <= 2
+
+
+def test_default_search_many_matches_sync_searches(busy_and_quiet_api):
+    scraper = TwitterScraper(base_url=busy_and_quiet_api.base_url, max_retries=0)
+    solo = scraper.search_user_tweets('busyaccount', keywords=['ai'], max_results=100)
+    newer = scraper.search_user_tweets('busyaccount', keywords=['ai'], max_results=100,
+                                       since_id=solo['data'][10]['id'])
+
+    async_scraper = AsyncTwitterScraper(TwitterScraper(base_url=busy_and_quiet_api.base_url, max_retries=0))
+    try:
+        results = async_scraper.run_search_many(['busyaccount'], keywords=['ai'], max_results=100)
+        resumed = async_scraper.run_search_many(['busyaccount'], keywords=['ai'], max_results=100,
+                                                since_ids={'busyaccount': solo['data'][10]['id']})
+        direct = asyncio.run(async_scraper.search_user_tweets('busyaccount', keywords=['ai'], max_results=100,
+                                                              since_id=solo['data'][10]['id']))
+    finally:
+        async_scraper.close()
+
+    assert results['busyaccount'] == solo
+    assert tweet_ids(resumed['busyaccount']) == tweet_ids(newer) == tweet_ids(solo)[:10]
+    assert tweet_ids(direct) == tweet_ids(newer)
@@ -0,0 +1,50 @@
+"""
+CorpusFeed must publish every distinct tweet once, whatever order it arrives in
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('TWITTER_BEARER_TOKEN', 'test-token')
+
+from corpus_feed import CorpusFeed
+
+
+def tweet(tweet_id, text='hello world'):
+    return {'id': str(tweet_id), 'text': text}
+
+
+def subscribed_feed(**kwargs):
+    feed = CorpusFeed(persist=False, **kwargs)
+    published = []
+    feed.subscribe(lambda tweets, accounts: published.extend(int(t['id']) for t in tweets))
+    return feed, published
+
+
+def test_older_tweet_arriving_after_newer_one_is_counted():
+    feed, published = subscribed_feed()
+    feed.add([tweet(500), tweet(400)], username='someone')
+    # A keyword-filtered scrape of the same account turns up older tweets
+    feed.add([tweet(450), tweet(100)], username='someone')
+
+    assert published == [500, 400, 450, 100]
+    assert feed.stats()['tweets'] == 4
+
+
+def test_repeats_are_dropped_per_author():
+    feed, published = subscribed_feed()
+    feed.add([tweet(500), tweet(400)], username='someone')
+    feed.add([tweet(500), tweet(300)], username='Someone')
+    feed.add([tweet(500)], username='someoneelse')
+
+    assert published == [500, 400, 300, 500]
+    assert feed.stats()['accounts'] == 2
+
+
+def test_seen_ids_are_bounded_per_author():
+    feed, published = subscribed_feed(seen_per_account=2)
+    feed.add([tweet(1), tweet(2), tweet(3)], username='someone')
+    feed.add([tweet(3), tweet(1)], username='someone')
+
+    # 1 was forgotten to make room for 3, so it is published again
+    assert published == [1, 2, 3, 1]
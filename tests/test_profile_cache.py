@@ -0,0 +1,62 @@
+"""
+ProfileCache must read user_profiles at most once per memory miss
+"""
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('TWITTER_BEARER_TOKEN', 'test-token')
+
+import database
+from profile_cache import ProfileCache
+
+
+def counting_reads(monkeypatch, stored):
+    reads = []
+
+    def get_cached_profile(username, max_age_seconds):
+        reads.append(username)
+        return (stored[username], datetime.utcnow()) if username in stored else None
+
+    monkeypatch.setattr(database, 'get_cached_profile', get_cached_profile)
+    monkeypatch.setattr(database, 'save_cached_profiles', lambda profiles: None)
+    return reads
+
+
+def test_stored_profile_is_read_once(monkeypatch):
+    reads = counting_reads(monkeypatch, {'stored': {'id': '1', 'username': 'stored'}})
+    cache = ProfileCache(persist=True)
+
+    for _ in range(3):
+        assert cache.get('Stored') == {'id': '1', 'username': 'stored'}
+
+    assert reads == ['stored']
+    stats = cache.stats()
+    assert (stats['db_hits'], stats['hits'], stats['misses']) == (1, 2, 0)
+
+
+def test_absent_profile_is_read_once_until_set(monkeypatch):
+    reads = counting_reads(monkeypatch, {})
+    cache = ProfileCache(persist=True)
+
+    assert cache.get('newaccount') is None
+    assert cache.get('newaccount') is None
+    assert reads == ['newaccount']
+    assert cache.stats()['db_reads'] == 1
+
+    cache.set('newaccount', {'id': '2'})
+    assert cache.get('newaccount') == {'id': '2'}
+    assert reads == ['newaccount']
+
+
+def test_unresolvable_handle_skips_the_database(monkeypatch):
+    reads = counting_reads(monkeypatch, {})
+    cache = ProfileCache(persist=True)
+    cache.set_missing(['ghost'])
+
+    assert cache.get('ghost') is None
+    assert cache.is_missing('ghost')
+    assert reads == []
+    stats = cache.stats()
+    assert (stats['misses'], stats['negative_hits']) == (0, 1)
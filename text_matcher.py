@@ -0,0 +1,87 @@
+from functools import lru_cache
+from operator import itemgetter
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Distinct keyword/lexicon sets whose compiled matchers are kept
+MATCHER_CACHE_SIZE = 256
+# Pattern sets at least this large are scanned with an Aho-Corasick automaton.
+# Below it, CPython's `in` is faster than any one-pass scan (benchmarks/bench_text_matcher.py).
+AUTOMATON_MIN_PATTERNS = 12
+
+# Name of the multi-pattern backend ('ahocorasick' when installed, else 'scan')
+BACKEND = 'ahocorasick' if ahocorasick is not None else 'scan'
+
+_second = itemgetter(1)
+
+
+class PatternMatcher:
+    """
+    Case-insensitive substring matcher for a fixed set of literal patterns
+
+    Matches exactly like `pattern.lower() in text.lower()` for every pattern,
+    but lowercases the text once per call. Large pattern sets (sentiment
+    lexicons) are found in a single pass with an Aho-Corasick automaton, which
+    reports overlapping and nested hits too; small sets (a handful of search
+    keywords) use plain `in` scans, which are faster at that size.
+
+    Build through compile_matcher() so each pattern set is compiled once.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = tuple(patterns)
+        keys = list(dict.fromkeys(pattern.lower() for pattern in self.patterns))
+        # '' is a substring of everything
+        self._always = frozenset({''}) if '' in keys else frozenset()
+        self._keys = tuple(key for key in keys if key)
+
+        self._automaton = None
+        if ahocorasick is not None and len(self._keys) >= AUTOMATON_MIN_PATTERNS:
+            automaton = ahocorasick.Automaton()
+            for key in self._keys:
+                automaton.add_word(key, key)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def find(self, text):
+        """Set of lowercased patterns that occur in text"""
+        text_lower = (text or '').lower()
+        # map/filter keep the per-hit work in C
+        if self._automaton is not None:
+            hits = set(map(_second, self._automaton.iter(text_lower)))
+        else:
+            hits = set(filter(text_lower.__contains__, self._keys))
+        if self._always:
+            hits |= self._always
+        return hits
+
+    def contains_any(self, text):
+        """True if any pattern occurs in text"""
+        if self._always:
+            return True
+        text_lower = (text or '').lower()
+        if self._automaton is not None:
+            return next(self._automaton.iter(text_lower), None) is not None
+        for key in self._keys:
+            if key in text_lower:
+                return True
+        return False
+
+    def matched(self, text):
+        """Patterns that occur in text, in pattern order (original spelling)"""
+        hits = self.find(text)
+        return [pattern for pattern in self.patterns if pattern.lower() in hits]
+
+
+@lru_cache(maxsize=MATCHER_CACHE_SIZE)
+def compile_matcher(patterns):
+    """
+    Cached PatternMatcher for a tuple of patterns
+
+    Args:
+        patterns: Tuple of literal strings (a tuple so it can be cached)
+    """
+    return PatternMatcher(patterns)
@@ -0,0 +1,182 @@
+import os
+
+import fast_json
+
+# Hold bulk-scrape results as TweetRecords instead of full API dicts ('0' to disable)
+COMPACT_TWEETS = os.getenv('COMPACT_TWEETS', '1') != '0'
+
+_METRIC_FIELDS = ('like_count', 'retweet_count', 'reply_count', 'quote_count')
+_MISSING = object()
+
+
+class TweetRecord:
+    """
+    Compact in-process tweet holding just the fields analytics read
+
+    id, author, created_at, the four public metrics, the url/mention/hashtag
+    lists, the referenced tweets (read for every record by search_user_group)
+    and the text live in slots; the rest of the payload (full metrics and
+    entities, annotations, ...) is kept as compact JSON bytes and only decoded
+    when `raw` is read. A record takes a fraction of
+    the memory of the API dict it was built from.
+
+    Read access mirrors the API dict for the keys the analysis code uses
+    (record['text'], record.get('public_metrics', {}), record.get('entities', {}),
+    'id' in record, ...), so TweetReportBuilder, the TwitterScraper analysis
+    methods and save_to_deep_history accept records unchanged. Keys outside the
+    slots fall through to the raw payload.
+    """
+    __slots__ = ('id', 'author_id', 'created_at', 'text', 'like_count', 'retweet_count', 'reply_count',
+                 'quote_count', 'urls', 'mentions', 'hashtags', 'referenced_tweets', '_payload')
+
+    # Keys served straight from slots
+    _SLOT_KEYS = frozenset(('id', 'author_id', 'created_at', 'text'))
+    # Keys kept out of the payload
+    _UNPACKED_KEYS = _SLOT_KEYS | {'referenced_tweets'}
+
+    def __init__(self, id, author_id, created_at, text, metrics, urls, mentions, hashtags, payload,
+                 referenced_tweets=None):
+        self.id = id
+        self.author_id = author_id
+        self.created_at = created_at
+        self.text = text
+        self.like_count, self.retweet_count, self.reply_count, self.quote_count = metrics
+        self.urls = urls
+        self.mentions = mentions
+        self.hashtags = hashtags
+        # ((type, id), ...), or None if the tweet had no referenced_tweets key
+        self.referenced_tweets = referenced_tweets
+        self._payload = payload
+
+    @classmethod
+    def from_api(cls, tweet):
+        """Build a record from a tweet dict as returned by the API"""
+        metrics = tweet.get('public_metrics', {})
+        entities = tweet.get('entities', {})
+        references = tweet.get('referenced_tweets')
+        return cls(
+            tweet.get('id'),
+            tweet.get('author_id'),
+            tweet.get('created_at'),
+            tweet.get('text', ''),
+            tuple(metrics.get(field, 0) for field in _METRIC_FIELDS),
+            tuple(url['expanded_url'] for url in entities.get('urls', ()) if 'expanded_url' in url),
+            tuple(mention['username'] for mention in entities.get('mentions', ())),
+            tuple(tag['tag'] for tag in entities.get('hashtags', ())),
+            fast_json.dumps({key: value for key, value in tweet.items()
+                             if key not in cls._UNPACKED_KEYS}).encode('utf-8'),
+            None if references is None else tuple((ref.get('type'), ref.get('id')) for ref in references)
+        )
+
+    @property
+    def raw(self):
+        """The full API dict (rebuilt on every access; not cached). Slot keys come first."""
+        tweet = {key: getattr(self, key) for key in ('id', 'author_id', 'created_at', 'text')
+                 if getattr(self, key) is not None}
+        tweet.update(fast_json.loads(self._payload))
+        if self.referenced_tweets is not None:
+            tweet['referenced_tweets'] = self._references()
+        return tweet
+
+    def _references(self):
+        return [{'type': ref_type, 'id': ref_id} for ref_type, ref_id in self.referenced_tweets]
+
+    @property
+    def metrics(self):
+        """(like, retweet, reply, quote) counts"""
+        return (self.like_count, self.retweet_count, self.reply_count, self.quote_count)
+
+    def get(self, key, default=None):
+        if key in self._SLOT_KEYS:
+            value = getattr(self, key)
+            return default if value is None else value
+        if key == 'public_metrics':
+            return dict(zip(_METRIC_FIELDS, self.metrics))
+        if key == 'entities':
+            entities = {}
+            if self.urls:
+                entities['urls'] = [{'expanded_url': url} for url in self.urls]
+            if self.mentions:
+                entities['mentions'] = [{'username': mention} for mention in self.mentions]
+            if self.hashtags:
+                entities['hashtags'] = [{'tag': tag} for tag in self.hashtags]
+            return entities
+        if key == 'referenced_tweets':
+            return default if self.referenced_tweets is None else self._references()
+        return fast_json.loads(self._payload).get(key, default)
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __reduce__(self):
+        # Pickle as constructor arguments (report_pool ships records to worker processes)
+        return (TweetRecord, (self.id, self.author_id, self.created_at, self.text, self.metrics,
+                              self.urls, self.mentions, self.hashtags, self._payload, self.referenced_tweets))
+
+    def __repr__(self):
+        return f"TweetRecord(id={self.id!r}, author_id={self.author_id!r})"
+
+
+class PackedJSON:
+    """A JSON value (e.g. a response's 'includes') kept as compact bytes until needed"""
+    __slots__ = ('payload',)
+
+    def __init__(self, value):
+        self.payload = fast_json.dumps(value).encode('utf-8')
+
+    def __reduce__(self):
+        return (_packed_from_bytes, (self.payload,))
+
+    @property
+    def value(self):
+        return fast_json.loads(self.payload)
+
+
+def _packed_from_bytes(payload):
+    packed = PackedJSON.__new__(PackedJSON)
+    packed.payload = payload
+    return packed
+
+
+def compact_tweets_data(tweets_data):
+    """
+    Compact form of a search result (search_user_tweets shape)
+
+    'data' becomes a list of TweetRecords and 'includes' a PackedJSON; the
+    profile and meta are kept as they are. Reverse with expand_tweets_data()
+    before persisting.
+
+    Returns:
+        New dict (the input is not modified), or tweets_data itself if it isn't a result dict
+    """
+    if not isinstance(tweets_data, dict):
+        return tweets_data
+    compact = dict(tweets_data)
+    if 'data' in compact:
+        compact['data'] = [TweetRecord.from_api(tweet) for tweet in compact['data']]
+    if 'includes' in compact:
+        compact['includes'] = PackedJSON(compact['includes'])
+    return compact
+
+
+def expand_tweets_data(tweets_data):
+    """
+    Full API form of a compact_tweets_data() result, for JSON columns and responses
+
+    Returns:
+        New dict with plain tweet dicts (a result that isn't compact is returned as is)
+    """
+    if not isinstance(tweets_data, dict):
+        return tweets_data
+    expanded = dict(tweets_data)
+    if 'data' in expanded:
+        expanded['data'] = [tweet.raw if isinstance(tweet, TweetRecord) else tweet for tweet in expanded['data']]
+    if isinstance(expanded.get('includes'), PackedJSON):
+        expanded['includes'] = expanded['includes'].value
+    return expanded
@@ -1,24 +1,440 @@
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import time
+import random
 from datetime import datetime
+from collections import Counter
 from dotenv import load_dotenv
 import re
+from rate_limiter import RateLimitGovernor, endpoint_key
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from single_flight import SingleFlight
+import fast_json
+from profile_cache import ProfileCache
+from keyword_idf import CorpusIDF, bio_terms, tweet_terms
+from account_index import AccountVectorIndex
+from lexicon import NEGATIVE_WORDS, OPPORTUNITY_WORDS, POSITIVE_WORDS, SENTIMENT_MATCHER
+from report_builder import ReportAnalytics, TweetReportBuilder, default_report_path
+from query_planner import DEFAULT_MAX_QUERY_LENGTH, plan_query_groups, split_tweets_by_author
+from text_matcher import compile_matcher
+from tweet_record import PackedJSON, TweetRecord, compact_tweets_data
 
 load_dotenv()
 
-class TwitterScraper:
-    def __init__(self):
+# Connection pool defaults (override via environment variables)
+DEFAULT_POOL_SIZE = int(os.getenv('TWITTER_POOL_SIZE', '20'))
+DEFAULT_CONNECT_TIMEOUT = float(os.getenv('TWITTER_CONNECT_TIMEOUT', '5'))
+DEFAULT_READ_TIMEOUT = float(os.getenv('TWITTER_READ_TIMEOUT', '30'))
+# How many times a 429 response is waited out and retried before giving up
+MAX_RATE_LIMIT_RETRIES = 2
+# How many times a transient failure (5xx, connection error, timeout) is retried
+MAX_TRANSIENT_RETRIES = int(os.getenv('TWITTER_MAX_RETRIES', '3'))
+# Exponential backoff between transient retries: base * 2^n seconds, capped, with full jitter
+RETRY_BACKOFF_BASE = float(os.getenv('TWITTER_RETRY_BACKOFF', '0.5'))
+RETRY_BACKOFF_MAX = 8.0
+RETRYABLE_STATUS_CODES = {500, 502, 503, 504}
+# Recent search only accepts since_id values from the last 7 days
+SEARCH_WINDOW_SECONDS = 7 * 24 * 60 * 60
+# Snowflake IDs encode milliseconds since this epoch in their upper bits
+TWITTER_EPOCH_MS = 1288834974657
+# Most usernames the /users/by multi-user lookup accepts per request
+USER_LOOKUP_BATCH_SIZE = 100
+
+# Default page budget for multi-page account discovery
+DEFAULT_DISCOVERY_MAX_REQUESTS = int(os.getenv('TWITTER_DISCOVERY_MAX_REQUESTS', '10'))
+
+# find_similar_accounts answers from the local account index when it has at least this many matches
+SIMILAR_MIN_LOCAL_RESULTS = int(os.getenv('SIMILAR_MIN_LOCAL_RESULTS', '10'))
+
+# API root; point at a local mock (benchmarks/mock_x_api.py) to measure offline
+DEFAULT_BASE_URL = os.getenv('TWITTER_API_BASE_URL', 'https://api.x.com/2')
+
+USER_PROFILE_FIELDS = "created_at,description,entities,id,location,name,pinned_tweet_id,profile_image_url,protected,public_metrics,url,username,verified,verified_type"
+
+
+def build_http_session(pool_size=DEFAULT_POOL_SIZE, keep_alive=True):
+    """
+    Build a requests Session backed by a pooled, keep-alive HTTPS adapter
+    
+    The underlying urllib3 pool is thread-safe, so a single session can be
+    shared by the scheduler thread, request handlers and worker threads.
+    
+    Args:
+        pool_size: Maximum number of connections kept open per host
+        keep_alive: Reuse connections between requests (disable for debugging)
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        pool_block=True,  # Wait for a free connection instead of opening extras
+        max_retries=0
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+    return session
+
+
+class TweetAnalyzer:
+    """
+    Per-tweet analysis and report generation
+
+    Holds no connection or cache state, so it can be created anywhere (e.g. in
+    report_pool worker processes) without a bearer token. TwitterScraper
+    inherits these methods.
+    """
+
+    def analyze_account_type(self, user_data):
+        """Determine if account is enterprise/business/personal"""
+        description = user_data.get('description', '').lower()
+        name = user_data.get('name', '').lower()
+        metrics = user_data.get('public_metrics', {})
+        
+        # Enterprise indicators
+        enterprise_keywords = ['ceo', 'founder', 'company', 'official', 'corp', 'inc', 'ltd', 
+                              'enterprise', 'business', 'organization', 'team']
+        
+        is_verified = user_data.get('verified', False)
+        follower_count = metrics.get('followers_count', 0)
+        following_count = metrics.get('following_count', 0)
+        
+        # Scoring system
+        score = 0
+        indicators = []
+        
+        if is_verified:
+            score += 3
+            indicators.append('Verified Account')
+        
+        if follower_count > 10000:
+            score += 2
+            indicators.append(f'High Followers ({follower_count:,})')
+        
+        if follower_count > 1000 and following_count < follower_count * 0.5:
+            score += 1
+            indicators.append('Good Follower Ratio')
+        
+        for keyword in enterprise_keywords:
+            if keyword in description or keyword in name:
+                score += 1
+                indicators.append(f'Business Keyword: {keyword}')
+                break
+        
+        # Determine type
+        if score >= 4:
+            account_type = 'Enterprise/Business'
+        elif score >= 2:
+            account_type = 'Professional/Influencer'
+        else:
+            account_type = 'Personal'
+        
+        return {
+            'type': account_type,
+            'score': score,
+            'indicators': indicators,
+            'is_verified': is_verified,
+            'follower_count': follower_count
+        }
+    
+    def calculate_engagement_score(self, tweet):
+        """Calculate engagement score for lead prioritization"""
+        if isinstance(tweet, TweetRecord):
+            likes, retweets, replies, quotes = tweet.metrics
+        else:
+            metrics = tweet.get('public_metrics', {})
+            
+            likes = metrics.get('like_count', 0)
+            retweets = metrics.get('retweet_count', 0)
+            replies = metrics.get('reply_count', 0)
+            quotes = metrics.get('quote_count', 0)
+        
+        # Weighted engagement score
+        score = (likes * 1) + (retweets * 3) + (replies * 2) + (quotes * 2)
+        
+        return {
+            'score': score,
+            'likes': likes,
+            'retweets': retweets,
+            'replies': replies,
+            'quotes': quotes
+        }
+    
+    def extract_entities(self, tweet):
+        """Extract URLs, mentions, hashtags from tweet (an API dict or a TweetRecord)"""
+        if isinstance(tweet, TweetRecord):
+            return {
+                'urls': list(tweet.urls),
+                'mentions': list(tweet.mentions),
+                'hashtags': list(tweet.hashtags),
+                'has_links': bool(tweet.urls),
+                'has_mentions': bool(tweet.mentions),
+                'has_hashtags': bool(tweet.hashtags)
+            }
+        
+        entities = tweet.get('entities', {})
+        
+        urls = []
+        if 'urls' in entities:
+            urls = [url['expanded_url'] for url in entities['urls'] if 'expanded_url' in url]
+        
+        mentions = []
+        if 'mentions' in entities:
+            mentions = [mention['username'] for mention in entities['mentions']]
+        
+        hashtags = []
+        if 'hashtags' in entities:
+            hashtags = [tag['tag'] for tag in entities['hashtags']]
+        
+        return {
+            'urls': urls,
+            'mentions': mentions,
+            'hashtags': hashtags,
+            'has_links': len(urls) > 0,
+            'has_mentions': len(mentions) > 0,
+            'has_hashtags': len(hashtags) > 0
+        }
+    
+    def perform_sentiment_analysis(self, text, hits=None):
+        """
+        Basic sentiment analysis
+        
+        Args:
+            text: Tweet text
+            hits: Lowercased lexicon words found in the text, when the caller
+                already scanned it (e.g. together with its search keywords)
+        """
+        # All three lexicons in one scan of the text
+        if hits is None:
+            hits = SENTIMENT_MATCHER.find(text)
+        
+        positive_count = len(hits.intersection(POSITIVE_WORDS))
+        negative_count = len(hits.intersection(NEGATIVE_WORDS))
+        opportunity_count = len(hits.intersection(OPPORTUNITY_WORDS))
+        
+        # Determine sentiment
+        if positive_count > negative_count:
+            sentiment = 'Positive'
+        elif negative_count > positive_count:
+            sentiment = 'Negative'
+        else:
+            sentiment = 'Neutral'
+        
+        return {
+            'sentiment': sentiment,
+            'positive_score': positive_count,
+            'negative_score': negative_count,
+            'opportunity_signals': opportunity_count,
+            'is_opportunity': opportunity_count > 0
+        }
+    
+    def filter_by_keywords(self, tweets_data, keywords):
+        """Filter tweets that contain any of the keywords"""
+        if not tweets_data or 'data' not in tweets_data:
+            return []
+        
+        matcher = compile_matcher(tuple(keywords))
+        return [tweet for tweet in tweets_data['data'] if matcher.contains_any(tweet['text'])]
+    
+    def generate_report(self, tweets_data, username, keywords=None, min_keyword_mentions=1, stream=None):
+        """
+        Generate a formatted report from tweet data with advanced analytics
+        
+        Args:
+            tweets_data: Search result dict with 'data' (and optionally 'user_profile')
+            username: Account the report is for
+            keywords: Keywords used in the search (optional)
+            min_keyword_mentions: Threshold for the keyword ranking
+            stream: Optional text stream (e.g. an open file) to write the report into
+        
+        Returns:
+            The report text, or the number of tweets written when a stream is given
+        """
+        if not tweets_data or 'data' not in tweets_data:
+            return 0 if stream is not None else "No tweets found."
+        
+        builder = TweetReportBuilder(
+            self, username, keywords, min_keyword_mentions,
+            user_profile=tweets_data.get('user_profile', {})
+        )
+        builder.add_tweets(tweets_data['data'])
+        return builder.write_to(stream) if stream is not None else builder.render()
+    
+    def generate_report_analytics(self, tweets_data, username, keywords=None, min_keyword_mentions=1):
+        """
+        Analyze tweet data into a structured report result, without rendering text
+
+        Store result.to_dict() (Report.analytics) and render the text on request
+        with render_report().
+
+        Returns:
+            ReportAnalytics, or None if there are no tweets
+        """
+        if not tweets_data or 'data' not in tweets_data:
+            return None
+
+        builder = TweetReportBuilder(
+            self, username, keywords, min_keyword_mentions,
+            user_profile=tweets_data.get('user_profile', {}),
+            spool_details=False
+        )
+        builder.add_tweets(tweets_data['data'])
+        return builder.result()
+
+    def render_report(self, report_analytics, tweets_data):
+        """
+        Render report text from a stored analytics result
+
+        Args:
+            report_analytics: ReportAnalytics or its to_dict() form (Report.analytics)
+            tweets_data: The tweet data the result was computed from
+
+        Returns:
+            The report text, identical to generate_report's for the same data
+        """
+        if isinstance(report_analytics, dict):
+            report_analytics = ReportAnalytics.from_dict(report_analytics)
+        return report_analytics.render(self, (tweets_data or {}).get('data', []))
+
+    def generate_report_from_pages(self, pages, username, keywords=None, min_keyword_mentions=1, stream=None):
+        """
+        Generate the report incrementally from an iterable of tweet pages
+        (e.g. iter_user_tweet_pages), keeping memory bounded
+        
+        Pass a stream (e.g. an open file) to write the report straight into it;
+        otherwise the report text is returned.
+        
+        Returns:
+            The report text, or the number of tweets written when a stream is given
+        """
+        builder = TweetReportBuilder(self, username, keywords, min_keyword_mentions)
+        for page in pages:
+            builder.add_page(page)
+        return builder.write_to(stream) if stream is not None else builder.render()
+
+
+class TwitterScraper(TweetAnalyzer):
+    def __init__(self, session=None, pool_size=None, timeout=None, keep_alive=True, rate_limiter=None,
+                 profile_cache=None, base_url=None, circuit_breaker=None, max_retries=None, keyword_idf=None,
+                 account_index=None):
+        """
+        Args:
+            session: Optional shared requests Session (one is built if omitted)
+            pool_size: Connection pool size for the built session
+            timeout: (connect, read) timeout tuple in seconds, or a single number
+            keep_alive: Keep connections open between requests
+            rate_limiter: Optional shared RateLimitGovernor (one is built if omitted)
+            profile_cache: Optional shared ProfileCache (an in-memory one is built if omitted)
+            base_url: API root override (defaults to TWITTER_API_BASE_URL or https://api.x.com/2)
+            circuit_breaker: Optional shared CircuitBreaker (one is built if omitted)
+            max_retries: Retries for transient failures (defaults to TWITTER_MAX_RETRIES)
+            keyword_idf: Optional shared CorpusIDF for keyword ranking (corpus-less if omitted)
+            account_index: Optional shared AccountVectorIndex for similar-account search
+                (an empty in-memory one is built if omitted)
+        """
         self.bearer_token = os.getenv('TWITTER_BEARER_TOKEN')
         if not self.bearer_token:
             raise ValueError("TWITTER_BEARER_TOKEN not found in .env file")
         
-        self.base_url = "https://api.x.com/2"
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip('/')
         self.headers = {
             "Authorization": f"Bearer {self.bearer_token}"
         }
+        
+        self.pool_size = pool_size or DEFAULT_POOL_SIZE
+        self.timeout = timeout or (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+        self.session = session or build_http_session(self.pool_size, keep_alive=keep_alive)
+        self.rate_limiter = rate_limiter or RateLimitGovernor()
+        self.profile_cache = profile_cache or ProfileCache(persist=False)
+        self.max_query_length = DEFAULT_MAX_QUERY_LENGTH
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.max_retries = MAX_TRANSIENT_RETRIES if max_retries is None else max_retries
+        self.single_flight = SingleFlight()
+        self.keyword_idf = keyword_idf or CorpusIDF(persist=False)
+        self.account_index = account_index or AccountVectorIndex(persist=False)
+    
+    def _get(self, endpoint, params=None):
+        """
+        Issue a GET request, sharing the response with identical requests in flight
+        
+        Concurrent callers asking for the same endpoint and params (e.g. a manual
+        run and a cron run for the same account) wait on one upstream call
+        instead of each spending quota. See _fetch for pacing and retries.
+        """
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        return self.single_flight.do(key, lambda: self._fetch(endpoint, params))
+    
+    def _fetch(self, endpoint, params=None):
+        """
+        Issue a GET request through the pooled session
+        
+        Requests are paced by the per-endpoint rate-limit governor: when an
+        endpoint's window is exhausted the call waits for the reset instead of
+        failing, and a 429 is waited out and retried. Transient failures (5xx,
+        connection errors, timeouts) are retried with jittered exponential
+        backoff, and feed a per-endpoint circuit breaker.
+        
+        Raises:
+            CircuitOpenError: The endpoint has been failing; the call fails fast
+            requests.RequestException: Connection errors that outlasted the retries
+        """
+        key = endpoint_key(endpoint)
+        rate_limit_retries = 0
+        transient_retries = 0
+        while True:
+            self.circuit_breaker.before_request(key)
+            self.rate_limiter.acquire(key)
+            try:
+                response = self.session.get(endpoint, headers=self.headers, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.rate_limiter.release(key)
+                self.circuit_breaker.record_failure(key)
+                if transient_retries >= self.max_retries:
+                    raise
+                transient_retries += 1
+                self._backoff(key, transient_retries, type(e).__name__)
+                continue
+            except Exception:
+                self.rate_limiter.release(key)
+                raise
+            self.rate_limiter.release(key, response)
+            
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                self.circuit_breaker.record_failure(key)
+                if transient_retries >= self.max_retries:
+                    return response
+                transient_retries += 1
+                self._backoff(key, transient_retries, f"HTTP {response.status_code}", response.headers.get('retry-after'))
+                continue
+            
+            # Any other answer (including 4xx and 429) means the endpoint is up
+            self.circuit_breaker.record_success(key)
+            
+            if response.status_code != 429 or rate_limit_retries == MAX_RATE_LIMIT_RETRIES:
+                return response
+            if self.rate_limiter.seconds_until_available(key) > self.rate_limiter.max_wait:
+                return response
+            rate_limit_retries += 1
+            print(f"[RATE_LIMIT] 429 from {key}, waiting for window reset (retry {rate_limit_retries}/{MAX_RATE_LIMIT_RETRIES})")
+    
+    def _backoff(self, key, attempt, reason, retry_after=None):
+        """Sleep before retry `attempt` of a transient failure"""
+        delay = random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** (attempt - 1)))
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), RETRY_BACKOFF_MAX))
+            except ValueError:
+                pass
+        print(f"[RETRY] {key}: {reason}, retrying in {delay:.2f}s ({attempt}/{self.max_retries})")
+        time.sleep(delay)
     
-    def search_user_tweets(self, username, keywords=None, max_results=100, filters=None):
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+    
+    def search_user_tweets(self, username, keywords=None, max_results=100, filters=None, since_id=None):
         """
         Search tweets from a specific user, optionally filtered by keywords and advanced filters
         
@@ -27,6 +443,7 @@ class TwitterScraper:
             keywords: List of keywords to filter by
             max_results: Maximum number of tweets to retrieve (10-100)
             filters: Dict with advanced filters (min_likes, verified_only, has_links, etc.)
+            since_id: Only return tweets newer than this tweet ID (incremental fetch)
         """
         # First, get the user ID and profile info
         user_data = self._get_user_info(username)
@@ -36,10 +453,44 @@ class TwitterScraper:
         user_id = user_data['id']
         
         # Build query
-        query = f"from:{username}"
+        query = self._build_user_query(username, keywords, filters)
+        
+        # Search tweets
+        endpoint = f"{self.base_url}/tweets/search/recent"
+        params = {
+            "query": query,
+            "max_results": min(max_results, 100),
+            "tweet.fields": "created_at,public_metrics,text,entities,referenced_tweets",
+            "expansions": "author_id,referenced_tweets.id",
+            "user.fields": "username,name,verified,public_metrics,description,location"
+        }
+        if self._is_searchable_since_id(since_id):
+            params["since_id"] = since_id
+        
+        response = self._get(endpoint, params)
+        
+        if response.status_code == 200:
+            data = fast_json.loads(response.content)
+            # Add user profile info to response
+            data['user_profile'] = user_data
+            return data
+        else:
+            print(f"Error: {response.status_code}")
+            print(response.text)
+            return None
+    
+    def _build_user_query(self, username, keywords=None, filters=None):
+        """Build the search query for a user's tweets with keyword and advanced filters"""
+        return self._build_users_query([username], keywords, filters)
+    
+    def _build_users_query(self, usernames, keywords=None, filters=None):
+        """Build one search query covering several users' tweets"""
+        query = " OR ".join([f"from:{username}" for username in usernames])
         if keywords:
             keyword_query = " OR ".join([f'"{kw}"' for kw in keywords])
             query = f"({query}) ({keyword_query})"
+        elif len(usernames) > 1:
+            query = f"({query})"
         
         # Add advanced filters to query
         if filters:
@@ -56,56 +507,404 @@ class TwitterScraper:
             if filters.get('min_retweets'):
                 query += f" min_retweets:{filters['min_retweets']}"
         
-        # Search tweets
+        return query
+    
+    def iter_user_tweet_pages(self, username, keywords=None, filters=None, max_total=None,
+                              time_budget=None, page_size=100, since_id=None):
+        """
+        Stream a user's matching tweets page by page, following meta.next_token
+        
+        Each yielded page has the same shape as search_user_tweets' result
+        ('data', 'includes', 'meta', 'user_profile'), so it can be handed straight
+        to report and save paths without holding every page in memory.
+        
+        Args:
+            username: Twitter handle (without @)
+            keywords: List of keywords to filter by
+            filters: Dict with advanced filters (see search_user_tweets)
+            max_total: Stop after this many tweets (None for no limit)
+            time_budget: Stop starting new requests after this many seconds (None for no limit)
+            page_size: Tweets requested per page (10-100)
+            since_id: Only return tweets newer than this tweet ID
+        """
+        started = time.monotonic()
+        
+        user_data = self._get_user_info(username)
+        if not user_data:
+            return
+        
         endpoint = f"{self.base_url}/tweets/search/recent"
         params = {
-            "query": query,
-            "max_results": min(max_results, 100),
+            "query": self._build_user_query(username, keywords, filters),
             "tweet.fields": "created_at,public_metrics,text,entities,referenced_tweets",
             "expansions": "author_id,referenced_tweets.id",
             "user.fields": "username,name,verified,public_metrics,description,location"
         }
+        if self._is_searchable_since_id(since_id):
+            params["since_id"] = since_id
+        
+        fetched = 0
+        while True:
+            wanted = page_size if max_total is None else min(page_size, max_total - fetched)
+            # The API only accepts 10-100 results per page
+            params["max_results"] = max(10, min(wanted, 100))
+            
+            response = self._get(endpoint, params)
+            if response.status_code != 200:
+                print(f"Error: {response.status_code}")
+                print(response.text)
+                return
+            
+            page = fast_json.loads(response.content)
+            tweets = page.get('data', [])
+            if max_total is not None and fetched + len(tweets) > max_total:
+                page['data'] = tweets = tweets[:max_total - fetched]
+            fetched += len(tweets)
+            
+            if tweets:
+                page['user_profile'] = user_data
+                yield page
+            
+            next_token = page.get('meta', {}).get('next_token')
+            if not next_token:
+                return
+            if max_total is not None and fetched >= max_total:
+                return
+            if time_budget is not None and time.monotonic() - started >= time_budget:
+                print(f"Time budget of {time_budget}s reached after {fetched} tweets")
+                return
+            params["next_token"] = next_token
+    
+    def _is_searchable_since_id(self, since_id):
+        """
+        Check a since_id can be sent to recent search
         
-        response = requests.get(endpoint, headers=self.headers, params=params)
-        
-        if response.status_code == 200:
-            data = response.json()
-            # Add user profile info to response
-            data['user_profile'] = user_data
-            return data
-        else:
-            print(f"Error: {response.status_code}")
-            print(response.text)
+        The endpoint rejects IDs older than its 7 day window; for those every
+        recent tweet is new anyway, so the watermark is simply dropped.
+        """
+        if not since_id:
+            return False
+        try:
+            created_ms = (int(since_id) >> 22) + TWITTER_EPOCH_MS
+        except (TypeError, ValueError):
+            return False
+        # Leave a minute of slack so the ID doesn't age out in flight
+        return created_ms / 1000 > time.time() - SEARCH_WINDOW_SECONDS + 60
+    
+    @staticmethod
+    def newest_tweet_id(tweets_data):
+        """Newest tweet ID in a search result (for advancing since_id watermarks)"""
+        if not tweets_data:
             return None
+        newest_id = tweets_data.get('meta', {}).get('newest_id')
+        if newest_id:
+            return newest_id
+        ids = [tweet['id'] for tweet in tweets_data.get('data', []) if tweet.get('id')]
+        return max(ids, key=int) if ids else None
     
     def _get_user_info(self, username):
-        """Get detailed user profile information"""
+        """Get detailed user profile information (served from the profile cache when fresh)"""
+        cached = self.profile_cache.get(username)
+        if cached is not None:
+            return cached
+        if self.profile_cache.is_missing(username):
+            print(f"Error getting user info: @{username} could not be resolved recently")
+            return None
+        
         endpoint = f"{self.base_url}/users/by/username/{username}"
         params = {
-            "user.fields": "created_at,description,entities,id,location,name,pinned_tweet_id,profile_image_url,protected,public_metrics,url,username,verified,verified_type"
+            "user.fields": USER_PROFILE_FIELDS
         }
-        response = requests.get(endpoint, headers=self.headers, params=params)
+        response = self._get(endpoint, params)
         
         if response.status_code == 200:
-            return response.json()['data']
+            payload = fast_json.loads(response.content)
+            user_data = payload.get('data')
+            if not user_data:
+                # Unknown or suspended accounts come back as 200 with only 'errors'
+                for error in payload.get('errors', []):
+                    print(f"Error getting user info: {error.get('detail', error.get('title', 'unknown error'))}")
+                self.profile_cache.set_missing([username])
+                return None
+            self.profile_cache.set(username, user_data)
+            return user_data
         else:
             print(f"Error getting user info: {response.status_code}")
             return None
     
-    def discover_accounts(self, keywords, max_results=100, filters=None):
+    def get_user_infos(self, usernames):
+        """
+        Resolve many user profiles at once
+        
+        Cached profiles are served from the profile cache; the rest are looked up
+        through the multi-user /users/by endpoint, up to 100 usernames per
+        request, and written back to the cache. Later _get_user_info calls for
+        the same handles (e.g. inside search_user_tweets) are then cache hits.
+        
+        Args:
+            usernames: List of Twitter handles (without @)
+        
+        Handles the endpoint answers without a profile (unknown or suspended
+        accounts) are cached as missing for a few minutes (see
+        ProfileCache.set_missing), and handles already cached as missing are
+        not looked up again.
+        
+        Returns:
+            Dict of username (as passed in) -> profile. Accounts that don't exist
+            or failed to resolve are left out.
+        """
+        unique_usernames = list(dict.fromkeys(usernames))
+        profiles = {}
+        missing = []
+        for username in unique_usernames:
+            cached = self.profile_cache.get(username)
+            if cached is not None:
+                profiles[username] = cached
+            elif not self.profile_cache.is_missing(username):
+                missing.append(username)
+        
+        endpoint = f"{self.base_url}/users/by"
+        for i in range(0, len(missing), USER_LOOKUP_BATCH_SIZE):
+            batch = missing[i:i + USER_LOOKUP_BATCH_SIZE]
+            params = {
+                "usernames": ",".join(batch),
+                "user.fields": USER_PROFILE_FIELDS
+            }
+            response = self._get(endpoint, params)
+            
+            if response.status_code != 200:
+                print(f"Error getting user info for {len(batch)} accounts: {response.status_code}")
+                continue
+            
+            payload = fast_json.loads(response.content)
+            by_username = {user['username'].lower(): user for user in payload.get('data', [])}
+            found = {}
+            for username in batch:
+                user_data = by_username.get(username.lower())
+                if user_data:
+                    found[username] = user_data
+            
+            for error in payload.get('errors', []):
+                print(f"Could not resolve @{error.get('value', '?')}: {error.get('detail', error.get('title', 'unknown error'))}")
+            
+            self.profile_cache.set_many(found)
+            self.profile_cache.set_missing([username for username in batch if username not in found])
+            profiles.update(found)
+        
+        if missing:
+            batches = (len(missing) + USER_LOOKUP_BATCH_SIZE - 1) // USER_LOOKUP_BATCH_SIZE
+            print(f"Resolved {len(profiles)} of {len(unique_usernames)} profiles ({len(missing)} looked up in {batches} request(s))")
+        return profiles
+    
+    def plan_user_groups(self, usernames, keywords=None, filters=None):
+        """
+        Group accounts into coalesced searches that fit the query-length limit
+        
+        Only accounts whose profiles are already cached (see get_user_infos) are
+        combined, since results are split back out by author ID. Handles cached
+        as missing are left out altogether. Anything else gets a group of its
+        own and goes through search_user_tweets unchanged.
+        
+        Returns:
+            List of username lists
+        """
+        resolved = []
+        groups = []
+        for username in dict.fromkeys(usernames):
+            if self.profile_cache.get(username) is not None:
+                resolved.append(username)
+            elif not self.profile_cache.is_missing(username):
+                groups.append([username])
+        
+        build_query = lambda group: self._build_users_query(group, keywords, filters)
+        return plan_query_groups(resolved, build_query, self.max_query_length) + groups
+    
+    def search_user_group(self, usernames, keywords=None, max_results=100, filters=None, since_ids=None,
+                          compact=False):
+        """
+        Search several accounts' tweets with one (from:a OR from:b ...) query
+        
+        The combined results are split back out per author_id, so each account
+        gets the same shape search_user_tweets returns. Pages are followed until
+        every account has max_results tweets, the results run out, or as many
+        requests have been made as searching the accounts one by one would take.
+        
+        Results come newest first across the whole group, so a busy account can
+        fill every page. Once an account has max_results tweets it is dropped
+        from the query, and the rest continue below the oldest tweet read so far
+        (until_id). Any account still short when the page budget runs out (or a
+        later page fails) is searched again on its own, so quiet accounts get
+        the same tweets search_user_tweets would return.
+        
+        Args:
+            usernames: Twitter handles (without @) sharing keywords and filters
+            keywords: List of keywords to filter by
+            max_results: Maximum number of tweets to keep per account (10-100)
+            filters: Dict with advanced filters (see search_user_tweets)
+            since_ids: Optional dict of username -> since_id watermark
+            compact: Keep tweets as TweetRecords as each page is read, and the
+                includes as PackedJSON (see tweet_record.compact_tweets_data)
+        
+        Returns:
+            Dict of username -> tweets data (None if the account or search failed)
+        """
+        since_ids = since_ids or {}
+        if len(usernames) == 1:
+            username = usernames[0]
+            tweets_data = self.search_user_tweets(username, keywords, max_results, filters,
+                                                  since_id=since_ids.get(username))
+            return {username: compact_tweets_data(tweets_data) if compact else tweets_data}
+        
+        results = {username: None for username in usernames}
+        profiles = self.get_user_infos(usernames)
+        members = [username for username in usernames if username in profiles]
+        if not members:
+            return results
+        
+        usernames_by_author_id = {profiles[username]['id']: username for username in members}
+        per_account = min(max_results, 100)
+        
+        # Watermarks recent search can't take are dropped, as in search_user_tweets
+        watermarks = {
+            username: int(since_ids[username]) for username in members
+            if self._is_searchable_since_id(since_ids.get(username))
+        }
+        
+        endpoint = f"{self.base_url}/tweets/search/recent"
+        params = {
+            "query": self._build_users_query(members, keywords, filters),
+            "max_results": 100,
+            "tweet.fields": "author_id,created_at,public_metrics,text,entities,referenced_tweets",
+            "expansions": "author_id,referenced_tweets.id",
+            "user.fields": "username,name,verified,public_metrics,description,location"
+        }
+        # The group starts from its oldest watermark; each account is re-filtered below
+        if len(watermarks) == len(members):
+            params["since_id"] = str(min(watermarks.values()))
+        
+        collected = {username: [] for username in members}
+        included_users = {}
+        included_tweets = {}
+        active = list(members)
+        requests_made = 0
+        exhausted = False
+        while True:
+            response = self._get(endpoint, params)
+            requests_made += 1
+            if response.status_code != 200:
+                print(f"Error: {response.status_code}")
+                print(response.text)
+                if requests_made == 1:
+                    return results
+                break
+            
+            page = fast_json.loads(response.content)
+            page_tweets = page.get('data', [])
+            for username, tweets in split_tweets_by_author(page_tweets, usernames_by_author_id).items():
+                watermark = watermarks.get(username)
+                for tweet in tweets:
+                    if len(collected[username]) >= per_account:
+                        break
+                    if watermark is None or int(tweet['id']) > watermark:
+                        collected[username].append(TweetRecord.from_api(tweet) if compact else tweet)
+            
+            includes = page.get('includes', {})
+            for user in includes.get('users', []):
+                included_users[user['id']] = user
+            for tweet in includes.get('tweets', []):
+                included_tweets[tweet['id']] = tweet
+            
+            next_token = page.get('meta', {}).get('next_token')
+            if not next_token:
+                exhausted = True
+                break
+            full = {username for username in active if len(collected[username]) >= per_account}
+            if len(full) == len(active) or requests_made >= len(members):
+                break
+            if full and page_tweets:
+                # Everything newer than this page's oldest tweet has been read for
+                # the accounts left, so their query resumes below it
+                active = [username for username in active if username not in full]
+                params["query"] = self._build_users_query(active, keywords, filters)
+                params["until_id"] = str(min(int(tweet['id']) for tweet in page_tweets))
+                params.pop("next_token", None)
+                if all(username in watermarks for username in active):
+                    params["since_id"] = str(min(watermarks[username] for username in active))
+            else:
+                params["next_token"] = next_token
+        
+        # Accounts the page budget (or a failed page) cut short: search them on their own
+        refetched = {}
+        if not exhausted:
+            for username in active:
+                if len(collected[username]) < per_account:
+                    tweets_data = self.search_user_tweets(username, keywords, max_results, filters,
+                                                          since_id=since_ids.get(username))
+                    if tweets_data is not None:
+                        refetched[username] = compact_tweets_data(tweets_data) if compact else tweets_data
+        
+        for username in members:
+            if username in refetched:
+                results[username] = refetched[username]
+                continue
+            tweets = collected[username]
+            data = {'meta': {'result_count': len(tweets)}}
+            if tweets:
+                ids = [int(tweet['id']) for tweet in tweets]
+                data['meta']['newest_id'] = str(max(ids))
+                data['meta']['oldest_id'] = str(min(ids))
+                data['data'] = tweets
+                
+                referenced_ids = dict.fromkeys(
+                    ref['id'] for tweet in tweets for ref in tweet.get('referenced_tweets', [])
+                )
+                includes = {}
+                author_id = profiles[username]['id']
+                if author_id in included_users:
+                    includes['users'] = [included_users[author_id]]
+                referenced = [included_tweets[tweet_id] for tweet_id in referenced_ids if tweet_id in included_tweets]
+                if referenced:
+                    includes['tweets'] = referenced
+                if includes:
+                    data['includes'] = PackedJSON(includes) if compact else includes
+            data['user_profile'] = profiles[username]
+            results[username] = data
+        
+        print(f"Coalesced search for {len(members)} accounts took {requests_made} request(s)"
+              + (f" plus {len(refetched)} single-account search(es)" if refetched else ""))
+        return results
+    
+    def discover_accounts(self, keywords, max_results=100, filters=None, target_accounts=None,
+                          max_requests=1, time_budget=None):
         """
         Discover Twitter accounts by searching tweets with keywords
         Returns unique accounts that have tweeted about the keywords
         
+        By default a single page is searched. Raise max_requests (and set
+        target_accounts) to keep paging until enough accounts qualify; see
+        iter_discover_accounts.
+        
         Args:
             keywords: List of keywords to search for
-            max_results: Maximum number of tweets to search through
+            max_results: Maximum number of tweets to search through per page
             filters: Dict with filters (min_followers, verified_only, location, etc.)
-        """
-        if not self.bearer_token:
-            raise ValueError("TWITTER_BEARER_TOKEN not found in .env file")
+            target_accounts: Stop once this many accounts qualify (None for no target)
+            max_requests: Most search requests to spend
+            time_budget: Stop starting new requests after this many seconds
+        """
+        summary = None
+        for event in self.iter_discover_accounts(keywords, max_results, filters, target_accounts,
+                                                 max_requests, time_budget):
+            if event['type'] == 'done':
+                summary = event
         
-        # Build query from keywords
+        if not summary or not summary['tweets_searched']:
+            return None
+        summary.pop('type')
+        return summary
+    
+    def _build_discovery_query(self, keywords, filters=None):
+        """Build the keyword search query used for account discovery"""
         keyword_query = " OR ".join([f'"{k}"' for k in keywords])
         
         # Add filters to query
@@ -117,85 +916,200 @@ class TwitterScraper:
             if filters.get('exclude_retweets'):
                 keyword_query += " -is:retweet"
         
-        # Search tweets
+        return keyword_query
+    
+    def iter_discover_accounts(self, keywords, max_results=100, filters=None, target_accounts=None,
+                               max_requests=DEFAULT_DISCOVERY_MAX_REQUESTS, time_budget=None):
+        """
+        Discover accounts page by page, yielding new accounts as they qualify
+        
+        After each page, authors already seen (qualified or filtered out by
+        min_followers) are excluded from the next request with -from: operators,
+        as far as the query-length limit allows, and the search continues below
+        the oldest tweet seen (until_id). Pages are then spent on authors not
+        yet found rather than on more tweets from the same prolific accounts.
+        
+        Args:
+            keywords: List of keywords to search for
+            max_results: Tweets requested per page (10-100)
+            filters: Dict with filters (min_followers, verified_only, has_links, exclude_retweets)
+            target_accounts: Stop once this many accounts qualify (None for no target)
+            max_requests: Most search requests to spend
+            time_budget: Stop starting new requests after this many seconds (None for no limit)
+        
+        Yields:
+            {'type': 'page', 'accounts': [...newly qualified...], 'tweets_searched', 'requests_made'}
+            per page, then one {'type': 'done', 'accounts': [...all, best first...],
+            'total_accounts', 'search_keywords', 'tweets_searched', 'requests_made',
+            'stop_reason'} - stop_reason is target_reached, request_budget,
+            time_budget, exhausted or error.
+        """
+        if not self.bearer_token:
+            raise ValueError("TWITTER_BEARER_TOKEN not found in .env file")
+        
+        started = time.monotonic()
+        base_query = self._build_discovery_query(keywords, filters)
+        
         endpoint = f"{self.base_url}/tweets/search/recent"
         params = {
-            "query": keyword_query,
-            "max_results": min(max_results, 100),
+            "query": base_query,
+            "max_results": max(10, min(max_results, 100)),
             "tweet.fields": "created_at,public_metrics,author_id",
             "expansions": "author_id",
             "user.fields": "username,name,verified,public_metrics,description,location,profile_image_url,created_at"
         }
         
-        response = requests.get(endpoint, headers=self.headers, params=params)
-        
-        if response.status_code != 200:
-            print(f"Error: {response.status_code}")
-            print(response.text)
-            return None
-        
-        tweets_data = response.json()
-        
-        if not tweets_data or 'data' not in tweets_data:
-            return None
-        
-        # Extract unique accounts with quality scoring
+        users_by_id = {}
+        author_counts = Counter()
         accounts = {}
-        for tweet in tweets_data['data']:
-            author_id = tweet.get('author_id')
-            if author_id and author_id not in accounts:
-                # Get user info from includes
-                user_info = None
-                if 'includes' in tweets_data and 'users' in tweets_data['includes']:
-                    for user in tweets_data['includes']['users']:
-                        if user['id'] == author_id:
-                            user_info = user
-                            break
-                
-                if user_info:
-                    followers = user_info.get('public_metrics', {}).get('followers_count', 0)
-                    
-                    # Apply follower filter
-                    if filters and filters.get('min_followers'):
-                        if followers < filters['min_followers']:
-                            continue
-                    
-                    # Count tweets from this user in results
-                    tweet_count = sum(1 for t in tweets_data['data'] if t.get('author_id') == author_id)
-                    
-                    # Calculate quality score
-                    quality_score = self._calculate_account_quality_score(user_info, tweet_count)
-                    
-                    # Detect account type
-                    account_type = self._detect_account_type(user_info)
-                    
-                    accounts[author_id] = {
-                        'id': user_info['id'],
-                        'username': user_info['username'],
-                        'name': user_info['name'],
-                        'description': user_info.get('description', ''),
-                        'followers_count': followers,
-                        'following_count': user_info.get('public_metrics', {}).get('following_count', 0),
-                        'tweet_count': user_info.get('public_metrics', {}).get('tweet_count', 0),
-                        'verified': user_info.get('verified', False),
-                        'created_at': user_info.get('created_at', ''),
-                        'profile_image_url': user_info.get('profile_image_url', ''),
-                        'matching_tweets': tweet_count,
-                        'location': user_info.get('location', ''),
-                        'quality_score': quality_score,
-                        'account_type': account_type
-                    }
-        
-        # Sort by quality score (highest first)
+        rejected = set()  # Authors that can't qualify (no profile or below min_followers)
+        tweets_searched = 0
+        requests_made = 0
+        oldest_id = None
+        stop_reason = 'exhausted'
+        
+        while True:
+            if requests_made >= max_requests:
+                stop_reason = 'request_budget'
+                break
+            if time_budget is not None and requests_made and time.monotonic() - started >= time_budget:
+                stop_reason = 'time_budget'
+                break
+            
+            if oldest_id is not None:
+                params["query"] = self._exclude_authors(base_query, author_counts, users_by_id)
+                params["until_id"] = oldest_id
+            
+            response = self._get(endpoint, params)
+            requests_made += 1
+            
+            if response.status_code != 200:
+                print(f"Error: {response.status_code}")
+                print(response.text)
+                stop_reason = 'error'
+                break
+            
+            page = fast_json.loads(response.content)
+            tweets = page.get('data', [])
+            if not tweets:
+                break
+            
+            tweets_searched += len(tweets)
+            oldest_id = min((tweet['id'] for tweet in tweets), key=int)
+            for user in page.get('includes', {}).get('users', []):
+                users_by_id.setdefault(user['id'], user)
+            
+            page_counts = Counter(tweet.get('author_id') for tweet in tweets)
+            author_counts.update(page_counts)
+            
+            new_counts = Counter({
+                author_id: author_counts[author_id] for author_id in page_counts
+                if author_id not in accounts and author_id not in rejected
+            })
+            new_accounts = self._build_accounts(new_counts, users_by_id, filters)
+            rejected.update(author_id for author_id in new_counts if author_id not in new_accounts)
+            accounts.update(new_accounts)
+            
+            yield {
+                'type': 'page',
+                'accounts': list(new_accounts.values()),
+                'tweets_searched': tweets_searched,
+                'requests_made': requests_made
+            }
+            
+            if target_accounts and len(accounts) >= target_accounts:
+                stop_reason = 'target_reached'
+                break
+            if not page.get('meta', {}).get('next_token'):
+                break
+        
+        # Re-score with the final per-author tweet counts
+        accounts = self._build_accounts(Counter({a: author_counts[a] for a in accounts}), users_by_id, filters)
         sorted_accounts = sorted(accounts.values(), key=lambda x: x['quality_score'], reverse=True)
         
-        return {
+        if requests_made > 1:
+            print(f"Discovery found {len(accounts)} accounts in {requests_made} requests ({stop_reason})")
+        
+        yield {
+            'type': 'done',
             'accounts': sorted_accounts,
             'total_accounts': len(accounts),
             'search_keywords': keywords,
-            'tweets_searched': len(tweets_data['data'])
+            'tweets_searched': tweets_searched,
+            'requests_made': requests_made,
+            'stop_reason': stop_reason
         }
     
+    def _exclude_authors(self, base_query, author_counts, users_by_id):
+        """Append -from: operators for already-seen authors, busiest first, within the query limit"""
+        query = f"({base_query})"
+        for author_id, _ in author_counts.most_common():
+            user = users_by_id.get(author_id)
+            if not user:
+                continue
+            candidate = f"{query} -from:{user['username']}"
+            if len(candidate) > self.max_query_length:
+                break
+            query = candidate
+        return query
+    
+    @staticmethod
+    def _index_users(users):
+        """Map user ID -> user object (the first occurrence wins, as in includes order)"""
+        users_by_id = {}
+        for user in users:
+            users_by_id.setdefault(user['id'], user)
+        return users_by_id
+    
+    def _build_accounts(self, author_counts, users_by_id, filters=None):
+        """
+        Turn per-author tweet counts into scored account entries
+        
+        Args:
+            author_counts: Counter of author_id -> matching tweets, in first-seen order
+            users_by_id: Dict of user ID -> user object from includes.users
+            filters: Dict with filters (min_followers)
+        
+        Returns:
+            Dict of author_id -> account dict, in first-seen order
+        """
+        min_followers = filters.get('min_followers') if filters else None
+        accounts = {}
+        for author_id, tweet_count in author_counts.items():
+            user_info = users_by_id.get(author_id) if author_id else None
+            if not user_info:
+                continue
+            
+            followers = user_info.get('public_metrics', {}).get('followers_count', 0)
+            
+            # Apply follower filter
+            if min_followers and followers < min_followers:
+                continue
+            
+            # Calculate quality score
+            quality_score = self._calculate_account_quality_score(user_info, tweet_count)
+            
+            # Detect account type
+            account_type = self._detect_account_type(user_info)
+            
+            accounts[author_id] = {
+                'id': user_info['id'],
+                'username': user_info['username'],
+                'name': user_info['name'],
+                'description': user_info.get('description', ''),
+                'followers_count': followers,
+                'following_count': user_info.get('public_metrics', {}).get('following_count', 0),
+                'tweet_count': user_info.get('public_metrics', {}).get('tweet_count', 0),
+                'verified': user_info.get('verified', False),
+                'created_at': user_info.get('created_at', ''),
+                'profile_image_url': user_info.get('profile_image_url', ''),
+                'matching_tweets': tweet_count,
+                'location': user_info.get('location', ''),
+                'quality_score': quality_score,
+                'account_type': account_type
+            }
+        return accounts
+    
     def _calculate_account_quality_score(self, user_info, matching_tweets):
         """
         Calculate quality score for discovered accounts
@@ -288,354 +1202,25 @@ class TwitterScraper:
         
         return 'Personal'
     
-    def analyze_account_type(self, user_data):
-        """Determine if account is enterprise/business/personal"""
-        description = user_data.get('description', '').lower()
-        name = user_data.get('name', '').lower()
-        metrics = user_data.get('public_metrics', {})
-        
-        # Enterprise indicators
-        enterprise_keywords = ['ceo', 'founder', 'company', 'official', 'corp', 'inc', 'ltd', 
-                              'enterprise', 'business', 'organization', 'team']
-        
-        is_verified = user_data.get('verified', False)
-        follower_count = metrics.get('followers_count', 0)
-        following_count = metrics.get('following_count', 0)
-        
-        # Scoring system
-        score = 0
-        indicators = []
-        
-        if is_verified:
-            score += 3
-            indicators.append('Verified Account')
-        
-        if follower_count > 10000:
-            score += 2
-            indicators.append(f'High Followers ({follower_count:,})')
-        
-        if follower_count > 1000 and following_count < follower_count * 0.5:
-            score += 1
-            indicators.append('Good Follower Ratio')
-        
-        for keyword in enterprise_keywords:
-            if keyword in description or keyword in name:
-                score += 1
-                indicators.append(f'Business Keyword: {keyword}')
-                break
-        
-        # Determine type
-        if score >= 4:
-            account_type = 'Enterprise/Business'
-        elif score >= 2:
-            account_type = 'Professional/Influencer'
-        else:
-            account_type = 'Personal'
-        
-        return {
-            'type': account_type,
-            'score': score,
-            'indicators': indicators,
-            'is_verified': is_verified,
-            'follower_count': follower_count
-        }
-    
-    def calculate_engagement_score(self, tweet):
-        """Calculate engagement score for lead prioritization"""
-        metrics = tweet.get('public_metrics', {})
-        
-        likes = metrics.get('like_count', 0)
-        retweets = metrics.get('retweet_count', 0)
-        replies = metrics.get('reply_count', 0)
-        quotes = metrics.get('quote_count', 0)
-        
-        # Weighted engagement score
-        score = (likes * 1) + (retweets * 3) + (replies * 2) + (quotes * 2)
-        
-        return {
-            'score': score,
-            'likes': likes,
-            'retweets': retweets,
-            'replies': replies,
-            'quotes': quotes
-        }
-    
-    def extract_entities(self, tweet):
-        """Extract URLs, mentions, hashtags from tweet"""
-        entities = tweet.get('entities', {})
-        
-        urls = []
-        if 'urls' in entities:
-            urls = [url['expanded_url'] for url in entities['urls'] if 'expanded_url' in url]
-        
-        mentions = []
-        if 'mentions' in entities:
-            mentions = [mention['username'] for mention in entities['mentions']]
-        
-        hashtags = []
-        if 'hashtags' in entities:
-            hashtags = [tag['tag'] for tag in entities['hashtags']]
-        
-        return {
-            'urls': urls,
-            'mentions': mentions,
-            'hashtags': hashtags,
-            'has_links': len(urls) > 0,
-            'has_mentions': len(mentions) > 0,
-            'has_hashtags': len(hashtags) > 0
-        }
-    
-    def perform_sentiment_analysis(self, text):
-        """Basic sentiment analysis"""
-        # Positive indicators
-        positive_words = ['great', 'excellent', 'amazing', 'love', 'best', 'awesome', 
-                         'fantastic', 'wonderful', 'excited', 'happy', 'success', 'win']
-        
-        # Negative indicators
-        negative_words = ['bad', 'terrible', 'worst', 'hate', 'awful', 'disappointed',
-                         'fail', 'problem', 'issue', 'broken', 'poor', 'sad']
-        
-        # Business opportunity indicators
-        opportunity_words = ['looking for', 'need', 'seeking', 'hiring', 'opportunity',
-                           'help', 'recommend', 'suggestion', 'advice', 'question']
-        
-        text_lower = text.lower()
-        
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
-        opportunity_count = sum(1 for word in opportunity_words if word in text_lower)
-        
-        # Determine sentiment
-        if positive_count > negative_count:
-            sentiment = 'Positive'
-        elif negative_count > positive_count:
-            sentiment = 'Negative'
-        else:
-            sentiment = 'Neutral'
-        
-        return {
-            'sentiment': sentiment,
-            'positive_score': positive_count,
-            'negative_score': negative_count,
-            'opportunity_signals': opportunity_count,
-            'is_opportunity': opportunity_count > 0
-        }
-    
-    def filter_by_keywords(self, tweets_data, keywords):
-        """Filter tweets that contain any of the keywords"""
-        if not tweets_data or 'data' not in tweets_data:
-            return []
-        
-        filtered = []
-        for tweet in tweets_data['data']:
-            text_lower = tweet['text'].lower()
-            for keyword in keywords:
-                if keyword.lower() in text_lower:
-                    filtered.append(tweet)
-                    break
-        
-        return filtered
-    
-    def generate_report(self, tweets_data, username, keywords=None, min_keyword_mentions=1):
-        """Generate a formatted report from tweet data with advanced analytics"""
-        if not tweets_data or 'data' not in tweets_data:
-            return "No tweets found."
-        
-        tweets = tweets_data['data']
-        user_profile = tweets_data.get('user_profile', {})
-        
-        # Analyze account type
-        account_analysis = self.analyze_account_type(user_profile)
-        
-        # Create reports directory
-        os.makedirs('reports', exist_ok=True)
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"reports/twitter_report_{username}_{timestamp}.txt"
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write("=" * 80 + "\n")
-            f.write(f"TWITTER LEAD GENERATION REPORT\n")
-            f.write(f"Username: @{username}\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            if keywords:
-                f.write(f"Keywords: {', '.join(keywords)}\n")
-            f.write(f"Total Tweets Found: {len(tweets)}\n")
-            f.write("=" * 80 + "\n\n")
-            
-            # Account Profile Analysis
-            f.write("ACCOUNT PROFILE ANALYSIS\n")
-            f.write("-" * 80 + "\n")
-            f.write(f"Account Type: {account_analysis['type']}\n")
-            f.write(f"Lead Quality Score: {account_analysis['score']}/7\n")
-            f.write(f"Verified: {'Yes' if account_analysis['is_verified'] else 'No'}\n")
-            f.write(f"Followers: {account_analysis['follower_count']:,}\n")
-            f.write(f"Bio: {user_profile.get('description', 'N/A')}\n")
-            f.write(f"Location: {user_profile.get('location', 'N/A')}\n")
-            if user_profile.get('url'):
-                f.write(f"Website: {user_profile.get('url')}\n")
-            f.write(f"\nQuality Indicators:\n")
-            for indicator in account_analysis['indicators']:
-                f.write(f"  • {indicator}\n")
-            f.write("\n")
-            
-            # Engagement Summary
-            total_likes = sum(tweet.get('public_metrics', {}).get('like_count', 0) for tweet in tweets)
-            total_retweets = sum(tweet.get('public_metrics', {}).get('retweet_count', 0) for tweet in tweets)
-            total_replies = sum(tweet.get('public_metrics', {}).get('reply_count', 0) for tweet in tweets)
-            
-            # Calculate engagement scores
-            engagement_scores = [self.calculate_engagement_score(tweet) for tweet in tweets]
-            avg_engagement = sum(e['score'] for e in engagement_scores) / len(engagement_scores) if engagement_scores else 0
-            
-            f.write("ENGAGEMENT SUMMARY\n")
-            f.write("-" * 80 + "\n")
-            f.write(f"Total Likes: {total_likes:,}\n")
-            f.write(f"Total Retweets: {total_retweets:,}\n")
-            f.write(f"Total Replies: {total_replies:,}\n")
-            f.write(f"Average Likes per Tweet: {total_likes/len(tweets):.2f}\n")
-            f.write(f"Average Retweets per Tweet: {total_retweets/len(tweets):.2f}\n")
-            f.write(f"Average Engagement Score: {avg_engagement:.2f}\n\n")
-            
-            # Content Analysis
-            tweets_with_links = sum(1 for tweet in tweets if self.extract_entities(tweet)['has_links'])
-            tweets_with_mentions = sum(1 for tweet in tweets if self.extract_entities(tweet)['has_mentions'])
-            
-            f.write("CONTENT ANALYSIS\n")
-            f.write("-" * 80 + "\n")
-            f.write(f"Tweets with Links: {tweets_with_links} ({tweets_with_links/len(tweets)*100:.1f}%)\n")
-            f.write(f"Tweets with Mentions: {tweets_with_mentions} ({tweets_with_mentions/len(tweets)*100:.1f}%)\n")
-            
-            # Sentiment Analysis
-            sentiments = [self.perform_sentiment_analysis(tweet['text']) for tweet in tweets]
-            positive_count = sum(1 for s in sentiments if s['sentiment'] == 'Positive')
-            negative_count = sum(1 for s in sentiments if s['sentiment'] == 'Negative')
-            neutral_count = sum(1 for s in sentiments if s['sentiment'] == 'Neutral')
-            opportunity_count = sum(1 for s in sentiments if s['is_opportunity'])
-            
-            f.write(f"\nSentiment Distribution:\n")
-            f.write(f"  Positive: {positive_count} ({positive_count/len(tweets)*100:.1f}%)\n")
-            f.write(f"  Neutral: {neutral_count} ({neutral_count/len(tweets)*100:.1f}%)\n")
-            f.write(f"  Negative: {negative_count} ({negative_count/len(tweets)*100:.1f}%)\n")
-            f.write(f"  Opportunity Signals: {opportunity_count} tweets\n\n")
-            
-            # Keyword analysis with ranking and threshold
-            if keywords:
-                f.write("KEYWORD ANALYSIS\n")
-                f.write("-" * 80 + "\n")
-                
-                # Count mentions for each keyword
-                keyword_counts = []
-                for keyword in keywords:
-                    count = sum(1 for tweet in tweets if keyword.lower() in tweet['text'].lower())
-                    keyword_counts.append((keyword, count))
-                
-                # Sort by count (descending) - Ranking
-                keyword_counts.sort(key=lambda x: x[1], reverse=True)
-                
-                # Filter by minimum threshold
-                qualified_keywords = [(kw, count) for kw, count in keyword_counts if count >= min_keyword_mentions]
-                
-                if qualified_keywords:
-                    f.write(f"Minimum mentions threshold: {min_keyword_mentions}\n")
-                    f.write(f"Qualified keywords: {len(qualified_keywords)} of {len(keywords)}\n\n")
-                    
-                    for rank, (keyword, count) in enumerate(qualified_keywords, 1):
-                        percentage = (count / len(tweets)) * 100
-                        f.write(f"#{rank}. '{keyword}': {count} mentions ({percentage:.1f}% of tweets)\n")
-                    
-                    # Show disqualified keywords if any
-                    disqualified = [(kw, count) for kw, count in keyword_counts if count < min_keyword_mentions]
-                    if disqualified:
-                        f.write(f"\nBelow threshold ({min_keyword_mentions} mentions):\n")
-                        for keyword, count in disqualified:
-                            f.write(f"  '{keyword}': {count} mentions\n")
-                else:
-                    f.write(f"⚠️ No keywords met the minimum threshold of {min_keyword_mentions} mentions.\n")
-                    f.write(f"\nAll keyword counts:\n")
-                    for keyword, count in keyword_counts:
-                        f.write(f"  '{keyword}': {count} mentions\n")
-                
-                f.write("\n")
-            
-            # Top Performing Tweets (by engagement score)
-            tweets_with_scores = [(tweet, self.calculate_engagement_score(tweet)) for tweet in tweets]
-            top_tweets = sorted(tweets_with_scores, key=lambda x: x[1]['score'], reverse=True)[:5]
-            
-            f.write("TOP 5 PERFORMING TWEETS\n")
-            f.write("-" * 80 + "\n")
-            for i, (tweet, score) in enumerate(top_tweets, 1):
-                f.write(f"\n#{i} - Engagement Score: {score['score']}\n")
-                f.write(f"Date: {tweet.get('created_at', 'N/A')}\n")
-                f.write(f"Text: {tweet['text'][:200]}{'...' if len(tweet['text']) > 200 else ''}\n")
-                f.write(f"Likes: {score['likes']} | Retweets: {score['retweets']} | Replies: {score['replies']}\n")
-                
-                entities = self.extract_entities(tweet)
-                if entities['urls']:
-                    f.write(f"Links: {', '.join(entities['urls'][:2])}\n")
-                f.write("-" * 80 + "\n")
-            
-            # Opportunity Tweets (tweets with buying signals)
-            opportunity_tweets = [(tweet, self.perform_sentiment_analysis(tweet['text'])) 
-                                 for tweet in tweets 
-                                 if self.perform_sentiment_analysis(tweet['text'])['is_opportunity']]
-            
-            if opportunity_tweets:
-                f.write("\nLEAD OPPORTUNITY TWEETS\n")
-                f.write("-" * 80 + "\n")
-                for tweet, sentiment in opportunity_tweets[:5]:
-                    f.write(f"\nDate: {tweet.get('created_at', 'N/A')}\n")
-                    f.write(f"Text: {tweet['text']}\n")
-                    f.write(f"Opportunity Signals: {sentiment['opportunity_signals']}\n")
-                    metrics = tweet.get('public_metrics', {})
-                    f.write(f"Engagement: {metrics.get('like_count', 0)} likes, {metrics.get('reply_count', 0)} replies\n")
-                    f.write("-" * 80 + "\n")
-            
-            # Detailed tweets section
-            f.write("\n\nDETAILED TWEET ANALYSIS\n")
-            f.write("-" * 80 + "\n\n")
-            
-            for i, tweet in enumerate(tweets, 1):
-                sentiment = self.perform_sentiment_analysis(tweet['text'])
-                entities = self.extract_entities(tweet)
-                engagement = self.calculate_engagement_score(tweet)
-                
-                f.write(f"Tweet #{i}\n")
-                f.write(f"Date: {tweet.get('created_at', 'N/A')}\n")
-                f.write(f"Text: {tweet['text']}\n")
-                f.write(f"Sentiment: {sentiment['sentiment']}")
-                if sentiment['is_opportunity']:
-                    f.write(" 🎯 OPPORTUNITY")
-                f.write("\n")
-                f.write(f"Engagement Score: {engagement['score']}\n")
-                metrics = tweet.get('public_metrics', {})
-                f.write(f"Likes: {metrics.get('like_count', 0)} | ")
-                f.write(f"Retweets: {metrics.get('retweet_count', 0)} | ")
-                f.write(f"Replies: {metrics.get('reply_count', 0)}\n")
-                
-                if entities['urls']:
-                    f.write(f"Links: {', '.join(entities['urls'])}\n")
-                if entities['mentions']:
-                    f.write(f"Mentions: @{', @'.join(entities['mentions'])}\n")
-                if entities['hashtags']:
-                    f.write(f"Hashtags: #{', #'.join(entities['hashtags'])}\n")
-                
-                f.write("-" * 80 + "\n\n")
-        
-        print(f"Report saved to: {filename}")
-        return filename
-    
     def find_similar_accounts(self, reference_username, max_results=100, filters=None):
         """
         Find accounts similar to a reference account
         
+        Stored accounts are ranked first by cosine similarity in the local
+        account index, which needs no API calls when the reference account is
+        already indexed. Only when fewer than SIMILAR_MIN_LOCAL_RESULTS accounts
+        pass the filters does it fall back to the live path: extract keywords
+        from the reference account and run a discovery search with the top five.
+        Live results are appended after the local ones.
+        
         Args:
             reference_username: Username of the reference account (without @)
-            max_results: Maximum number of tweets to search through
+            max_results: Maximum number of tweets to search through (and local matches returned)
             filters: Dict with filters (min_followers, verified_only, etc.)
         
         Returns:
-            Dict with similar accounts and analysis
+            Dict with similar accounts and analysis; 'source' is 'local', 'live'
+            or 'local+live'
         """
         if not self.bearer_token:
             raise ValueError("TWITTER_BEARER_TOKEN not found in .env file")
@@ -643,55 +1228,49 @@ class TwitterScraper:
         # Step 1: Get reference account info and recent tweets
         print(f"Analyzing reference account: @{reference_username}")
         
-        # Get user info
-        user_endpoint = f"{self.base_url}/users/by/username/{reference_username}"
-        user_params = {
-            "user.fields": "username,name,verified,public_metrics,description,location,profile_image_url,created_at"
-        }
-        
-        user_response = requests.get(user_endpoint, headers=self.headers, params=user_params)
-        
-        if user_response.status_code != 200:
-            raise ValueError(f"Could not find account @{reference_username}")
-        
-        reference_user = user_response.json().get('data')
+        self.account_index.refresh()
+        reference_user = self.account_index.get_profile(reference_username)
+        reference_tweets = None
         if not reference_user:
-            raise ValueError(f"Could not find account @{reference_username}")
-        
-        # Get recent tweets from reference account
-        tweets_endpoint = f"{self.base_url}/users/{reference_user['id']}/tweets"
-        tweets_params = {
-            "max_results": 10,
-            "tweet.fields": "created_at,public_metrics,entities",
-            "exclude": "retweets,replies"
-        }
-        
-        tweets_response = requests.get(tweets_endpoint, headers=self.headers, params=tweets_params)
-        reference_tweets = []
+            # Get user info (shared profile cache)
+            reference_user = self._get_user_info(reference_username)
+            if not reference_user:
+                raise ValueError(f"Could not find account @{reference_username}")
+            reference_tweets = self._get_reference_tweets(reference_user)
+            self.account_index.add_account(reference_user)
+            self.account_index.add_tweets(reference_tweets, reference_user['username'])
+        
+        # Step 2: Rank stored accounts by similarity
+        local_accounts = self._find_indexed_similar_accounts(reference_user, max_results, filters)
+        if len(local_accounts) >= SIMILAR_MIN_LOCAL_RESULTS:
+            print(f"[SIMILAR] {len(local_accounts)} similar accounts for @{reference_username} from the local index")
+            return {
+                'accounts': local_accounts,
+                'total_accounts': len(local_accounts),
+                'reference_account': self._reference_account_summary(reference_user),
+                'extracted_keywords': self._extract_keywords_from_account(reference_user, reference_tweets or []),
+                'tweets_searched': 0,
+                'source': 'local'
+            }
+        print(f"[SIMILAR] Only {len(local_accounts)} local matches for @{reference_username}, searching live")
         
-        if tweets_response.status_code == 200:
-            tweets_data = tweets_response.json()
-            if 'data' in tweets_data:
-                reference_tweets = tweets_data['data']
+        if reference_tweets is None:
+            reference_tweets = self._get_reference_tweets(reference_user)
         
-        # Step 2: Extract keywords from reference account
+        # Step 3: Extract keywords from reference account
         keywords = self._extract_keywords_from_account(reference_user, reference_tweets)
         
         print(f"Extracted keywords: {', '.join(keywords[:10])}")
         
-        # Step 3: Search for accounts using extracted keywords
+        # Step 4: Search for accounts using extracted keywords
         if not keywords:
             return {
-                'accounts': [],
-                'total_accounts': 0,
-                'reference_account': {
-                    'username': reference_user['username'],
-                    'name': reference_user['name'],
-                    'description': reference_user.get('description', ''),
-                    'followers': reference_user.get('public_metrics', {}).get('followers_count', 0)
-                },
+                'accounts': local_accounts,
+                'total_accounts': len(local_accounts),
+                'reference_account': self._reference_account_summary(reference_user),
                 'extracted_keywords': [],
-                'message': 'Could not extract enough keywords from reference account'
+                'message': 'Could not extract enough keywords from reference account',
+                'source': 'local'
             }
         
         # Use discover_accounts with extracted keywords
@@ -699,98 +1278,103 @@ class TwitterScraper:
         
         if not discovery_result:
             return {
-                'accounts': [],
-                'total_accounts': 0,
-                'reference_account': {
-                    'username': reference_user['username'],
-                    'name': reference_user['name'],
-                    'description': reference_user.get('description', ''),
-                    'followers': reference_user.get('public_metrics', {}).get('followers_count', 0)
-                },
+                'accounts': local_accounts,
+                'total_accounts': len(local_accounts),
+                'reference_account': self._reference_account_summary(reference_user),
                 'extracted_keywords': keywords,
-                'message': 'No similar accounts found'
+                'message': 'No similar accounts found' if not local_accounts else '',
+                'source': 'local'
             }
         
-        # Filter out the reference account itself
-        similar_accounts = [
+        # Filter out the reference account itself and accounts already found locally
+        seen = {acc['username'].lower() for acc in local_accounts}
+        seen.add(reference_username.lower())
+        similar_accounts = local_accounts + [
             acc for acc in discovery_result['accounts'] 
-            if acc['username'].lower() != reference_username.lower()
+            if acc['username'].lower() not in seen
         ]
         
         return {
             'accounts': similar_accounts,
             'total_accounts': len(similar_accounts),
-            'reference_account': {
-                'username': reference_user['username'],
-                'name': reference_user['name'],
-                'description': reference_user.get('description', ''),
-                'followers': reference_user.get('public_metrics', {}).get('followers_count', 0),
-                'verified': reference_user.get('verified', False),
-                'profile_image_url': reference_user.get('profile_image_url', '')
-            },
+            'reference_account': self._reference_account_summary(reference_user),
             'extracted_keywords': keywords,
-            'tweets_searched': discovery_result.get('tweets_searched', 0)
+            'tweets_searched': discovery_result.get('tweets_searched', 0),
+            'source': 'local+live' if local_accounts else 'live'
+        }
+    
+    def _get_reference_tweets(self, reference_user):
+        """Recent original tweets of the reference account (one request)"""
+        tweets_endpoint = f"{self.base_url}/users/{reference_user['id']}/tweets"
+        tweets_params = {
+            "max_results": 100,
+            "tweet.fields": "created_at,public_metrics,entities",
+            "exclude": "retweets,replies"
+        }
+        
+        tweets_response = self._get(tweets_endpoint, tweets_params)
+        if tweets_response.status_code == 200:
+            tweets_data = fast_json.loads(tweets_response.content)
+            if 'data' in tweets_data:
+                return tweets_data['data']
+        return []
+    
+    def _find_indexed_similar_accounts(self, reference_user, limit, filters=None):
+        """
+        Similar accounts from the local account index
+        
+        Returns:
+            List of account dicts (same shape as discovery results, plus
+            'similarity'), most similar first
+        """
+        min_followers = filters.get('min_followers') if filters else None
+        verified_only = filters.get('verified_only') if filters else None
+        
+        def accept(profile):
+            if not profile.get('id'):
+                return False
+            if verified_only and not profile.get('verified'):
+                return False
+            if min_followers and profile.get('public_metrics', {}).get('followers_count', 0) < min_followers:
+                return False
+            return True
+        
+        matches = self.account_index.similar(reference_user['username'], profile=reference_user,
+                                             limit=limit, accept=accept)
+        accounts = []
+        for profile, score, stored_tweets in matches:
+            account = self._build_accounts(Counter({profile['id']: stored_tweets}), {profile['id']: profile},
+                                           filters).get(profile['id'])
+            if account:
+                account['similarity'] = round(score, 4)
+                accounts.append(account)
+        return accounts
+    
+    def _reference_account_summary(self, reference_user):
+        return {
+            'username': reference_user['username'],
+            'name': reference_user['name'],
+            'description': reference_user.get('description', ''),
+            'followers': reference_user.get('public_metrics', {}).get('followers_count', 0),
+            'verified': reference_user.get('verified', False),
+            'profile_image_url': reference_user.get('profile_image_url', '')
         }
     
     def _extract_keywords_from_account(self, user_info, tweets):
         """
         Extract relevant keywords from account bio and tweets
-        """
-        import re
-        from collections import Counter
         
-        keywords = []
-        
-        # Extract from bio/description
-        description = user_info.get('description', '')
-        if description:
-            # Remove URLs, mentions, hashtags
-            clean_desc = re.sub(r'http\S+|@\w+|#\w+', '', description)
-            # Extract words (3+ characters)
-            words = re.findall(r'\b[a-zA-Z]{3,}\b', clean_desc.lower())
-            keywords.extend(words)
-        
-        # Extract from tweets
-        tweet_text_combined = ''
-        hashtags = []
+        Candidate terms (bio words, tweet words, hashtags) are ranked by TF-IDF
+        against the stored tweet corpus, so words that are distinctive for this
+        account beat words everyone uses.
+        """
+        self.keyword_idf.refresh()
         
+        term_counts = Counter(bio_terms(user_info.get('description', '')))
         for tweet in tweets:
-            text = tweet.get('text', '')
-            tweet_text_combined += ' ' + text
-            
-            # Extract hashtags
-            entities = tweet.get('entities', {})
-            if 'hashtags' in entities:
-                for tag in entities['hashtags']:
-                    hashtags.append(tag['tag'].lower())
-        
-        # Extract words from tweets
-        clean_tweets = re.sub(r'http\S+|@\w+|#\w+|RT', '', tweet_text_combined)
-        tweet_words = re.findall(r'\b[a-zA-Z]{3,}\b', clean_tweets.lower())
-        keywords.extend(tweet_words)
-        
-        # Add hashtags (they're usually important)
-        keywords.extend(hashtags)
-        
-        # Remove common stop words
-        stop_words = {
-            'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'her', 'was', 'one',
-            'our', 'out', 'day', 'get', 'has', 'him', 'his', 'how', 'its', 'may', 'new', 'now',
-            'old', 'see', 'two', 'who', 'boy', 'did', 'let', 'put', 'say', 'she', 'too', 'use',
-            'with', 'this', 'that', 'from', 'have', 'they', 'will', 'what', 'been', 'more',
-            'when', 'your', 'than', 'them', 'some', 'time', 'very', 'just', 'know', 'take',
-            'into', 'year', 'good', 'make', 'over', 'think', 'also', 'back', 'after', 'come',
-            'most', 'work', 'first', 'well', 'way', 'even', 'want', 'because', 'these', 'give',
-            'about', 'being', 'doing', 'going', 'having', 'making', 'saying', 'taking', 'using'
-        }
-        
-        keywords = [k for k in keywords if k not in stop_words and len(k) >= 3]
-        
-        # Count frequency and return top keywords
-        keyword_counts = Counter(keywords)
-        top_keywords = [word for word, count in keyword_counts.most_common(20)]
+            term_counts.update(tweet_terms(tweet))
         
-        return top_keywords
+        return self.keyword_idf.top_terms(term_counts, 20)
 
 
 def main():
@@ -809,9 +1393,11 @@ def main():
     # Search tweets
     tweets_data = scraper.search_user_tweets(username, keywords=keywords, max_results=100)
     
-    if tweets_data:
-        # Generate report
-        report_file = scraper.generate_report(tweets_data, username, keywords)
+    if tweets_data and 'data' in tweets_data:
+        # Generate the report straight into its file
+        report_file = default_report_path('twitter', username)
+        with open(report_file, 'w', encoding='utf-8') as f:
+            scraper.generate_report(tweets_data, username, keywords, stream=f)
         print(f"\n✓ Analysis complete! Report saved to: {report_file}")
         
         # Save raw JSON data